@@ -0,0 +1,82 @@
+"""
+Import-time budget for the divergence package.
+
+Every import runs in a fresh interpreter, so nothing is cached between measurements. The script exits
+with status 1 if a median import time exceeds its budget or if a heavy dependency is loaded by an import
+that should not need it.
+
+Usage: python benchmarks/import_time.py [--repeat N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import statement -> (budget in milliseconds on top of a bare "import numpy", forbidden modules)
+BUDGETS = {
+    "import divergence": (50, ("numpy", "scipy", "pandas")),
+    "import divergence.swaps": (50, ("numpy", "scipy", "pandas")),
+    "from divergence.swaps.valuation import InterestRateSwapValuation": (100, ("scipy", "pandas")),
+    "from divergence.swaps import ExposureEngine": (100, ("scipy", "pandas")),
+    "from divergence.futures import calculate_kaplan_sharpe_price": (50, ("scipy", "pandas")),
+    "from divergence.futures import hedge_book_pnl": (100, ("scipy", "pandas")),
+}
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(name.split(".")[0] for name in sys.modules)}}))
+"""
+
+
+def measure(statement, repeat):
+    """
+    Import in fresh interpreters and return the median time in milliseconds and the loaded top-level modules.
+
+    :param statement: The import statement to time.
+    :param repeat: Number of fresh interpreters to start.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    times, modules = [], set()
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", _PROBE.format(statement=statement)], env=env,
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        times.append(result["elapsed"] * 1000)
+        modules = set(result["modules"])
+    return statistics.median(times), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per import (default 5)")
+    args = parser.parse_args()
+
+    baseline, _ = measure("import numpy", args.repeat)
+    print(f"{'baseline: import numpy':<70} {baseline:8.1f} ms")
+
+    failures = []
+    for statement, (budget, forbidden) in BUDGETS.items():
+        elapsed, modules = measure(statement, args.repeat)
+        # Budgets are relative to numpy, which every pricing module needs anyway
+        overhead = elapsed - baseline if "numpy" in modules else elapsed
+        loaded = sorted(set(forbidden) & modules)
+        status = "ok" if overhead <= budget and not loaded else "FAIL"
+        print(f"{statement:<70} {elapsed:8.1f} ms  (budget +{budget} ms)  {status}"
+              + (f"  loads {', '.join(loaded)}" if loaded else ""))
+        if status != "ok":
+            failures.append(statement)
+
+    if failures:
+        print(f"{len(failures)} import(s) over budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
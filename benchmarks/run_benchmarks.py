@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the divergence pricers, Greeks, swap valuations and performance metrics.
+
+Every case is timed for scalar latency (one call) or batch throughput (one call on an array of inputs),
+and its peak traced memory is measured separately with tracemalloc. Results are saved to JSON so that
+runs before and after a change can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output before.json
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from divergence.futures.hedge_book import hedge_book_pnl  # noqa: E402
+from divergence.futures.hedging import direct_hedging, long_term_hedging, partial_hedging  # noqa: E402
+from divergence.options import greeks  # noqa: E402
+from divergence.options.calibration import HestonCalibrator, heston_price  # noqa: E402
+from divergence.options.proxy import ChebyshevProxy  # noqa: E402
+from divergence.options.pricing import black_scholes, binomial_tree, monte_carlo, stochastic_volatility  # noqa: E402
+from divergence.perfomance.performance import PerformanceAnalyzer  # noqa: E402
+from divergence.risk.stress import RateShock, SpotShock, StressEngine, VolShock  # noqa: E402
+from divergence.risk.var import Portfolio  # noqa: E402
+from divergence.swaps.valuation import (CommoditySwapValuation, CurrencySwapValuation,  # noqa: E402
+                                        InterestRateSwapValuation)
+
+BATCH_SIZE = 100000
+OPTION = dict(S=100.0, K=105.0, T=1.0, r=0.05, sigma=0.2)
+
+
+def _option_batch(size):
+    """Random option inputs of the given size, shared by every batch case."""
+    rng = np.random.default_rng(0)
+    return dict(S=rng.uniform(50, 150, size), K=rng.uniform(50, 150, size), T=rng.uniform(0.1, 2, size),
+                r=rng.uniform(0, 0.1, size), sigma=rng.uniform(0.1, 0.5, size))
+
+
+def _returns(size, seed):
+    return np.random.default_rng(seed).normal(0.0004, 0.01, size)
+
+
+def build_cases():
+    """
+    Build the benchmark cases.
+
+    :return: List of (name, kind, items, function) tuples, where kind is "latency" or "throughput" and
+             items is the number of valuations performed by one call of the function.
+    """
+    batch = _option_batch(BATCH_SIZE)
+    cases = [
+        ("options.black_scholes.scalar", "latency", 1, lambda: black_scholes(**OPTION)),
+        ("options.black_scholes.batch", "throughput", BATCH_SIZE, lambda: black_scholes(**batch)),
+    ]
+    for steps in (50, 200, 1000):
+        cases.append((f"options.binomial_tree.N{steps}", "latency", 1,
+                      lambda steps=steps: binomial_tree(N=steps, **OPTION)))
+    for simulations in (10000, 100000):
+        cases.append((f"options.monte_carlo.{simulations}", "latency", 1,
+                      lambda simulations=simulations: monte_carlo(num_simulations=simulations, **OPTION)))
+    cases.append(("options.monte_carlo.sobol.10000", "latency", 1,
+                  lambda: monte_carlo(num_simulations=10000, sampling="sobol", **OPTION)))
+    for sampling in ("pseudo", "sobol"):
+        cases.append((f"options.stochastic_volatility.{sampling}", "latency", 1,
+                      lambda sampling=sampling: stochastic_volatility(100.0, 105.0, 1.0, 0.05, 0.04, 2.0, 0.04, 0.3,
+                                                                      rho=-0.7, sampling=sampling)))
+
+    heston = dict(v0=0.05, kappa=2.0, theta=0.04, sigma=0.6, rho=-0.7)
+    strikes, expiries = np.meshgrid(np.linspace(70.0, 130.0, 25), [0.1, 0.25, 0.5, 1.0, 2.0])
+    surface = heston_price(100.0, strikes.ravel(), expiries.ravel(), 0.03, **heston)
+    calibrator = HestonCalibrator(100.0, 0.03)
+    calibrator.calibrate(strikes.ravel(), expiries.ravel(), surface)
+    cases += [
+        ("options.heston_price.surface", "throughput", surface.size,
+         lambda: heston_price(100.0, strikes.ravel(), expiries.ravel(), 0.03, **heston)),
+        # Warm-started from the previous fit, as in an intraday recalibration
+        ("options.HestonCalibrator.recalibrate", "latency", 1,
+         lambda: calibrator.calibrate(strikes.ravel(), expiries.ravel(), surface * 1.001)),
+    ]
+
+    proxy = ChebyshevProxy(black_scholes, {"S": (50, 150), "sigma": (0.1, 0.5), "T": (0.1, 2)},
+                           {"K": 105.0, "r": 0.05}, degree=16, vectorized=True)
+    cases += [
+        ("options.ChebyshevProxy.scalar", "latency", 1, lambda: proxy(S=100.0, sigma=0.2, T=1.0)),
+        ("options.ChebyshevProxy.batch", "throughput", BATCH_SIZE,
+         lambda: proxy(S=batch["S"], sigma=batch["sigma"], T=batch["T"])),
+    ]
+
+    for name in ("delta", "gamma", "theta", "vega", "rho", "greeks_summary"):
+        function = getattr(greeks, name)
+        cases.append((f"options.greeks.{name}.scalar", "latency", 1, lambda function=function: function(**OPTION)))
+        cases.append((f"options.greeks.{name}.batch", "throughput", BATCH_SIZE,
+                      lambda function=function: function(**batch)))
+
+    market_rates = np.random.default_rng(1).uniform(0.01, 0.08, 10000)
+    for years in (30, 50):
+        irs = InterestRateSwapValuation(1e6, 0.03, 0.025, 12, years)
+        ccs = CurrencySwapValuation(1e6, 9e5, 0.03, 0.02, 12, years)
+        cms = CommoditySwapValuation(1e4, 80.0, 82.0, 12, years)
+        cases += [
+            (f"swaps.InterestRateSwapValuation.{years}y.scalar", "latency", 1,
+             lambda irs=irs: irs.net_present_value(0.04)),
+            (f"swaps.InterestRateSwapValuation.{years}y.batch", "throughput", len(market_rates),
+             lambda irs=irs: irs.net_present_value(market_rates)),
+            (f"swaps.CurrencySwapValuation.{years}y.scalar", "latency", 1,
+             lambda ccs=ccs: ccs.net_present_value(0.04, 0.03)),
+            (f"swaps.CurrencySwapValuation.{years}y.batch", "throughput", len(market_rates),
+             lambda ccs=ccs: ccs.net_present_value(market_rates, market_rates - 0.01)),
+            # CommoditySwapValuation discounts every period with market_price as the rate
+            (f"swaps.CommoditySwapValuation.{years}y.scalar", "latency", 1,
+             lambda cms=cms: cms.net_present_value(0.04)),
+            (f"swaps.CommoditySwapValuation.{years}y.batch", "throughput", len(market_rates),
+             lambda cms=cms: cms.net_present_value(market_rates)),
+        ]
+
+    for periods in (2520, 100000):
+        analyzer = PerformanceAnalyzer(_returns(periods, 2), _returns(periods, 3))
+        cases += [
+            (f"perfomance.PerformanceAnalyzer.{periods}.compute_all", "latency", 1,
+             lambda analyzer=analyzer: analyzer.compute_all(0.02)),
+            (f"perfomance.PerformanceAnalyzer.{periods}.max_drawdown", "latency", 1,
+             analyzer.calculate_max_drawdown),
+            (f"perfomance.PerformanceAnalyzer.{periods}.sortino_ratio", "latency", 1,
+             analyzer.calculate_sortino_ratio),
+        ]
+
+    # The same 20 x 4000 position-day book, valued in one call and with one scalar call per position-day
+    rng = np.random.default_rng(5)
+    book_methods = rng.choice(["direct", "partial", "long_term"], 4000)
+    book_spot = 100 + rng.normal(size=(20, 4000))
+    book_futures = book_spot - rng.normal(size=(20, 4000))
+    book_quantity = rng.integers(1, 100, 4000).astype(float)
+    scalar_hedging = {"direct": lambda spot, futures, quantity: direct_hedging(spot, futures, quantity, 0.001),
+                      "partial": lambda spot, futures, quantity: partial_hedging(spot, futures, quantity, 0.5, 0.001),
+                      "long_term": lambda spot, futures, quantity: long_term_hedging(spot, futures, quantity, 1.5,
+                                                                                     0.001)}
+    book_rows = [list(zip(book_methods.tolist(), spot, futures, book_quantity.tolist()))
+                 for spot, futures in zip(book_spot.tolist(), book_futures.tolist())]
+    cases += [
+        ("futures.hedge_book_pnl.batch", "throughput", book_spot.size,
+         lambda: hedge_book_pnl(book_methods, book_spot, book_futures, book_quantity, 0.001, hedge_ratio=0.5,
+                                time_period=1.5)),
+        ("futures.hedging.scalar_loop", "throughput", book_spot.size,
+         lambda: [[scalar_hedging[method](*values) for method, *values in row] for row in book_rows]),
+    ]
+
+    underlyings = [f"U{i}" for i in range(5)]
+    rng = np.random.default_rng(4)
+    portfolio = Portfolio(dict.fromkeys(underlyings, 100.0), dict.fromkeys(underlyings, 0.25), 0.03)
+    portfolio.add_options(rng.choice(underlyings, 10000), rng.normal(0, 10, 10000),
+                          rng.choice(np.arange(60.0, 145.0, 5.0), 10000), rng.choice([0.25, 0.5, 1.0, 2.0], 10000),
+                          rng.choice(["call", "put"], 10000))
+    engine = StressEngine(portfolio)
+    shocks = [SpotShock(np.linspace(-0.3, 0.3, 13), underlyings[:2]),
+              SpotShock(np.linspace(-0.3, 0.3, 13), underlyings[2:], name="spot_2"),
+              VolShock(np.linspace(-0.1, 0.1, 9)), RateShock([-0.01, 0.0, 0.01])]
+    cases.append(("risk.StressEngine.run", "throughput", 13 * 13 * 9 * 3,
+                  lambda: engine.run(shocks, keep_pnl=False)))
+    return cases
+
+
+def time_case(function, repeat, min_time):
+    """
+    Time a function like timeit: loops are batched until one sample takes at least min_time seconds.
+
+    :return: Tuple (median, best) seconds per call over repeat samples.
+    """
+    function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples), min(samples)
+
+
+def peak_memory(function):
+    """Peak memory in bytes traced by tracemalloc during one call."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases, repeat, min_time):
+    results = {}
+    for name, kind, items, function in cases:
+        median, best = time_case(function, repeat, min_time)
+        results[name] = {
+            "kind": kind,
+            "items": items,
+            "median_seconds": median,
+            "best_seconds": best,
+            "items_per_second": items / median,
+            "peak_memory_bytes": peak_memory(function),
+        }
+        print(f"{name:<55} {median * 1e6:12.1f} us  {items / median:14.0f} items/s  "
+              f"{results[name]['peak_memory_bytes'] / 1024:10.1f} KiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every case against a baseline run.
+
+    :return: Names of cases whose median time grew by more than threshold (as a decimal).
+    """
+    regressions = []
+    print(f"\n{'case':<55} {'before':>12} {'after':>12} {'speedup':>9}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        speedup = before["median_seconds"] / result["median_seconds"]
+        flag = ""
+        if result["median_seconds"] > before["median_seconds"] * (1 + threshold):
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<55} {before['median_seconds'] * 1e6:10.1f}us {result['median_seconds'] * 1e6:10.1f}us "
+              f"{speedup:8.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark divergence pricers, Greeks, swaps and metrics.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown (as a decimal) reported as a regression (default 0.1)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples per case (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per sample (default 0.05)")
+    args = parser.parse_args()
+
+    cases = [case for case in build_cases() if args.filter in case[0]]
+    results = run(cases, args.repeat, args.min_time)
+
+    import pandas
+    import scipy
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "pandas": pandas.__version__,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
-from .futures import *
-from .options import *
-from .swaps import *
-from .perfomance import *
+from divergence._lazy import attach
 
-__all__ = ['futures', 'options', 'swap', 'perfomance']
+__all__ = ['futures', 'options', 'swap', 'perfomance', 'risk']
+
+# Subpackages are imported on first attribute access: a process that only values swaps never pays for
+# scipy.stats or pandas. Submodule names that clash between subpackages resolve to the later one, as the
+# former star imports did.
+__getattr__, __dir__ = attach(__name__, ['futures', 'options', 'swaps', 'perfomance', 'risk', 'instrumentation'], {
+    "futures": ("pricing", "hedging", "strategies", "backtesting", "pairs", "sweep", "hedge_book", "hedge_ratios",
+                "curve"),
+    "options": ("pricing", "greeks", "hedging", "strategies", "qmc", "exotics", "multi_asset", "calibration",
+                "proxy"),
+    "swaps": ("swap", "cash_flows", "valuation", "storage", "par_rates", "exposure"),
+    "risk": ("var", "stress"),
+})
@@ -0,0 +1,33 @@
+import importlib
+import sys
+
+
+def attach(package_name, submodules, exports=None):
+    """
+    Build module-level __getattr__ and __dir__ functions (PEP 562) that import submodules on first access.
+
+    :param package_name: The __name__ of the package.
+    :param submodules: Names of the submodules (or subpackages) importable as package attributes.
+    :param exports: (Optional) Mapping of submodule name to the public names it provides as package
+                    attributes. When a name appears under several submodules, the later one wins.
+
+    :return: Tuple (__getattr__, __dir__) to assign in the package __init__.
+    """
+    locations = {}
+    for module_name, names in (exports or {}).items():
+        for name in names:
+            locations[name] = module_name
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module(f"{package_name}.{name}")
+        if name in locations:
+            value = getattr(importlib.import_module(f"{package_name}.{locations[name]}"), name)
+            setattr(sys.modules[package_name], name, value)
+            return value
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package_name])) | set(submodules) | set(locations))
+
+    return __getattr__, __dir__
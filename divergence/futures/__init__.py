@@ -1,5 +1,21 @@
-from .pricing import *
-from .hedging import *
-from .strategies import *
+from divergence._lazy import attach
 
-__all__ = ['pricing', "hedging", "strategies"]
+__all__ = ['pricing', "hedging", "strategies", "backtesting", "pairs", "sweep", "hedge_book", "hedge_ratios", "curve"]
+
+# Submodules are imported on first attribute access, so importing the package stays cheap
+__getattr__, __dir__ = attach(__name__, __all__, {
+    "pricing": ("calculate_kaplan_sharpe_price", "calculate_cost_of_carry_price", "calculate_hanna_price",
+                "calculate_gaussian_price"),
+    "hedging": ("calculate_commission", "direct_hedging", "indirect_hedging", "full_hedging", "partial_hedging",
+                "long_term_hedging", "short_term_hedging", "options_hedging", "cross_hedging"),
+    "strategies": ("buy_and_hold", "arbitrage", "short_selling", "cross_hedging", "volatility_trading",
+                   "pairs_trading"),
+    "backtesting": ("buy_and_hold_positions", "short_selling_positions", "arbitrage_positions",
+                    "pairs_trading_positions", "volatility_trading_positions", "cross_hedging_positions", "backtest"),
+    "pairs": ("rolling_ols_hedge_ratio", "kalman_hedge_ratio", "spread_zscore", "pairs_signals", "screen_pairs"),
+    "sweep": ("parameter_grid", "run_sweep"),
+    "hedge_book": ("HEDGING_METHODS", "hedge_book_pnl"),
+    "hedge_ratios": ("minimum_variance_hedge_ratio", "rolling_minimum_variance_hedge_ratio",
+                     "ewma_minimum_variance_hedge_ratio"),
+    "curve": ("FuturesCurve",),
+})
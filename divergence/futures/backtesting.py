@@ -0,0 +1,132 @@
+import numpy as np
+
+from divergence.futures.hedging import calculate_commission
+
+# Smallest |prices[0]|, relative to the largest price of its column, that the default quantity accepts
+MIN_RELATIVE_PRICE = 1e-3
+
+
+def buy_and_hold_positions(prices):
+    """
+    Positions of a buy-and-hold strategy: long one unit throughout.
+
+    :param prices: Array of prices (time along axis 0, one column per instrument).
+
+    :return: Array of positions with the shape of prices.
+    """
+    return np.ones(np.shape(prices))
+
+
+def short_selling_positions(prices):
+    """
+    Positions of a short-selling strategy: short one unit throughout.
+
+    :param prices: Array of prices (time along axis 0, one column per instrument).
+
+    :return: Array of positions with the shape of prices.
+    """
+    return -np.ones(np.shape(prices))
+
+
+def arbitrage_positions(price_a, price_b):
+    """
+    Positions in the spread price_a - price_b of the arbitrage strategy: buy A and sell B while A is cheaper.
+
+    :param price_a: Array of prices of the first asset.
+    :param price_b: Array of prices of the second asset.
+
+    :return: Array of spread positions (1 or 0), to be backtested on price_a - price_b.
+    """
+    return np.where(np.asarray(price_a) < np.asarray(price_b), 1.0, 0.0)
+
+
+def pairs_trading_positions(price_a, price_b, threshold):
+    """
+    Positions in the spread price_a - price_b of the pairs trading strategy: short the spread while it
+    exceeds the threshold.
+
+    :param price_a: Array of prices of the first asset in the pair.
+    :param price_b: Array of prices of the second asset in the pair.
+    :param threshold: Spread level that triggers trading (scalar, or an array broadcast against the prices
+                      to run many thresholds at once).
+
+    :return: Array of spread positions (-1 or 0), to be backtested on price_a - price_b.
+    """
+    spread = np.asarray(price_a) - np.asarray(price_b)
+    return np.where(spread > threshold, -1.0, 0.0)
+
+
+def volatility_trading_positions(volatility_index, threshold):
+    """
+    Positions of the volatility trading strategy: long while the volatility index exceeds the threshold.
+
+    :param volatility_index: Array of volatility index levels.
+    :param threshold: Volatility level that triggers trading (scalar or broadcastable array).
+
+    :return: Array of positions (1 or 0).
+    """
+    return np.where(np.asarray(volatility_index) > threshold, 1.0, 0.0)
+
+
+def cross_hedging_positions(futures_price, spot_price, hedge_ratio):
+    """
+    Positions in the basis futures_price - spot_price of the cross-hedging strategy.
+
+    :param futures_price: Array of futures prices.
+    :param spot_price: Array of spot prices.
+    :param hedge_ratio: Hedge ratio (scalar, or an array broadcast against the prices).
+
+    :return: Array of basis positions, to be backtested on futures_price - spot_price.
+    """
+    shape = np.broadcast_shapes(np.shape(futures_price), np.shape(spot_price), np.shape(hedge_ratio))
+    return np.broadcast_to(np.asarray(hedge_ratio, dtype=float), shape).copy()
+
+
+def backtest(prices, positions, initial_capital, quantity=None, commission_rate=0.0):
+    """
+    Run a vectorized backtest of target positions over a price history.
+
+    The position decided at the close of period t is held from t to t + 1, so signals never use future
+    prices. Position changes pay a commission on the traded amount, as in futures.hedging.
+
+    :param prices: Array of prices (time along axis 0, one column per instrument or parameter set).
+    :param positions: Target positions in units of quantity, broadcastable to prices.
+    :param initial_capital: Starting capital per column.
+    :param quantity: Units traded per unit of position. Defaults to initial_capital / |prices[0]|, which
+                     makes a buy-and-hold backtest match futures.strategies.buy_and_hold. Spreads such as
+                     price_a - price_b can start near zero, so pass quantity explicitly for them, e.g. sized
+                     from one leg's notional as initial_capital / price_a[0].
+    :param commission_rate: The rate of the commission (as a decimal) on the traded amount.
+
+    :return: Dictionary with held positions, traded units, commission, pnl, equity and returns arrays.
+             The returns feed straight into PerformanceAnalyzer (one column) or
+             CrossSectionalPerformanceAnalyzer (many columns).
+
+    :raises ValueError: If quantity is None and a first price is near zero relative to its column.
+    """
+    prices, positions = np.broadcast_arrays(np.asarray(prices, dtype=float), np.asarray(positions, dtype=float))
+    if quantity is None:
+        # A first price near zero (typically a spread) would size the position at many times the capital
+        if np.any(np.abs(prices[0]) <= MIN_RELATIVE_PRICE * np.abs(prices).max(axis=0)):
+            raise ValueError("First price is near zero, so the default quantity is undefined. "
+                             "Pass quantity explicitly, e.g. sized from one leg's notional for spreads.")
+        quantity = initial_capital / np.abs(prices[0])
+
+    held = np.zeros_like(positions)
+    held[1:] = positions[:-1]
+    traded = np.abs(np.diff(positions, axis=0, prepend=0.0)) * quantity
+    price_change = np.diff(prices, axis=0, prepend=prices[:1])
+
+    commission = calculate_commission(traded * np.abs(prices), commission_rate)
+    pnl = held * quantity * price_change - commission
+    equity = initial_capital + np.cumsum(pnl, axis=0)
+    previous_equity = np.concatenate((np.broadcast_to(initial_capital, equity[:1].shape), equity[:-1]))
+
+    return {
+        "positions": held,
+        "traded": traded,
+        "commission": commission,
+        "pnl": pnl,
+        "equity": equity,
+        "returns": pnl / previous_equity,
+    }
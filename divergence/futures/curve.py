@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class FuturesCurve:
+    """
+    A class to analyze the futures term structure (the strip of expiries) of many underlyings at once.
+
+    Every quantity is a NumPy array with one row per underlying and one column per expiry, so the whole
+    book of curves is priced and analyzed with a handful of array operations.
+
+    :param spot_prices: Current prices of the underlyings, one per underlying.
+    :param expiries: Times until expiration (in years), ascending: one strip shared by all underlyings or
+                     one row per underlying.
+    :param futures_prices: (Optional) Observed futures prices (underlyings x expiries).
+    :param risk_free_rate: Risk-free rate: a scalar or an array broadcastable to (underlyings x expiries),
+                           e.g. a column with one rate per underlying (default is 0.0).
+    """
+
+    def __init__(self, spot_prices, expiries, futures_prices=None, risk_free_rate=0.0):
+        """
+        Initializes the curve with spot prices, expiries and optional observed futures prices.
+
+        :param spot_prices: Current prices of the underlyings, one per underlying.
+        :param expiries: Times until expiration (in years), ascending: one strip shared by all underlyings
+                         or one row per underlying.
+        :param futures_prices: (Optional) Observed futures prices (underlyings x expiries).
+        :param risk_free_rate: Risk-free rate: a scalar or an array broadcastable to (underlyings x expiries)
+                               (default is 0.0).
+        """
+        self.spot_prices = np.asarray(spot_prices, dtype=float).reshape(-1, 1)
+        self.expiries = np.atleast_2d(np.asarray(expiries, dtype=float))
+        self.risk_free_rate = np.asarray(risk_free_rate, dtype=float)
+        self.futures_prices = None
+        if futures_prices is not None:
+            self.update(futures_prices)
+
+    def update(self, futures_prices, spot_prices=None):
+        """
+        Replace the observed futures (and optionally spot) prices, e.g. on every tick.
+
+        :param futures_prices: Observed futures prices (underlyings x expiries).
+        :param spot_prices: (Optional) New spot prices, one per underlying.
+        """
+        self.futures_prices = np.atleast_2d(np.asarray(futures_prices, dtype=float))
+        if spot_prices is not None:
+            self.spot_prices = np.asarray(spot_prices, dtype=float).reshape(-1, 1)
+
+    def _require_futures_prices(self, metric):
+        if self.futures_prices is None:
+            raise ValueError(f"Futures prices must be provided to calculate {metric}.")
+        return self.futures_prices
+
+    def kaplan_sharpe_prices(self):
+        """
+        Calculate futures prices of every expiry with the Kaplan-Sharpe model, S * exp(r * T).
+
+        :return: Array of futures prices (underlyings x expiries).
+        """
+        return self.spot_prices * np.exp(self.risk_free_rate * self.expiries)
+
+    def cost_of_carry_prices(self, storage_cost, dividends=0):
+        """
+        Calculate futures prices of every expiry with the storage cost model,
+        S + storage_cost * T - dividends * exp(-r * T).
+
+        :param storage_cost: Storage cost: a scalar, one per underlying (column) or one per contract.
+        :param dividends: Dividends: a scalar, one per underlying (column) or one per contract (default is 0).
+
+        :return: Array of futures prices (underlyings x expiries).
+        """
+        return (self.spot_prices + np.asarray(storage_cost) * self.expiries
+                - np.asarray(dividends) * np.exp(-self.risk_free_rate * self.expiries))
+
+    def implied_carry(self):
+        """
+        Calculate the annualized continuously compounded carry implied by the observed futures prices,
+        ln(F / S) / T.
+
+        :raises ValueError: If futures prices are not provided.
+
+        :return: Array of implied carry rates (underlyings x expiries).
+        """
+        futures_prices = self._require_futures_prices("implied carry")
+        return np.log(futures_prices / self.spot_prices) / self.expiries
+
+    def implied_convenience_yield(self, storage_yield=0.0):
+        """
+        Calculate the convenience yield implied by F = S * exp((r + storage_yield - y) * T).
+
+        :param storage_yield: Storage cost as a proportional annual yield (default is 0.0).
+
+        :raises ValueError: If futures prices are not provided.
+
+        :return: Array of implied convenience yields (underlyings x expiries).
+        """
+        self._require_futures_prices("implied convenience yield")
+        return self.risk_free_rate + storage_yield - self.implied_carry()
+
+    def roll_yield(self):
+        """
+        Calculate the annualized roll yield of every adjacent pair of expiries, ln(F_near / F_far) / (T_far - T_near).
+        It is positive in backwardation and negative in contango.
+
+        :raises ValueError: If futures prices are not provided.
+
+        :return: Array of roll yields (underlyings x adjacent pairs).
+        """
+        futures_prices = self._require_futures_prices("roll yield")
+        log_prices = np.log(futures_prices)
+        return -np.diff(log_prices, axis=1) / np.diff(self.expiries, axis=1)
+
+    def calendar_spreads(self):
+        """
+        Calculate calendar spreads F_far - F_near of every adjacent pair of expiries.
+
+        :raises ValueError: If futures prices are not provided.
+
+        :return: Array of calendar spreads (underlyings x adjacent pairs).
+        """
+        return np.diff(self._require_futures_prices("calendar spreads"), axis=1)
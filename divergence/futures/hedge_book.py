@@ -0,0 +1,77 @@
+import numpy as np
+
+from divergence.futures.hedging import calculate_commission
+
+HEDGING_METHODS = ("direct", "indirect", "full", "partial", "long_term", "short_term", "options", "cross")
+
+
+def _require(value, name, method):
+    if value is None:
+        raise ValueError(f"{name} must be provided for {method} hedging.")
+    return np.asarray(value, dtype=float)
+
+
+def _profit_or_loss(method, spot_price, futures_price, quantity, hedge_ratio, time_period, spot_price_b,
+                    futures_price_b, quantity_b):
+    """Gross profit or loss of one hedging method, with the formulas of futures.hedging."""
+    if method in ("direct", "options"):
+        return (spot_price - futures_price) * quantity
+    if method in ("indirect", "cross"):
+        profit_or_loss_b = ((_require(spot_price_b, "spot_price_b", method)
+                             - _require(futures_price_b, "futures_price_b", method))
+                            * _require(quantity_b, "quantity_b", method))
+        return (spot_price - futures_price) * quantity + profit_or_loss_b
+    if method == "full":
+        return -futures_price * (quantity / 100)
+    if method == "partial":
+        futures_quantity = quantity * _require(hedge_ratio, "hedge_ratio", method) / 100
+        return -futures_price * futures_quantity + (spot_price - futures_price) * quantity
+    if method in ("long_term", "short_term"):
+        return (spot_price - futures_price) * quantity * _require(time_period, "time_period", method)
+    raise ValueError(f"Invalid hedging method '{method}'. Use one of {', '.join(HEDGING_METHODS)}.")
+
+
+def hedge_book_pnl(method, spot_price, futures_price, quantity, commission_rate, hedge_ratio=None,
+                   time_period=None, spot_price_b=None, futures_price_b=None, quantity_b=None):
+    """
+    Calculate profit or loss and commission of a whole hedge book, and its history, in one call.
+
+    Uses the same formulas as the scalar functions in futures.hedging, but every argument may be an array:
+    one value per position, a time x positions matrix, or anything that broadcasts together. For options
+    hedging pass the option price as futures_price.
+
+    :param method: Hedging method name ("direct", "indirect", "full", "partial", "long_term", "short_term",
+                   "options" or "cross"), or an array of names with one method per position.
+    :param spot_price: Current prices of the assets.
+    :param futures_price: Prices of the futures contracts.
+    :param quantity: Quantities of the assets being hedged.
+    :param commission_rate: The rate of the commission (as a decimal).
+    :param hedge_ratio: (Optional) Ratios indicating how much to hedge, required by partial hedging.
+    :param time_period: (Optional) Time periods in years, required by long-term and short-term hedging.
+    :param spot_price_b: (Optional) Prices of the second assets, required by indirect and cross hedging.
+    :param futures_price_b: (Optional) Futures prices of the second assets, required by indirect and cross hedging.
+    :param quantity_b: (Optional) Quantities of the second assets, required by indirect and cross hedging.
+
+    :return: Dictionary with profit_or_loss, commission and net arrays of the broadcast shape.
+    """
+    spot_price = np.asarray(spot_price, dtype=float)
+    futures_price = np.asarray(futures_price, dtype=float)
+    quantity = np.asarray(quantity, dtype=float)
+    extra = (hedge_ratio, time_period, spot_price_b, futures_price_b, quantity_b)
+
+    methods = np.asarray(method)
+    if methods.ndim == 0:
+        profit_or_loss = _profit_or_loss(str(methods), spot_price, futures_price, quantity, *extra)
+    else:
+        # Each formula is evaluated once for the whole book and selected per position
+        names = np.unique(methods)
+        conditions = [methods == name for name in names]
+        choices = [_profit_or_loss(name, spot_price, futures_price, quantity, *extra) for name in names]
+        profit_or_loss = np.select(conditions, choices)
+
+    commission = calculate_commission(np.abs(profit_or_loss), commission_rate)
+    return {
+        "profit_or_loss": profit_or_loss,
+        "commission": commission,
+        "net": profit_or_loss - commission,
+    }
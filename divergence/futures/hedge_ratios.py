@@ -0,0 +1,79 @@
+import numpy as np
+
+from divergence.perfomance.rolling import rolling_beta
+
+
+def _as_columns(values):
+    values = np.asarray(values, dtype=float)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _ewma(values, decay):
+    """Exponentially weighted average along axis 0, seeded with the first observation."""
+    from scipy.signal import lfilter
+
+    averages, _ = lfilter([1 - decay], [1, -decay], values, axis=0, zi=decay * values[:1])
+    return averages
+
+
+def minimum_variance_hedge_ratio(spot_returns, futures_returns, pairwise=True):
+    """
+    Estimate minimum-variance (OLS) hedge ratios h = Cov(spot, futures) / Var(futures).
+
+    :param spot_returns: Array of spot returns (time along axis 0, one column per exposure).
+    :param futures_returns: Array of futures returns (time along axis 0, one column per hedging contract).
+    :param pairwise: If True, spot column i is hedged with futures column i (or with the single futures
+                     series). If False, ratios are estimated for every spot/futures combination from one
+                     cross-covariance matrix product.
+
+    :return: Array of hedge ratios: one per column when pairwise, otherwise a (spot x futures) matrix.
+    """
+    spot = _as_columns(spot_returns)
+    futures = _as_columns(futures_returns)
+    spot_centered = spot - spot.mean(axis=0)
+    futures_centered = futures - futures.mean(axis=0)
+    futures_m2 = np.einsum("ij,ij->j", futures_centered, futures_centered)
+
+    if pairwise:
+        ratios = (spot_centered * futures_centered).sum(axis=0) / futures_m2
+        return ratios if np.ndim(spot_returns) > 1 or np.ndim(futures_returns) > 1 else ratios[0]
+    return spot_centered.T @ futures_centered / futures_m2
+
+
+def rolling_minimum_variance_hedge_ratio(spot_returns, futures_returns, window):
+    """
+    Estimate minimum-variance hedge ratios over a trailing window.
+
+    :param spot_returns: Array of spot returns (time along axis 0, one column per exposure).
+    :param futures_returns: Futures returns, either one series or one column per exposure.
+    :param window: Number of periods in the rolling window.
+
+    :return: Array of hedge ratios with the shape of spot_returns; the first window - 1 rows are NaN.
+    """
+    return rolling_beta(spot_returns, futures_returns, window)
+
+
+def ewma_minimum_variance_hedge_ratio(spot_returns, futures_returns, decay=0.94):
+    """
+    Estimate minimum-variance hedge ratios from exponentially weighted (RiskMetrics) covariances.
+
+    The covariance and variance recursions, e.g. cov_t = decay * cov_(t-1) + (1 - decay) * s_t * f_t,
+    run as one linear filter along the time axis for all exposures at once, seeded with the first observation.
+
+    :param spot_returns: Array of spot returns (time along axis 0, one column per exposure).
+    :param futures_returns: Futures returns, either one series or one column per exposure.
+    :param decay: Decay factor of the weights, between 0 and 1 (default is 0.94).
+
+    :return: Array of hedge ratios with the shape of spot_returns.
+    """
+    if not 0 < decay < 1:
+        raise ValueError("Decay must be between 0 and 1.")
+    spot = np.asarray(spot_returns, dtype=float)
+    futures = np.asarray(futures_returns, dtype=float)
+    if futures.ndim < spot.ndim:
+        futures = futures[:, None]
+
+    covariance = _ewma(spot * futures, decay)
+    variance = _ewma(futures * futures, decay)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return covariance / variance
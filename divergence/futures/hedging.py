@@ -1,3 +1,7 @@
+from divergence.instrumentation import instrumented
+
+
+@instrumented
 def calculate_commission(amount, commission_rate):
     """
     Calculate the commission based on the amount and commission rate.
@@ -9,6 +13,7 @@ def calculate_commission(amount, commission_rate):
     return amount * commission_rate
 
 
+@instrumented
 def direct_hedging(spot_price, futures_price, quantity, commission_rate):
     """
     Calculate profit or loss from direct hedging.
@@ -24,6 +29,7 @@ def direct_hedging(spot_price, futures_price, quantity, commission_rate):
     return profit_or_loss - commission
 
 
+@instrumented
 def indirect_hedging(spot_price_a, futures_price_a, quantity_a, spot_price_b, futures_price_b, quantity_b, commission_rate):
     """
     Calculate profit or loss from indirect hedging involving two assets.
@@ -44,6 +50,7 @@ def indirect_hedging(spot_price_a, futures_price_a, quantity_a, spot_price_b, fu
     return total_profit_or_loss - commission
 
 
+@instrumented
 def full_hedging(spot_price, futures_price, quantity, commission_rate):
     """
     Calculate profit or loss from full hedging.
@@ -60,6 +67,7 @@ def full_hedging(spot_price, futures_price, quantity, commission_rate):
     return profit_or_loss - commission
 
 
+@instrumented
 def partial_hedging(spot_price, futures_price, quantity, hedge_ratio, commission_rate):
     """
     Calculate profit or loss from partial hedging.
@@ -77,6 +85,7 @@ def partial_hedging(spot_price, futures_price, quantity, hedge_ratio, commission
     return profit_or_loss - commission
 
 
+@instrumented
 def long_term_hedging(spot_price, futures_price, quantity, time_period, commission_rate):
     """
     Calculate profit or loss from long-term hedging.
@@ -93,6 +102,7 @@ def long_term_hedging(spot_price, futures_price, quantity, time_period, commissi
     return profit_or_loss - commission
 
 
+@instrumented
 def short_term_hedging(spot_price, futures_price, quantity, time_period, commission_rate):
     """
     Calculate profit or loss from short-term hedging.
@@ -109,6 +119,7 @@ def short_term_hedging(spot_price, futures_price, quantity, time_period, commiss
     return profit_or_loss - commission
 
 
+@instrumented
 def options_hedging(spot_price, option_price, quantity, commission_rate):
     """
     Calculate profit or loss from options hedging.
@@ -124,6 +135,7 @@ def options_hedging(spot_price, option_price, quantity, commission_rate):
     return profit_or_loss - commission
 
 
+@instrumented
 def cross_hedging(spot_price_a, futures_price_a, quantity_a, spot_price_b, futures_price_b, quantity_b, commission_rate):
     """
     Calculate profit or loss from cross-hedging involving two different assets.
@@ -0,0 +1,169 @@
+import numpy as np
+
+from divergence.perfomance.rolling import rolling_beta, rolling_mean, rolling_std
+
+
+def rolling_ols_hedge_ratio(price_a, price_b, window):
+    """
+    Calculate rolling OLS hedge ratios of price_a on price_b for many pairs at once.
+
+    :param price_a: Array of prices of the first leg (time along axis 0, one column per pair).
+    :param price_b: Array of prices of the second leg, aligned with price_a.
+    :param window: Number of periods in the rolling regression window.
+
+    :return: Tuple (hedge_ratio, intercept) of arrays with the shape of price_a (NaN until the window is filled).
+    """
+    price_a = np.asarray(price_a, dtype=float)
+    price_b = np.asarray(price_b, dtype=float)
+    hedge_ratio = rolling_beta(price_a, price_b, window)
+    intercept = rolling_mean(price_a, window) - hedge_ratio * rolling_mean(price_b, window)
+    return hedge_ratio, intercept
+
+
+def kalman_hedge_ratio(price_a, price_b, delta=1e-4, observation_variance=1e-3):
+    """
+    Estimate time-varying hedge ratios with a Kalman filter, vectorized over pairs.
+
+    The state (hedge ratio, intercept) follows a random walk and price_a is observed as
+    hedge_ratio * price_b + intercept. Each step only uses information up to that period.
+
+    :param price_a: Array of prices of the first leg (time along axis 0, one column per pair).
+    :param price_b: Array of prices of the second leg, aligned with price_a.
+    :param delta: State noise scale; larger values let the hedge ratio adapt faster.
+    :param observation_variance: Variance of the observation noise.
+
+    :return: Tuple (hedge_ratio, intercept, zscore) of arrays with the shape of price_a, where zscore is
+             the one-step forecast error divided by its predicted standard deviation.
+    """
+    price_a = np.asarray(price_a, dtype=float)
+    price_b = np.asarray(price_b, dtype=float)
+    squeeze = price_a.ndim == 1
+    if squeeze:
+        price_a, price_b = price_a[:, None], price_b[:, None]
+
+    num_periods, num_pairs = price_a.shape
+    state_noise = delta / (1 - delta)
+    state = np.zeros((num_pairs, 2))
+    covariance = np.zeros((num_pairs, 2, 2))
+    hedge_ratio = np.empty_like(price_a)
+    intercept = np.empty_like(price_a)
+    zscore = np.empty_like(price_a)
+
+    for t in range(num_periods):
+        observation = np.stack((price_b[t], np.ones(num_pairs)), axis=1)
+        covariance[:, 0, 0] += state_noise
+        covariance[:, 1, 1] += state_noise
+
+        error = price_a[t] - np.einsum("pi,pi->p", observation, state)
+        projected = np.einsum("pij,pj->pi", covariance, observation)
+        error_variance = np.einsum("pi,pi->p", observation, projected) + observation_variance
+        gain = projected / error_variance[:, None]
+
+        state += gain * error[:, None]
+        covariance -= gain[:, :, None] * projected[:, None, :]
+        hedge_ratio[t], intercept[t] = state[:, 0], state[:, 1]
+        zscore[t] = error / np.sqrt(error_variance)
+
+    if squeeze:
+        return hedge_ratio[:, 0], intercept[:, 0], zscore[:, 0]
+    return hedge_ratio, intercept, zscore
+
+
+def spread_zscore(price_a, price_b, hedge_ratio, intercept, window):
+    """
+    Calculate the hedged spread and its rolling z-score for many pairs at once.
+
+    :param price_a: Array of prices of the first leg (time along axis 0, one column per pair).
+    :param price_b: Array of prices of the second leg, aligned with price_a.
+    :param hedge_ratio: Hedge ratios (scalar or array broadcastable to the prices).
+    :param intercept: Regression intercepts (scalar or array broadcastable to the prices).
+    :param window: Number of periods in the rolling z-score window.
+
+    :return: Tuple (spread, zscore) of arrays with the shape of price_a.
+    """
+    spread = np.asarray(price_a, dtype=float) - hedge_ratio * np.asarray(price_b, dtype=float) - intercept
+    valid = ~np.isnan(spread).any(axis=tuple(range(1, spread.ndim)))
+    zscore = np.full(spread.shape, np.nan)
+    # Rolling statistics start once every pair has a defined spread
+    first = int(np.argmax(valid)) if valid.any() else len(spread)
+    if len(spread) - first >= window:
+        tail = spread[first:]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            zscore[first:] = (tail - rolling_mean(tail, window)) / rolling_std(tail, window)
+    return spread, zscore
+
+
+def pairs_signals(zscore, entry_threshold=2.0, exit_threshold=0.5):
+    """
+    Generate spread positions from z-scores: short the spread above entry_threshold, long it below
+    -entry_threshold, and flatten once |z| falls under exit_threshold. Positions persist in between.
+
+    :param zscore: Array of spread z-scores (time along axis 0, one column per pair).
+    :param entry_threshold: Z-score magnitude that opens a position (scalar or broadcastable array).
+    :param exit_threshold: Z-score magnitude under which a position is closed.
+
+    :return: Array of spread positions (-1, 0 or 1) with the broadcast shape of the inputs.
+    """
+    zscore = np.asarray(zscore, dtype=float)
+    events = np.full(np.broadcast_shapes(zscore.shape, np.shape(entry_threshold), np.shape(exit_threshold)),
+                     np.nan)
+    events = np.where(np.abs(zscore) < exit_threshold, 0.0, events)
+    events = np.where(zscore > entry_threshold, -1.0, events)
+    events = np.where(zscore < -entry_threshold, 1.0, events)
+
+    # Forward-fill the last event along time, starting flat
+    positions = np.arange(len(events)).reshape((-1,) + (1,) * (events.ndim - 1))
+    last_event = np.maximum.accumulate(np.where(np.isnan(events), -1, positions), axis=0)
+    filled = np.take_along_axis(events, np.maximum(last_event, 0), axis=0)
+    return np.where(last_event >= 0, filled, 0.0)
+
+
+def screen_pairs(prices, min_correlation=0.8, chunk_size=10000):
+    """
+    Screen every pair of a universe for pairs trading.
+
+    Return correlations and log-price hedge ratios of all N * (N - 1) / 2 pairs come from two covariance
+    matrices (one matrix product each). Pairs above min_correlation are then scored by the half-life of
+    mean reversion of their log-price spread, estimated by an AR(1) regression in batches of chunk_size pairs.
+
+    :param prices: A 2-D array or DataFrame of prices (rows are periods, columns are instruments).
+    :param min_correlation: Minimum return correlation for a pair to be scored (default is 0.8).
+    :param chunk_size: Number of candidate pairs scored per batch, which bounds memory.
+
+    :return: DataFrame with asset_a, asset_b, correlation, hedge_ratio and half_life, sorted by
+             half_life and limited to mean-reverting pairs.
+    """
+    import pandas as pd
+
+    names = np.asarray(prices.columns if isinstance(prices, pd.DataFrame) else np.arange(np.shape(prices)[1]))
+    log_prices = np.log(np.ascontiguousarray(prices, dtype=np.float64))
+    returns = np.diff(log_prices, axis=0)
+
+    standardized = (returns - returns.mean(axis=0)) / returns.std(axis=0, ddof=1)
+    correlation = standardized.T @ standardized / (len(returns) - 1)
+    centered = log_prices - log_prices.mean(axis=0)
+    covariance = centered.T @ centered / (len(log_prices) - 1)
+
+    first, second = np.triu_indices(len(names), k=1)
+    candidates = correlation[first, second] >= min_correlation
+    first, second = first[candidates], second[candidates]
+    hedge_ratio = covariance[first, second] / covariance[second, second]
+
+    half_life = np.empty(len(first))
+    for start in range(0, len(first), chunk_size):
+        batch = slice(start, start + chunk_size)
+        spread = log_prices[:, first[batch]] - hedge_ratio[batch] * log_prices[:, second[batch]]
+        lagged = spread[:-1] - spread[:-1].mean(axis=0)
+        change = np.diff(spread, axis=0)
+        speed = (lagged * (change - change.mean(axis=0))).sum(axis=0) / (lagged * lagged).sum(axis=0)
+        with np.errstate(divide="ignore"):
+            half_life[batch] = np.where(speed < 0, -np.log(2) / speed, np.inf)
+
+    results = pd.DataFrame({
+        "asset_a": names[first],
+        "asset_b": names[second],
+        "correlation": correlation[first, second],
+        "hedge_ratio": hedge_ratio,
+        "half_life": half_life,
+    })
+    return results[np.isfinite(results["half_life"])].sort_values("half_life").reset_index(drop=True)
@@ -1,7 +1,9 @@
 import math
-from scipy.stats import norm
 
+from divergence.instrumentation import instrumented
 
+
+@instrumented
 def calculate_kaplan_sharpe_price(spot_price, strike_price, risk_free_rate, time_to_expiration):
     """
     Calculation of the futures contract price using the Kaplan-Sharpe model.
@@ -15,6 +17,7 @@ def calculate_kaplan_sharpe_price(spot_price, strike_price, risk_free_rate, time
     return spot_price * math.exp(risk_free_rate * time_to_expiration)
 
 
+@instrumented
 def calculate_cost_of_carry_price(spot_price, storage_cost, risk_free_rate, time_to_expiration, dividends=0):
     """
     Calculation of the futures contract price using the storage cost model.
@@ -29,6 +32,7 @@ def calculate_cost_of_carry_price(spot_price, storage_cost, risk_free_rate, time
     return spot_price + storage_cost * time_to_expiration - dividends * math.exp(-risk_free_rate * time_to_expiration)
 
 
+@instrumented
 def calculate_hanna_price(spot_price, demand_factor, supply_factor):
     """
     Calculation of the futures contract price using the Hanna model.
@@ -41,6 +45,7 @@ def calculate_hanna_price(spot_price, demand_factor, supply_factor):
     return spot_price * (1 + demand_factor - supply_factor)
 
 
+@instrumented
 def calculate_gaussian_price(spot_price, volatility, time_to_expiration):
     """
     Calculation of the futures contract price using the Gaussian model.
@@ -50,6 +55,8 @@ def calculate_gaussian_price(spot_price, volatility, time_to_expiration):
     :param time_to_expiration: Time until contract expiration (in years).
     :return: Estimated price of the futures contract.
     """
+    from scipy.stats import norm  # Deferred: scipy.stats is slow to import and only needed here
+
     mean_price = spot_price
     std_dev = volatility * math.sqrt(time_to_expiration)
     return mean_price + std_dev * norm.ppf(0.5)
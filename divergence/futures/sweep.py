@@ -0,0 +1,156 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from divergence.futures.backtesting import backtest
+from divergence.perfomance.metrics import compute_metrics
+
+# Shared memory blocks mapped by this worker process, keyed by block name. Every sweep creates blocks with
+# unique names and its tasks carry their own specs, so sweeps sharing a process never see each other's inputs.
+_attached = {}
+
+# Input names that run_sweep uses for its own arrays
+RESERVED_INPUTS = frozenset(("prices", "benchmark_returns"))
+
+
+def parameter_grid(**values):
+    """
+    Build the Cartesian product of parameter values.
+
+    :param values: Parameter name to a list of values, e.g. threshold=[1, 2, 3].
+
+    :return: DataFrame with one row per parameter set and one column per parameter.
+    """
+    names = list(values)
+    return pd.DataFrame(list(itertools.product(*values.values())), columns=names)
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _shared_inputs(specs):
+    """Maps the shared input arrays described by specs into the worker without copying them."""
+    arrays = {}
+    for key, (name, shape, dtype) in specs.items():
+        if name not in _attached:
+            block = _attach(name)
+            _attached[name] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        arrays[key] = _attached[name][1]
+    return arrays
+
+
+def _init_worker(specs):
+    """Maps the executor's shared inputs once per worker, before its first task."""
+    _shared_inputs(specs)
+
+
+def _evaluate_chunk(strategy, arrays, parameters, vectorized, initial_capital, quantity, commission_rate,
+                    risk_free_rate, target_return):
+    """Backtests one chunk of parameter sets and returns their metrics."""
+    prices = arrays["prices"]
+    benchmark_returns = arrays.get("benchmark_returns")
+    inputs = {key: value for key, value in arrays.items() if key not in RESERVED_INPUTS}
+
+    if vectorized:
+        # Inputs become (T, 1) columns and parameters (G,) rows, so one call covers the whole chunk
+        columns = {key: value[:, None] for key, value in inputs.items()}
+        positions = strategy(**columns, **{name: np.asarray(values) for name, values in parameters.items()})
+    else:
+        points = [dict(zip(parameters, point)) for point in zip(*parameters.values())]
+        positions = np.column_stack([strategy(**inputs, **point) for point in points])
+
+    size = len(next(iter(parameters.values())))
+    positions = np.broadcast_to(positions, (len(prices), size))
+    result = backtest(prices[:, None], positions, initial_capital, quantity, commission_rate)
+    return compute_metrics(result["returns"], benchmark_returns, risk_free_rate, target_return)
+
+
+def _evaluate_shared_chunk(strategy, specs, parameters, *args):
+    """Backtests one chunk in a worker, on the inputs of the sweep that submitted it."""
+    return _evaluate_chunk(strategy, _shared_inputs(specs), parameters, *args)
+
+
+def _share(arrays):
+    """Copies arrays into new shared memory blocks and returns the blocks and their attach specs."""
+    blocks, specs = [], {}
+    for key, array in arrays.items():
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[key] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def run_sweep(strategy, grid, prices, inputs=None, benchmark_returns=None, vectorized=True, initial_capital=1.0,
+              quantity=None, commission_rate=0.0, risk_free_rate=0.0, target_return=0.0, chunk_size=1000,
+              workers=None):
+    """
+    Backtest a strategy over a parameter grid and collect performance metrics per parameter set.
+
+    The strategy is a position function such as those in futures.backtesting: it receives the inputs and
+    one value per parameter as keyword arguments and returns target positions in prices. Inputs are
+    computed once and shared by every grid point.
+
+    :param strategy: Position function, e.g. backtesting.pairs_trading_positions. Must be defined at
+                     module level when workers are used.
+    :param grid: DataFrame or dict of equal-length parameter columns, e.g. from parameter_grid.
+    :param prices: 1-D array of the traded prices (e.g. the spread price_a - price_b for pairs trading).
+    :param inputs: (Optional) Dictionary of precomputed 1-D input arrays passed to the strategy by name.
+                   The names "prices" and "benchmark_returns" are reserved.
+    :param benchmark_returns: (Optional) Benchmark returns for information_ratio, alpha and beta.
+    :param vectorized: If True, the strategy is called once per chunk with inputs shaped (T, 1) and parameter
+                       arrays shaped (G,), and must broadcast them to (T, G) positions. If False, it is
+                       called once per parameter set with 1-D inputs and scalar parameters.
+    :param initial_capital: Starting capital of every backtest (default is 1.0).
+    :param quantity: Units traded per unit of position, as in backtesting.backtest. Required when prices
+                     start near zero, as a spread may: e.g. initial_capital / price_a[0] sizes trades from
+                     one leg's notional.
+    :param commission_rate: The rate of the commission (as a decimal) on the traded amount.
+    :param risk_free_rate: Risk-free rate used by the Sharpe ratio and alpha (default is 0.0).
+    :param target_return: Target return used by the Sortino ratio (default is 0.0).
+    :param chunk_size: Parameter sets evaluated per batch, which bounds memory at T * chunk_size values.
+    :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores). Workers map
+                    the inputs from shared memory instead of receiving a copy each.
+
+    :return: DataFrame with the parameter columns followed by the PerformanceAnalyzer.compute_all metrics.
+
+    :raises ValueError: If inputs use a reserved name.
+    """
+    reserved = sorted(RESERVED_INPUTS.intersection(inputs or {}))
+    if reserved:
+        raise ValueError(f"Reserved input name(s): {', '.join(reserved)}. Pass prices and benchmark returns as "
+                         f"run_sweep arguments and rename other inputs.")
+    grid = pd.DataFrame(grid).reset_index(drop=True)
+    arrays = {key: np.ascontiguousarray(value, dtype=np.float64) for key, value in (inputs or {}).items()}
+    arrays["prices"] = np.ascontiguousarray(prices, dtype=np.float64)
+    if benchmark_returns is not None:
+        arrays["benchmark_returns"] = np.ascontiguousarray(benchmark_returns, dtype=np.float64)
+
+    chunks = [{name: grid[name].to_numpy()[start:start + chunk_size] for name in grid.columns}
+              for start in range(0, len(grid), chunk_size)]
+    args = (vectorized, initial_capital, quantity, commission_rate, risk_free_rate, target_return)
+
+    if workers is None or workers == 1:
+        results = [_evaluate_chunk(strategy, arrays, chunk, *args) for chunk in chunks]
+    else:
+        blocks, specs = _share(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                                     initargs=(specs,)) as executor:
+                futures = [executor.submit(_evaluate_shared_chunk, strategy, specs, chunk, *args) for chunk in chunks]
+                results = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    metrics = {name: np.concatenate([chunk[name] for chunk in results]) for name in results[0]} if results else {}
+    return pd.concat([grid, pd.DataFrame(metrics)], axis=1)
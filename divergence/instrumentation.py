@@ -0,0 +1,208 @@
+"""
+Opt-in instrumentation of the pricing stack.
+
+Pricers, Greeks, valuations and hedging functions are wrapped with @instrumented. While instrumentation
+is disabled (the default) the wrapper only checks one module-level list before calling through. Once
+enabled, every call records its latency and batch size (the largest array argument).
+
+    from divergence import instrumentation
+
+    with instrumentation.measure() as scope:
+        portfolio_hedging(...)
+    print(scope.snapshot())
+
+Latencies are inclusive: a call of greeks_summary also counts its delta, gamma, theta, vega and rho calls
+under their own names.
+"""
+import functools
+import random
+import statistics
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+# Collectors currently receiving calls; empty while instrumentation is disabled
+_collectors = []
+_lock = threading.Lock()
+
+
+class _FunctionStats:
+    """Call count, total/min/max latency, batch sizes and a bounded latency sample of one function."""
+
+    def __init__(self, sample_size):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.min_seconds = float("inf")
+        self.max_seconds = 0.0
+        self.total_items = 0
+        self.max_batch_size = 0
+        self.sample_size = sample_size
+        self.sample = []
+
+    def add(self, seconds, batch_size):
+        self.calls += 1
+        self.total_seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.total_items += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        # Reservoir sampling keeps percentiles unbiased with bounded memory
+        if len(self.sample) < self.sample_size:
+            self.sample.append(seconds)
+        else:
+            index = random.randrange(self.calls)
+            if index < self.sample_size:
+                self.sample[index] = seconds
+
+    def summary(self):
+        if len(self.sample) > 1:
+            percentiles = statistics.quantiles(self.sample, n=100, method="inclusive")
+            p50, p90, p99 = percentiles[49], percentiles[89], percentiles[98]
+        else:
+            p50 = p90 = p99 = self.sample[0]
+        return {
+            "calls": self.calls,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.calls,
+            "min_seconds": self.min_seconds,
+            "max_seconds": self.max_seconds,
+            "p50_seconds": p50,
+            "p90_seconds": p90,
+            "p99_seconds": p99,
+            "total_items": self.total_items,
+            "mean_batch_size": self.total_items / self.calls,
+            "max_batch_size": self.max_batch_size,
+        }
+
+
+class Collector:
+    """
+    Statistics of instrumented calls, keyed by function name.
+
+    :param sample_size: Latencies kept per function for percentiles (default is 10000).
+    """
+
+    def __init__(self, sample_size=10000):
+        self.sample_size = sample_size
+        self.stats = {}
+
+    def record(self, name, seconds, batch_size):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = _FunctionStats(self.sample_size)
+        stats.add(seconds, batch_size)
+
+    def reset(self):
+        self.stats = {}
+
+    def snapshot(self):
+        """
+        Summarize the recorded calls.
+
+        :return: Dictionary of function name to a dictionary with calls, total_seconds, mean_seconds,
+                 min_seconds, max_seconds, p50_seconds, p90_seconds, p99_seconds, total_items,
+                 mean_batch_size and max_batch_size.
+        """
+        with _lock:
+            return {name: stats.summary() for name, stats in sorted(self.stats.items())}
+
+
+_global_collector = Collector()
+
+
+def _batch_size(args, kwargs):
+    """Largest number of elements among the array arguments (NumPy arrays, pandas objects), at least 1."""
+    size = 1
+    for value in (*args, *kwargs.values()):
+        if hasattr(value, "ndim") and hasattr(value, "size"):
+            size = max(size, int(value.size))
+    return size
+
+
+def _record(name, seconds, args, kwargs):
+    batch_size = _batch_size(args, kwargs)
+    with _lock:
+        for collector in _collectors:
+            collector.record(name, seconds, batch_size)
+
+
+def instrumented(function=None, name=None):
+    """
+    Decorator that records the calls of a function while instrumentation is enabled.
+
+    :param function: The function to wrap (when used as @instrumented).
+    :param name: (Optional) Name to record the calls under. Defaults to the module path without the
+                 package prefix and the qualified name, e.g. "options.pricing.black_scholes".
+
+    :return: The wrapped function.
+    """
+    if function is None:
+        return functools.partial(instrumented, name=name)
+    if name is None:
+        module = function.__module__.removeprefix("divergence.")
+        name = f"{module}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _collectors:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _record(name, perf_counter() - start, args, kwargs)
+
+    return wrapper
+
+
+def enable():
+    """Start recording instrumented calls in the global statistics."""
+    with _lock:
+        if _global_collector not in _collectors:
+            _collectors.append(_global_collector)
+
+
+def disable():
+    """Stop recording in the global statistics. Scoped measurements keep recording until they exit."""
+    with _lock:
+        if _global_collector in _collectors:
+            _collectors.remove(_global_collector)
+
+
+def is_enabled():
+    """Return True if any calls are currently being recorded."""
+    return bool(_collectors)
+
+
+def reset():
+    """Clear the global statistics."""
+    with _lock:
+        _global_collector.reset()
+
+
+def snapshot():
+    """
+    Summarize the calls recorded since instrumentation was enabled or last reset.
+
+    :return: Dictionary of function name to call statistics (see Collector.snapshot).
+    """
+    return _global_collector.snapshot()
+
+
+@contextmanager
+def measure(sample_size=10000):
+    """
+    Record instrumented calls made inside a with block, independently of the global statistics.
+
+    :param sample_size: Latencies kept per function for percentiles (default is 10000).
+
+    :return: Context manager yielding a Collector; call its snapshot() method inside or after the block.
+    """
+    collector = Collector(sample_size)
+    with _lock:
+        _collectors.append(collector)
+    try:
+        yield collector
+    finally:
+        with _lock:
+            _collectors.remove(collector)
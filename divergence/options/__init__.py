@@ -1,6 +1,17 @@
-from .pricing import *
-from .greeks import *
-from .hedging import *
-from .strategies import *
+from divergence._lazy import attach
 
-__all__ = ['pricing', "greeks", "hedging", "strategies"]
+__all__ = ['pricing', "greeks", "hedging", "strategies", "qmc", "exotics", "multi_asset", "calibration", "proxy"]
+
+# Submodules are imported on first attribute access, so importing the package stays cheap
+__getattr__, __dir__ = attach(__name__, __all__, {
+    "pricing": ("black_scholes", "binomial_tree", "monte_carlo", "local_volatility", "stochastic_volatility"),
+    "greeks": ("delta", "gamma", "theta", "vega", "rho", "greeks_summary"),
+    "hedging": ("delta_hedging", "gamma_hedging", "vega_hedging", "portfolio_hedging"),
+    "strategies": ("bull_call_spread", "bear_put_spread", "straddle", "strangle", "iron_condor", "covered_call"),
+    "qmc": ("sobol_normals", "brownian_bridge", "randomized_qmc", "points_per_replication"),
+    "exotics": ("BARRIER_TYPES", "geometric_asian_price", "asian_option", "barrier_option", "lookback_option"),
+    "multi_asset": ("kirk_spread_price", "MultiAssetSimulator"),
+    "calibration": ("HESTON_PARAMETERS", "SVI_PARAMETERS", "heston_price", "svi_total_variance", "HestonCalibrator",
+                    "SVICalibrator"),
+    "proxy": ("chebyshev_nodes", "chebyshev_evaluate", "ChebyshevProxy"),
+})
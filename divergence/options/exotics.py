@@ -0,0 +1,242 @@
+import numpy as np
+from scipy.stats import norm
+
+from divergence.instrumentation import instrumented
+
+BARRIER_TYPES = ("up-and-out", "up-and-in", "down-and-out", "down-and-in")
+
+
+def _check_option_type(option_type):
+    if option_type not in ("call", "put"):
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+
+
+def _simulate(S, T, r, sigma, num_steps, num_paths, chunk_size, seed, barrier=None, continuous_monitoring=True):
+    """
+    Simulate GBM paths chunk by chunk, keeping only running statistics per path.
+
+    Memory is O(chunk_size) whatever num_steps: each step overwrites the previous log-prices and only
+    updates the running sums, extrema and barrier survival probabilities.
+
+    :return: Generator of dictionaries per chunk with terminal, arithmetic_mean, geometric_mean, minimum,
+             maximum and (with a barrier) survival arrays.
+    """
+    rng = np.random.default_rng(seed)
+    dt = T / num_steps
+    drift = (r - 0.5 * sigma ** 2) * dt
+    diffusion = sigma * np.sqrt(dt)
+    log_barrier = np.log(barrier) if barrier is not None else None
+
+    for start in range(0, num_paths, chunk_size):
+        size = min(chunk_size, num_paths - start)
+        log_price = np.full(size, np.log(S))
+        price_sum = np.zeros(size)
+        log_sum = np.zeros(size)
+        minimum = np.full(size, float(S))
+        maximum = np.full(size, float(S))
+        survival = np.ones(size) if barrier is not None else None
+
+        for _ in range(num_steps):
+            previous = log_price
+            log_price = previous + drift + diffusion * rng.standard_normal(size)
+            price = np.exp(log_price)
+            price_sum += price
+            log_sum += log_price
+            np.minimum(minimum, price, out=minimum)
+            np.maximum(maximum, price, out=maximum)
+
+            if barrier is not None:
+                distance_before = log_barrier - previous
+                distance_after = log_barrier - log_price
+                crossed = distance_before * distance_after <= 0
+                if continuous_monitoring:
+                    # Brownian bridge: probability that the path crossed the barrier between the two steps
+                    crossing = np.exp(-2 * distance_before * distance_after / (sigma ** 2 * dt))
+                    survival *= np.where(crossed, 0.0, 1 - crossing)
+                else:
+                    survival[crossed] = 0.0
+
+        yield {
+            "terminal": price,
+            "arithmetic_mean": price_sum / num_steps,
+            "geometric_mean": np.exp(log_sum / num_steps),
+            "minimum": minimum,
+            "maximum": maximum,
+            "survival": survival,
+        }
+
+
+def geometric_asian_price(S, K, T, r, sigma, num_steps, option_type="call"):
+    """
+    Calculate the closed-form price of a discretely monitored geometric-average Asian option.
+
+    The average is taken over the num_steps prices at T / num_steps, 2 * T / num_steps, ..., T.
+
+    :param S: Current price of the underlying asset.
+    :param K: Strike price of the option.
+    :param T: Time to expiration (in years).
+    :param r: Risk-free interest rate (annualized).
+    :param sigma: Volatility of the underlying asset (annualized).
+    :param num_steps: Number of averaging dates.
+    :param option_type: Type of the option ("call" or "put").
+
+    :return: Price of the geometric Asian option.
+    """
+    _check_option_type(option_type)
+    n = num_steps
+    mean = np.log(S) + (r - 0.5 * sigma ** 2) * T * (n + 1) / (2 * n)
+    std = sigma * np.sqrt(T * (n + 1) * (2 * n + 1) / (6 * n ** 2))
+    d2 = (mean - np.log(K)) / std
+    d1 = d2 + std
+    forward = np.exp(mean + 0.5 * std ** 2)
+    if option_type == "call":
+        return np.exp(-r * T) * (forward * norm.cdf(d1) - K * norm.cdf(d2))
+    return np.exp(-r * T) * (K * norm.cdf(-d2) - forward * norm.cdf(-d1))
+
+
+class _RunningMoments:
+    """Streaming sums of a payoff and an optional control variate, for the mean and its control-variate correction."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum_y = self.sum_yy = self.sum_x = self.sum_xx = self.sum_xy = 0.0
+
+    def add(self, payoffs, controls=None):
+        self.count += len(payoffs)
+        self.sum_y += payoffs.sum()
+        self.sum_yy += payoffs @ payoffs
+        if controls is not None:
+            self.sum_x += controls.sum()
+            self.sum_xx += controls @ controls
+            self.sum_xy += payoffs @ controls
+
+    def mean(self, control_mean=None):
+        mean_y = self.sum_y / self.count
+        if control_mean is None:
+            return mean_y
+        mean_x = self.sum_x / self.count
+        variance_x = self.sum_xx / self.count - mean_x ** 2
+        if variance_x <= 0:
+            return mean_y
+        beta = (self.sum_xy / self.count - mean_x * mean_y) / variance_x
+        return mean_y - beta * (mean_x - control_mean)
+
+
+@instrumented
+def asian_option(S, K, T, r, sigma, num_steps=252, num_paths=100000, option_type="call", averaging="arithmetic",
+                 control_variate=True, chunk_size=100000, seed=42):
+    """
+    Calculate the price of an Asian (average price) option by Monte Carlo simulation.
+
+    The arithmetic average uses the geometric-average Asian option, which has a closed form and is almost
+    perfectly correlated with it, as a control variate.
+
+    :param S: Current price of the underlying asset.
+    :param K: Strike price of the option.
+    :param T: Time to expiration (in years).
+    :param r: Risk-free interest rate (annualized).
+    :param sigma: Volatility of the underlying asset (annualized).
+    :param num_steps: Number of averaging dates (default is 252).
+    :param num_paths: Number of simulated paths (default is 100000).
+    :param option_type: Type of the option ("call" or "put").
+    :param averaging: "arithmetic" or "geometric" average.
+    :param control_variate: Use the geometric Asian closed form as a control variate (arithmetic only).
+    :param chunk_size: Paths simulated at once, which bounds memory.
+    :param seed: Seed for the random number generator.
+
+    :return: Price of the Asian option.
+    """
+    _check_option_type(option_type)
+    if averaging not in ("arithmetic", "geometric"):
+        raise ValueError("Invalid averaging. Use 'arithmetic' or 'geometric'.")
+    if averaging == "geometric":
+        return geometric_asian_price(S, K, T, r, sigma, num_steps, option_type)
+
+    sign = 1 if option_type == "call" else -1
+    moments = _RunningMoments()
+    for paths in _simulate(S, T, r, sigma, num_steps, num_paths, chunk_size, seed):
+        payoffs = np.maximum(sign * (paths["arithmetic_mean"] - K), 0)
+        controls = np.maximum(sign * (paths["geometric_mean"] - K), 0) if control_variate else None
+        moments.add(payoffs, controls)
+
+    control_mean = None
+    if control_variate:
+        control_mean = geometric_asian_price(S, K, T, r, sigma, num_steps, option_type) * np.exp(r * T)
+    return np.exp(-r * T) * moments.mean(control_mean)
+
+
+@instrumented
+def barrier_option(S, K, T, r, sigma, barrier, barrier_type="up-and-out", num_steps=252, num_paths=100000,
+                   option_type="call", continuous_monitoring=True, chunk_size=100000, seed=42):
+    """
+    Calculate the price of a barrier option by Monte Carlo simulation.
+
+    With continuous monitoring, the probability that the path crossed the barrier between two simulated
+    steps is taken from the Brownian bridge and each path is weighted by its survival probability,
+    which removes the bias of checking the barrier only at the steps.
+
+    :param S: Current price of the underlying asset.
+    :param K: Strike price of the option.
+    :param T: Time to expiration (in years).
+    :param r: Risk-free interest rate (annualized).
+    :param sigma: Volatility of the underlying asset (annualized).
+    :param barrier: Barrier level.
+    :param barrier_type: "up-and-out", "up-and-in", "down-and-out" or "down-and-in".
+    :param num_steps: Number of time steps (default is 252).
+    :param num_paths: Number of simulated paths (default is 100000).
+    :param option_type: Type of the option ("call" or "put").
+    :param continuous_monitoring: Correct for crossings between steps (default is True).
+    :param chunk_size: Paths simulated at once, which bounds memory.
+    :param seed: Seed for the random number generator.
+
+    :return: Price of the barrier option.
+    """
+    _check_option_type(option_type)
+    if barrier_type not in BARRIER_TYPES:
+        raise ValueError(f"Invalid barrier type. Use one of {', '.join(BARRIER_TYPES)}.")
+
+    sign = 1 if option_type == "call" else -1
+    knock_in = barrier_type.endswith("-in")
+    already_crossed = (barrier_type.startswith("up") and S >= barrier) or (barrier_type.startswith("down")
+                                                                           and S <= barrier)
+    moments = _RunningMoments()
+    for paths in _simulate(S, T, r, sigma, num_steps, num_paths, chunk_size, seed, barrier, continuous_monitoring):
+        survival = np.zeros_like(paths["survival"]) if already_crossed else paths["survival"]
+        weight = 1 - survival if knock_in else survival
+        moments.add(np.maximum(sign * (paths["terminal"] - K), 0) * weight)
+    return np.exp(-r * T) * moments.mean()
+
+
+@instrumented
+def lookback_option(S, T, r, sigma, K=None, num_steps=252, num_paths=100000, option_type="call", chunk_size=100000,
+                    seed=42):
+    """
+    Calculate the price of a lookback option by Monte Carlo simulation, monitored at the simulated steps.
+
+    Floating strike (K is None): a call pays S_T - min(S), a put pays max(S) - S_T.
+    Fixed strike: a call pays max(max(S) - K, 0), a put pays max(K - min(S), 0).
+
+    :param S: Current price of the underlying asset.
+    :param T: Time to expiration (in years).
+    :param r: Risk-free interest rate (annualized).
+    :param sigma: Volatility of the underlying asset (annualized).
+    :param K: (Optional) Strike price for a fixed-strike lookback.
+    :param num_steps: Number of time steps (default is 252).
+    :param num_paths: Number of simulated paths (default is 100000).
+    :param option_type: Type of the option ("call" or "put").
+    :param chunk_size: Paths simulated at once, which bounds memory.
+    :param seed: Seed for the random number generator.
+
+    :return: Price of the lookback option.
+    """
+    _check_option_type(option_type)
+    moments = _RunningMoments()
+    for paths in _simulate(S, T, r, sigma, num_steps, num_paths, chunk_size, seed):
+        if K is None:
+            payoffs = (paths["terminal"] - paths["minimum"] if option_type == "call"
+                       else paths["maximum"] - paths["terminal"])
+        else:
+            payoffs = (np.maximum(paths["maximum"] - K, 0) if option_type == "call"
+                       else np.maximum(K - paths["minimum"], 0))
+        moments.add(payoffs)
+    return np.exp(-r * T) * moments.mean()
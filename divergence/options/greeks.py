@@ -1,7 +1,10 @@
 import numpy as np
 from scipy.stats import norm
 
+from divergence.instrumentation import instrumented
 
+
+@instrumented
 def delta(S, K, T, r, sigma, option_type="call"):
     """
     Calculate the Delta of a European option.
@@ -22,6 +25,7 @@ def delta(S, K, T, r, sigma, option_type="call"):
         return norm.cdf(d1) - 1
 
 
+@instrumented
 def gamma(S, K, T, r, sigma):
     """
     Calculate the Gamma of a European option.
@@ -38,6 +42,7 @@ def gamma(S, K, T, r, sigma):
     return norm.pdf(d1) / (S * sigma * np.sqrt(T))
 
 
+@instrumented
 def theta(S, K, T, r, sigma, option_type="call"):
     """
     Calculate the Theta of a European option.
@@ -64,6 +69,7 @@ def theta(S, K, T, r, sigma, option_type="call"):
     return first_term + second_term
 
 
+@instrumented
 def vega(S, K, T, r, sigma):
     """
     Calculate the Vega of a European option.
@@ -80,6 +86,7 @@ def vega(S, K, T, r, sigma):
     return S * norm.pdf(d1) * np.sqrt(T)
 
 
+@instrumented
 def rho(S, K, T, r, sigma, option_type="call"):
     """
     Calculate the Rho of a European option.
@@ -101,6 +108,7 @@ def rho(S, K, T, r, sigma, option_type="call"):
         return -K * T * np.exp(-r * T) * norm.cdf(-d2)
 
 
+@instrumented
 def greeks_summary(S, K, T, r, sigma, option_type="call"):
     """
     Generate a summary dictionary containing all Greeks for a European option.
@@ -1,6 +1,8 @@
+from divergence.instrumentation import instrumented
 from divergence.options.greeks import delta, gamma, vega
 
 
+@instrumented
 def delta_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000, pricing_method=None):
     """
     Calculate the hedge position for Delta hedging.
@@ -31,6 +33,7 @@ def delta_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000,
     return hedge_position
 
 
+@instrumented
 def gamma_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000, pricing_method=None):
     """
     Calculate the hedge position for Gamma hedging.
@@ -62,6 +65,7 @@ def gamma_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000,
     return hedge_position
 
 
+@instrumented
 def vega_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000, pricing_method=None):
     """
     Calculate the hedge position for Vega hedging.
@@ -93,6 +97,7 @@ def vega_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000,
     return hedge_position
 
 
+@instrumented
 def portfolio_hedging(S, K, T, r, sigma, option_type="call", portfolio_value=100000, pricing_method=None):
     """
     Generate a comprehensive hedge position for a portfolio based on Delta,
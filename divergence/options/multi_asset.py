@@ -0,0 +1,232 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.stats import norm
+
+from divergence.instrumentation import instrumented
+
+
+def _check_option_type(option_type):
+    if option_type not in ("call", "put"):
+        raise ValueError("Invalid option type. Use 'call' or 'put'.")
+
+
+def _kirk_volatility(F2, K, sigma1, sigma2, rho):
+    """Volatility of the lognormal that Kirk's approximation substitutes for F2 + K."""
+    sigma_k = sigma2 * F2 / (F2 + K)
+    return sigma_k, np.sqrt(sigma1 ** 2 - 2 * rho * sigma1 * sigma_k + sigma_k ** 2)
+
+
+@instrumented
+def kirk_spread_price(S1, S2, K, T, r, sigma1, sigma2, rho, option_type="call", q1=0.0, q2=0.0):
+    """
+    Calculate the price of a European spread option on S1 - S2 with Kirk's approximation.
+
+    :param S1: Current price of the first asset.
+    :param S2: Current price of the second asset.
+    :param K: Strike price of the spread.
+    :param T: Time to expiration (in years).
+    :param r: Risk-free interest rate (annualized).
+    :param sigma1: Volatility of the first asset (annualized).
+    :param sigma2: Volatility of the second asset (annualized).
+    :param rho: Correlation between the two assets.
+    :param option_type: Type of the option ("call" or "put").
+    :param q1: Dividend (or convenience) yield of the first asset (default is 0.0).
+    :param q2: Dividend (or convenience) yield of the second asset (default is 0.0).
+
+    :return: Price of the spread option.
+    """
+    _check_option_type(option_type)
+    F1 = S1 * np.exp((r - q1) * T)
+    F2 = S2 * np.exp((r - q2) * T)
+    _, sigma = _kirk_volatility(F2, K, sigma1, sigma2, rho)
+    d1 = (np.log(F1 / (F2 + K)) + 0.5 * sigma ** 2 * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    call = np.exp(-r * T) * (F1 * norm.cdf(d1) - (F2 + K) * norm.cdf(d2))
+    if option_type == "call":
+        return call
+    return call - np.exp(-r * T) * (F1 - F2 - K)
+
+
+def _payoffs(simulator, payoff, params, T, normals):
+    """Payoffs (and control variates, or None) of one chunk of correlated normals."""
+    prices = simulator.terminal_prices(T, normals)
+    sign = 1 if params["option_type"] == "call" else -1
+
+    if payoff == "basket":
+        return np.maximum(sign * (prices @ params["weights"] - params["K"]), 0), None
+    if payoff == "best_of":
+        return np.maximum(sign * (prices.max(axis=1) - params["K"]), 0), None
+
+    # Spread option on asset 0 minus asset 1
+    payoffs = np.maximum(sign * (prices[:, 0] - prices[:, 1] - params["K"]), 0)
+    if not params["control_variate"]:
+        return payoffs, None
+    # Kirk's lognormal stand-in for S2 + K, driven by the same normals: its exchange option has exactly
+    # Kirk's price, which makes it a control variate with a known mean
+    forward = simulator.forwards(T)[1]
+    sigma_k, _ = _kirk_volatility(forward, params["K"], *simulator.volatilities[:2], simulator.correlation[0, 1])
+    shifted = (forward + params["K"]) * np.exp(sigma_k * np.sqrt(T) * normals[:, 1] - 0.5 * sigma_k ** 2 * T)
+    return payoffs, np.maximum(sign * (prices[:, 0] - shifted), 0)
+
+
+def _evaluate_chunk(simulator, payoff, params, T, size, seed):
+    """Simulates one chunk and returns its payoff sums (count, y, y^2, x, x^2, xy)."""
+    normals = simulator.correlated_normals(size, np.random.default_rng(seed))
+    payoffs, controls = _payoffs(simulator, payoff, params, T, normals)
+    if controls is None:
+        return np.array([size, payoffs.sum(), payoffs @ payoffs, 0.0, 0.0, 0.0])
+    return np.array([size, payoffs.sum(), payoffs @ payoffs, controls.sum(), controls @ controls, payoffs @ controls])
+
+
+class MultiAssetSimulator:
+    """
+    A class to price options on several correlated assets by Monte Carlo simulation.
+
+    The correlation matrix is Cholesky-factored once when the simulator is created, and every chunk of
+    paths turns independent normals into correlated ones with a single matrix product.
+
+    :param spot_prices: Current prices of the assets.
+    :param volatilities: Volatilities of the assets (annualized).
+    :param correlation: Correlation matrix of the asset returns.
+    :param risk_free_rate: Risk-free interest rate (annualized).
+    :param dividend_yields: Dividend (or convenience) yields of the assets (default is 0.0).
+    """
+
+    def __init__(self, spot_prices, volatilities, correlation, risk_free_rate, dividend_yields=0.0):
+        """
+        Initializes the simulator and factors the correlation matrix.
+
+        :param spot_prices: Current prices of the assets.
+        :param volatilities: Volatilities of the assets (annualized).
+        :param correlation: Correlation matrix of the asset returns.
+        :param risk_free_rate: Risk-free interest rate (annualized).
+        :param dividend_yields: Dividend (or convenience) yields of the assets (default is 0.0).
+
+        :raises ValueError: If the correlation matrix is not positive definite.
+        """
+        self.spot_prices = np.asarray(spot_prices, dtype=float)
+        self.volatilities = np.broadcast_to(np.asarray(volatilities, dtype=float), self.spot_prices.shape)
+        self.correlation = np.asarray(correlation, dtype=float)
+        self.risk_free_rate = risk_free_rate
+        self.dividend_yields = np.broadcast_to(np.asarray(dividend_yields, dtype=float), self.spot_prices.shape)
+        try:
+            self.cholesky = np.linalg.cholesky(self.correlation)
+        except np.linalg.LinAlgError:
+            raise ValueError("Correlation matrix must be positive definite.") from None
+
+    def correlated_normals(self, num_paths, rng):
+        """
+        Draw correlated standard normals.
+
+        :param num_paths: Number of paths.
+        :param rng: A numpy.random.Generator.
+
+        :return: Array with shape (num_paths, number of assets).
+        """
+        return rng.standard_normal((num_paths, len(self.spot_prices))) @ self.cholesky.T
+
+    def forwards(self, T):
+        """Forward prices of the assets for expiry T."""
+        return self.spot_prices * np.exp((self.risk_free_rate - self.dividend_yields) * T)
+
+    def terminal_prices(self, T, normals):
+        """
+        Calculate asset prices at T from correlated standard normals.
+
+        :param T: Time to expiration (in years).
+        :param normals: Correlated standard normals with shape (num_paths, number of assets).
+
+        :return: Array of terminal prices with the shape of normals.
+        """
+        variance = self.volatilities ** 2 * T
+        return self.forwards(T) * np.exp(np.sqrt(variance) * normals - 0.5 * variance)
+
+    def _price(self, payoff, params, T, num_paths, chunk_size, workers, seed, control_mean=None):
+        sizes = [min(chunk_size, num_paths - start) for start in range(0, num_paths, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        args = [(self, payoff, params, T, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+        if workers is None or workers == 1:
+            chunks = [_evaluate_chunk(*chunk_args) for chunk_args in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                chunks = list(executor.map(_evaluate_chunk, *zip(*args)))
+
+        count, sum_y, sum_yy, sum_x, sum_xx, sum_xy = np.sum(chunks, axis=0)
+        mean = sum_y / count
+        if control_mean is not None:
+            mean_x = sum_x / count
+            variance_x = sum_xx / count - mean_x ** 2
+            if variance_x > 0:
+                mean -= (sum_xy / count - mean_x * mean) / variance_x * (mean_x - control_mean)
+        return np.exp(-self.risk_free_rate * T) * mean
+
+    @instrumented
+    def basket_option(self, weights, K, T, option_type="call", num_paths=100000, chunk_size=50000, workers=None,
+                      seed=42):
+        """
+        Calculate the price of a basket option on the weighted sum of the assets.
+
+        :param weights: Weight of every asset in the basket.
+        :param K: Strike price of the basket.
+        :param T: Time to expiration (in years).
+        :param option_type: Type of the option ("call" or "put").
+        :param num_paths: Number of simulated paths (default is 100000).
+        :param chunk_size: Paths simulated at once, which bounds memory.
+        :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores).
+        :param seed: Seed for the random number generator. Prices do not depend on workers.
+
+        :return: Price of the basket option.
+        """
+        _check_option_type(option_type)
+        params = {"weights": np.asarray(weights, dtype=float), "K": K, "option_type": option_type}
+        return self._price("basket", params, T, num_paths, chunk_size, workers, seed)
+
+    @instrumented
+    def spread_option(self, K, T, option_type="call", control_variate=True, num_paths=100000, chunk_size=50000,
+                      workers=None, seed=42):
+        """
+        Calculate the price of a spread option on the first asset minus the second.
+
+        Kirk's approximation is used as a control variate: it is the exact price of an exchange option
+        against a lognormal stand-in for S2 + K that is simulated from the same normals.
+
+        :param K: Strike price of the spread.
+        :param T: Time to expiration (in years).
+        :param option_type: Type of the option ("call" or "put").
+        :param control_variate: Use Kirk's approximation as a control variate (default is True).
+        :param num_paths: Number of simulated paths (default is 100000).
+        :param chunk_size: Paths simulated at once, which bounds memory.
+        :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores).
+        :param seed: Seed for the random number generator. Prices do not depend on workers.
+
+        :return: Price of the spread option.
+        """
+        _check_option_type(option_type)
+        params = {"K": K, "option_type": option_type, "control_variate": control_variate}
+        control_mean = None
+        if control_variate:
+            kirk = kirk_spread_price(*self.spot_prices[:2], K, T, self.risk_free_rate, *self.volatilities[:2],
+                                     self.correlation[0, 1], option_type, *self.dividend_yields[:2])
+            control_mean = kirk * np.exp(self.risk_free_rate * T)
+        return self._price("spread", params, T, num_paths, chunk_size, workers, seed, control_mean)
+
+    @instrumented
+    def best_of_option(self, K, T, option_type="call", num_paths=100000, chunk_size=50000, workers=None, seed=42):
+        """
+        Calculate the price of a best-of option on the highest asset price at expiry.
+
+        :param K: Strike price of the option.
+        :param T: Time to expiration (in years).
+        :param option_type: Type of the option ("call" or "put").
+        :param num_paths: Number of simulated paths (default is 100000).
+        :param chunk_size: Paths simulated at once, which bounds memory.
+        :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores).
+        :param seed: Seed for the random number generator. Prices do not depend on workers.
+
+        :return: Price of the best-of option.
+        """
+        _check_option_type(option_type)
+        return self._price("best_of", {"K": K, "option_type": option_type}, T, num_paths, chunk_size, workers, seed)
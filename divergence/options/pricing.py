@@ -1,8 +1,20 @@
 import numpy as np
 from scipy.stats import norm
 
+from divergence.instrumentation import instrumented
+from divergence.options.qmc import brownian_bridge, points_per_replication, randomized_qmc
+
+
+def _discounted(mean_payoff, standard_error, r, T, return_error):
+    """Discount a simulated mean payoff, with its standard error if requested."""
+    discount = np.exp(-r * T)
+    if return_error:
+        return discount * mean_payoff, discount * standard_error
+    return discount * mean_payoff
+
 
 # Black-Scholes model
+@instrumented
 def black_scholes(S, K, T, r, sigma, option_type="call"):
     """
     Calculate option price using the Black-Scholes model.
@@ -30,6 +42,7 @@ def black_scholes(S, K, T, r, sigma, option_type="call"):
 
 
 # Binomial tree model
+@instrumented
 def binomial_tree(S, K, T, r, sigma, N, option_type="call"):
     """
     Calculate option price using the Binomial Tree model.
@@ -63,7 +76,9 @@ def binomial_tree(S, K, T, r, sigma, N, option_type="call"):
 
 
 # Monte Carlo model
-def monte_carlo(S, K, T, r, sigma, num_simulations=10000, option_type="call"):
+@instrumented
+def monte_carlo(S, K, T, r, sigma, num_simulations=10000, option_type="call", sampling="pseudo", num_replications=8,
+                return_error=False):
     """
     Calculate option price using Monte Carlo simulation.
 
@@ -75,23 +90,36 @@ def monte_carlo(S, K, T, r, sigma, num_simulations=10000, option_type="call"):
     sigma : float  -> Volatility of the underlying asset
     num_simulations : int  -> Number of simulations to run
     option_type : str  -> "call" or "put"
+    sampling : str  -> "pseudo" (pseudo-random normals) or "sobol" (randomized scrambled Sobol points)
+    num_replications : int  -> Independent Sobol scramblings sharing num_simulations ("sobol" only)
+    return_error : bool  -> Also return the standard error of the price
 
     Returns:
-    float: Option price
+    float: Option price, or tuple (price, standard error) if return_error is True. With "sobol" sampling the
+           standard error is the spread of the replications, with "pseudo" sampling that of the payoffs.
     """
+    def payoff(Z):
+        ST = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
+        if option_type == "call":
+            return np.maximum(ST - K, 0)
+        return np.maximum(K - ST, 0)
+
+    if sampling == "sobol":
+        num_points = points_per_replication(num_simulations, num_replications)
+        mean_payoff, standard_error = randomized_qmc(lambda normals: payoff(normals[:, 0]), num_points, 1,
+                                                     num_replications, seed=42)
+        return _discounted(mean_payoff, standard_error, r, T, return_error)
+    if sampling != "pseudo":
+        raise ValueError("Invalid sampling. Use 'pseudo' or 'sobol'.")
+
     np.random.seed(42)
     Z = np.random.standard_normal(num_simulations)
-    ST = S * np.exp((r - 0.5 * sigma ** 2) * T + sigma * np.sqrt(T) * Z)
-
-    if option_type == "call":
-        payoff = np.maximum(ST - K, 0)
-    else:
-        payoff = np.maximum(K - ST, 0)
-
-    return np.exp(-r * T) * np.mean(payoff)
+    payoffs = payoff(Z)
+    return _discounted(np.mean(payoffs), np.std(payoffs, ddof=1) / np.sqrt(len(payoffs)), r, T, return_error)
 
 
 # Local volatility model (placeholder)
+@instrumented
 def local_volatility(S, K, T, r, sigma_surface, option_type="call"):
     """
     Local volatility pricing using an interpolated volatility surface.
@@ -115,8 +143,9 @@ def local_volatility(S, K, T, r, sigma_surface, option_type="call"):
 
 
 # Stochastic volatility model (Heston model placeholder)
+@instrumented
 def stochastic_volatility(S, K, T, r, v0, kappa, theta, sigma,
-                          rho=0.0, option_type="call"):
+                          rho=0.0, option_type="call", sampling="pseudo", num_replications=8, return_error=False):
     """
     Stochastic volatility pricing using Heston model.
 
@@ -133,25 +162,50 @@ def stochastic_volatility(S, K, T, r, v0, kappa, theta, sigma,
     sigma_heston: float  -> Volatility of variance process
     rho: float  -> Correlation between asset and variance processes
     option_type: str -> call" or "put"
+    sampling: str  -> "pseudo" (pseudo-random normals) or "sobol" (randomized scrambled Sobol points,
+                      with Brownian-bridge paths)
+    num_replications: int  -> Independent Sobol scramblings sharing the simulations ("sobol" only)
+    return_error: bool  -> Also return the standard error of the price
 
     Returns:
-    float: Option price based on stochastic volatility.
+    float: Option price based on stochastic volatility, or tuple (price, standard error) if return_error is True.
     """
     # Monte Carlo simulation for Heston Model (simplified)
     num_simulations = 10000
-    dt = T / 100  # Time steps
-    V = np.full(num_simulations, v0)
-    S_sim = np.full(num_simulations, S)
-
-    for _ in range(100):
-        dW1 = np.random.randn(num_simulations) * np.sqrt(dt)
-        dW2 = rho * dW1 + np.sqrt(1 - rho ** 2) * np.random.randn(num_simulations) * np.sqrt(dt)
-        V = np.maximum(0, V + kappa * (theta - V) * dt + sigma * np.sqrt(V) * dW1)
-        S_sim *= np.exp((r - 0.5 * V) * dt + np.sqrt(V) * dW2)
-
-    if option_type == "call":
-        payoff = np.maximum(S_sim - K, 0)
-    else:
-        payoff = np.maximum(K - S_sim, 0)
-
-    return np.exp(-r * T) * np.mean(payoff)
+    num_steps = 100
+    dt = T / num_steps  # Time steps
+
+    def payoff(shocks, num_paths):
+        V = np.full(num_paths, v0)
+        S_sim = np.full(num_paths, S, dtype=float)
+
+        for Z1, Z2 in shocks:
+            dW1 = Z1 * np.sqrt(dt)
+            dW2 = rho * dW1 + np.sqrt(1 - rho ** 2) * Z2 * np.sqrt(dt)
+            # Both steps use the variance at the start of the step, so S stays a martingale under r
+            S_sim *= np.exp((r - 0.5 * V) * dt + np.sqrt(V) * dW2)
+            V = np.maximum(0, V + kappa * (theta - V) * dt + sigma * np.sqrt(V) * dW1)
+
+        if option_type == "call":
+            return np.maximum(S_sim - K, 0)
+        return np.maximum(K - S_sim, 0)
+
+    if sampling == "sobol":
+        times = dt * np.arange(1, num_steps + 1)
+
+        def sobol_payoff(normals):
+            # Interleave the two Brownian motions so both take their coarse bridge levels from leading dimensions
+            increments = [np.diff(brownian_bridge(normals[:, i::2], times), axis=1, prepend=0.0) / np.sqrt(dt)
+                          for i in range(2)]
+            return payoff(zip(increments[0].T, increments[1].T), len(normals))
+
+        num_points = points_per_replication(num_simulations, num_replications)
+        mean_payoff, standard_error = randomized_qmc(sobol_payoff, num_points, 2 * num_steps, num_replications,
+                                                     seed=42)
+        return _discounted(mean_payoff, standard_error, r, T, return_error)
+    if sampling != "pseudo":
+        raise ValueError("Invalid sampling. Use 'pseudo' or 'sobol'.")
+
+    shocks = ((np.random.randn(num_simulations), np.random.randn(num_simulations)) for _ in range(num_steps))
+    payoffs = payoff(shocks, num_simulations)
+    return _discounted(np.mean(payoffs), np.std(payoffs, ddof=1) / np.sqrt(num_simulations), r, T, return_error)
@@ -0,0 +1,193 @@
+import numpy as np
+
+from divergence.instrumentation import instrumented
+
+# Scaled points may exceed [-1, 1] by this much (rounding at the domain edges) and still count as inside
+DOMAIN_TOLERANCE = 1e-12
+
+
+def chebyshev_nodes(degree):
+    """
+    Chebyshev points of the first kind on [-1, 1].
+
+    :param degree: Polynomial degree; degree + 1 nodes are returned.
+
+    :return: Array of nodes in decreasing order.
+    """
+    n = degree + 1
+    return np.cos(np.pi * (np.arange(n) + 0.5) / n)
+
+
+def _chebyshev_transform(values, axis):
+    """Chebyshev coefficients along one axis of values sampled at the first-kind nodes (a discrete cosine transform)."""
+    n = values.shape[axis]
+    order = np.arange(n)
+    basis = np.cos(np.pi * np.outer(order, order + 0.5) / n) * 2 / n
+    basis[0] /= 2
+    return np.moveaxis(np.tensordot(basis, values, axes=([1], [axis])), 0, axis)
+
+
+def chebyshev_evaluate(coefficients, points, chunk_size=2048):
+    """
+    Evaluate a tensor Chebyshev series at many points.
+
+    The basis T_k(x) = cos(k * arccos(x)) of every dimension is computed for a chunk of points at once and
+    contracted with the coefficients, the first (largest) contraction as one matrix product.
+
+    :param coefficients: Array of coefficients with one axis per dimension.
+    :param points: Array of points on [-1, 1]^d with shape (num_points, d).
+    :param chunk_size: Points evaluated at once, which bounds memory.
+
+    :return: Array of values with shape (num_points,).
+    """
+    values = np.empty(len(points))
+    first = coefficients.reshape(len(coefficients), -1)
+    for start in range(0, len(points), chunk_size):
+        chunk = points[start:start + chunk_size]
+        angles = np.arccos(chunk)
+        bases = [np.cos(angles[:, [dimension]] * np.arange(n)) for dimension, n in enumerate(coefficients.shape)]
+        partial = (bases[0] @ first).reshape((len(chunk),) + coefficients.shape[1:])
+        for basis in bases[1:]:
+            partial = np.einsum("mk...,mk->m...", partial, basis)
+        values[start:start + chunk_size] = partial
+    return values
+
+
+class ChebyshevProxy:
+    """
+    A class to replace an expensive pricer by a tensor Chebyshev interpolant over chosen dimensions.
+
+    The pricer is sampled once on a Chebyshev grid over the domain (e.g. S, sigma and T), and the
+    coefficients are stored, so each evaluation costs a few small vectorized contractions instead of a tree
+    or a simulation. Evaluating outside the domain rebuilds the proxy over a domain that contains
+    the new inputs.
+
+    :param pricer: A pricing function such as divergence.options.pricing.binomial_tree.
+    :param domain: Dictionary mapping each proxied keyword argument to its (low, high) range.
+    :param fixed: (Optional) Dictionary of the pricer's other keyword arguments.
+    :param degree: Polynomial degree, an integer or a dictionary per dimension (default is 12).
+    :param vectorized: Whether the pricer accepts arrays, so the grid is priced in one call (default is False).
+    :param auto_rebuild: Rebuild when inputs leave the domain instead of raising (default is True).
+    :param margin: Fraction of the range added on each side when the domain is extended (default is 0.1).
+    """
+
+    def __init__(self, pricer, domain, fixed=None, degree=12, vectorized=False, auto_rebuild=True, margin=0.1):
+        """
+        Initializes the proxy and builds it.
+
+        :param pricer: A pricing function such as divergence.options.pricing.binomial_tree.
+        :param domain: Dictionary mapping each proxied keyword argument to its (low, high) range.
+        :param fixed: (Optional) Dictionary of the pricer's other keyword arguments.
+        :param degree: Polynomial degree, an integer or a dictionary per dimension (default is 12).
+        :param vectorized: Whether the pricer accepts arrays, so the grid is priced in one call (default is False).
+        :param auto_rebuild: Rebuild when inputs leave the domain instead of raising (default is True).
+        :param margin: Fraction of the range added on each side when the domain is extended (default is 0.1).
+        """
+        self.pricer = pricer
+        self.dimensions = tuple(domain)
+        self.domain = {name: (float(low), float(high)) for name, (low, high) in domain.items()}
+        self.fixed = dict(fixed or {})
+        self.degrees = {name: degree[name] if isinstance(degree, dict) else degree for name in self.dimensions}
+        self.vectorized = vectorized
+        self.auto_rebuild = auto_rebuild
+        self.margin = margin
+        self.rebuilds = 0
+        self.coefficients = None
+        self.build()
+
+    def _scale(self, points):
+        """Map points with one column per dimension onto [-1, 1]^d."""
+        return (2 * points - self._center) / self._width
+
+    def _unscale(self, name, nodes):
+        low, high = self.domain[name]
+        return 0.5 * (low + high) + 0.5 * (high - low) * nodes
+
+    def _price(self, grid):
+        """Price the pricer on a dictionary of equally shaped arrays."""
+        if self.vectorized:
+            return np.broadcast_to(self.pricer(**self.fixed, **grid), next(iter(grid.values())).shape)
+        shape = next(iter(grid.values())).shape
+        prices = np.empty(shape)
+        for index in np.ndindex(shape):
+            prices[index] = self.pricer(**self.fixed, **{name: values[index] for name, values in grid.items()})
+        return prices
+
+    @instrumented
+    def build(self):
+        """
+        Sample the pricer on the Chebyshev grid of the current domain and compute the coefficients.
+
+        :return: The proxy itself.
+        """
+        axes = [self._unscale(name, chebyshev_nodes(self.degrees[name])) for name in self.dimensions]
+        grid = dict(zip(self.dimensions, np.meshgrid(*axes, indexing="ij")))
+        low, high = np.array([self.domain[name] for name in self.dimensions]).T
+        self._center, self._width = low + high, high - low
+        coefficients = self._price(grid)
+        for axis in range(len(self.dimensions)):
+            coefficients = _chebyshev_transform(coefficients, axis)
+        self.coefficients = coefficients
+        return self
+
+    @property
+    def error_bound(self):
+        """
+        Estimated maximum interpolation error over the domain.
+
+        For smooth pricers the coefficients decay geometrically, so the truncated tail is of the order of the
+        highest-order coefficients: this sums their absolute values along every dimension.
+        """
+        return sum(np.abs(np.take(self.coefficients, -1, axis=axis)).sum() for axis in range(self.coefficients.ndim))
+
+    def _extend_domain(self, values):
+        """Widen the domain to contain values and return whether it changed."""
+        changed = False
+        for name in self.dimensions:
+            low, high = self.domain[name]
+            new_low, new_high = min(low, np.min(values[name])), max(high, np.max(values[name]))
+            if (new_low, new_high) != (low, high):
+                width = new_high - new_low
+                self.domain[name] = (new_low - self.margin * width if new_low < low else low,
+                                     new_high + self.margin * width if new_high > high else high)
+                changed = True
+        return changed
+
+    def __call__(self, **values):
+        """
+        Evaluate the proxy.
+
+        :param values: Value (or array of values) of every proxied dimension, as keyword arguments.
+
+        :return: Proxy price(s) with the broadcast shape of the inputs.
+
+        :raises ValueError: If an input is outside the domain and auto_rebuild is False.
+        """
+        if values.keys() != set(self.dimensions):
+            raise ValueError(f"Proxy must be evaluated with exactly {', '.join(self.dimensions)}.")
+        arrays = np.broadcast_arrays(*(np.asarray(values[name], dtype=float) for name in self.dimensions))
+        points = self._scale(np.column_stack([array.ravel() for array in arrays]))
+        # Scaling the domain edges can land a rounding error outside [-1, 1]: that is still inside
+        if np.abs(points).max() > 1 + DOMAIN_TOLERANCE:
+            if not self.auto_rebuild:
+                raise ValueError("Inputs are outside the proxy domain.")
+            if self._extend_domain(dict(zip(self.dimensions, arrays))):
+                self.build()
+                self.rebuilds += 1
+                points = self._scale(np.column_stack([array.ravel() for array in arrays]))
+
+        prices = chebyshev_evaluate(self.coefficients, np.clip(points, -1, 1)).reshape(arrays[0].shape)
+        return prices if prices.ndim else prices.item()
+
+    def validate(self, num_samples=100, seed=0):
+        """
+        Measure the actual error of the proxy against the pricer at random points of the domain.
+
+        :param num_samples: Number of random points (default is 100).
+        :param seed: Seed for the random number generator.
+
+        :return: Maximum absolute error over the samples.
+        """
+        rng = np.random.default_rng(seed)
+        samples = {name: rng.uniform(low, high, num_samples) for name, (low, high) in self.domain.items()}
+        return float(np.max(np.abs(self(**samples) - self._price(samples))))
@@ -0,0 +1,96 @@
+from collections import deque
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+
+def sobol_normals(num_points, dimensions, seed=None):
+    """
+    Generate standard normal draws from a scrambled Sobol sequence mapped through the inverse normal CDF.
+
+    :param num_points: Number of points. Powers of two keep the balance properties of the sequence.
+    :param dimensions: Number of normals per point (e.g. time steps x Brownian motions).
+    :param seed: Seed or numpy.random.Generator for the scrambling.
+
+    :return: Array of standard normals with shape (num_points, dimensions).
+    """
+    sampler = qmc.Sobol(dimensions, scramble=True, seed=seed)
+    num_points = int(num_points)
+    if num_points & (num_points - 1) == 0:
+        uniforms = sampler.random_base2(num_points.bit_length() - 1)
+    else:
+        uniforms = sampler.random(num_points)
+    return ndtri(np.clip(uniforms, np.finfo(float).tiny, 1 - np.finfo(float).eps))
+
+
+def _bridge_schedule(times):
+    """Construction order of a Brownian bridge: the end point first, then midpoints level by level."""
+    last = len(times) - 1
+    schedule = [(last, -1, -1, 0.0, 0.0, np.sqrt(times[last]))]
+    intervals = deque([(-1, last)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        t_left = times[left] if left >= 0 else 0.0
+        t_middle, t_right = times[middle], times[right]
+        span = t_right - t_left
+        schedule.append((middle, left, right, (t_right - t_middle) / span, (t_middle - t_left) / span,
+                         np.sqrt((t_middle - t_left) * (t_right - t_middle) / span)))
+        intervals.extend(((left, middle), (middle, right)))
+    return schedule
+
+
+def brownian_bridge(normals, times):
+    """
+    Build Brownian motion paths from normals with the Brownian bridge construction.
+
+    The first normal of every path fixes the terminal value and the following ones fill in midpoints
+    level by level, so the leading (best distributed) Sobol dimensions drive the path's large-scale shape.
+
+    :param normals: Array of standard normals with shape (num_paths, len(times)).
+    :param times: Increasing observation times, all greater than zero.
+
+    :return: Array of Brownian motion values W(times) with shape (num_paths, len(times)).
+    """
+    normals = np.asarray(normals, dtype=float)
+    times = np.asarray(times, dtype=float)
+    # Column 0 holds W(0) = 0, so index -1 in the schedule maps to it
+    paths = np.zeros((len(normals), len(times) + 1))
+    for dimension, (index, left, right, left_weight, right_weight, std) in enumerate(_bridge_schedule(times)):
+        paths[:, index + 1] = (left_weight * paths[:, left + 1] + right_weight * paths[:, right + 1]
+                               + std * normals[:, dimension])
+    return paths[:, 1:]
+
+
+def randomized_qmc(evaluate, num_points, dimensions, num_replications=8, seed=None):
+    """
+    Estimate an expectation with independently scrambled Sobol replications.
+
+    Each replication is an unbiased QMC estimate, so their spread gives a standard error that a single
+    Sobol sequence cannot provide.
+
+    :param evaluate: Function mapping a (num_points, dimensions) array of standard normals to one value per point.
+    :param num_points: Points per replication (preferably a power of two).
+    :param dimensions: Number of normals per point.
+    :param num_replications: Number of independent scramblings (default is 8).
+    :param seed: Seed for the scramblings.
+
+    :return: Tuple (estimate, standard_error).
+    """
+    generators = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(num_replications)]
+    estimates = np.array([np.mean(evaluate(sobol_normals(num_points, dimensions, generator)))
+                          for generator in generators])
+    standard_error = estimates.std(ddof=1) / np.sqrt(num_replications) if num_replications > 1 else np.nan
+    return estimates.mean(), standard_error
+
+
+def points_per_replication(num_simulations, num_replications):
+    """
+    Split a simulation budget into equal Sobol replications, rounding to the nearest power of two.
+
+    :return: Number of points per replication (at least 1).
+    """
+    return 2 ** max(0, round(np.log2(max(num_simulations / num_replications, 1))))
@@ -1,3 +1,7 @@
+from divergence.instrumentation import instrumented
+
+
+@instrumented
 def bull_call_spread(S, K1, K2, T, r, sigma, pricing_method):
     """
     Calculate the profit from a bull call spread.
@@ -15,6 +19,7 @@ def bull_call_spread(S, K1, K2, T, r, sigma, pricing_method):
     return pricing_method(S, K1, T, r, sigma, "call") - pricing_method(S, K2, T, r, sigma, "call")
 
 
+@instrumented
 def bear_put_spread(S, K1, K2, T, r, sigma, pricing_method):
     """
     Calculate the profit from a bear put spread.
@@ -32,6 +37,7 @@ def bear_put_spread(S, K1, K2, T, r, sigma, pricing_method):
     return pricing_method(S, K1, T, r, sigma, "put") - pricing_method(S, K2, T, r, sigma, "put")
 
 
+@instrumented
 def straddle(S, K, T, r, sigma, pricing_method):
     """
     Calculate the profit from a straddle.
@@ -48,6 +54,7 @@ def straddle(S, K, T, r, sigma, pricing_method):
     return pricing_method(S, K, T, r, sigma, "call") + pricing_method(S, K, T, r, sigma, "put")
 
 
+@instrumented
 def strangle(S, K1, K2, T, r, sigma, pricing_method):
     """
     Calculate the profit from a strangle.
@@ -65,6 +72,7 @@ def strangle(S, K1, K2, T, r, sigma, pricing_method):
     return pricing_method(S, K1, T, r, sigma, "call") + pricing_method(S, K2, T, r, sigma, "put")
 
 
+@instrumented
 def iron_condor(S, K1, K2, K3, K4, T, r, sigma, pricing_method):
     """
     Calculate the profit from an iron condor.
@@ -87,6 +95,7 @@ def iron_condor(S, K1, K2, K3, K4, T, r, sigma, pricing_method):
            pricing_method(S, K4, T, r, sigma, "put"))
 
 
+@instrumented
 def covered_call(S, K, T, r, sigma, pricing_method):
     """
     Calculate the profit from a covered call.
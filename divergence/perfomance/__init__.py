@@ -0,0 +1,5 @@
+from divergence._lazy import attach
+
+# Submodules are imported on first attribute access, so importing the package stays cheap
+__getattr__, __dir__ = attach(__name__, ['performance', 'metrics', 'cross_sectional', 'rolling', 'bootstrap',
+                                         'streaming'])
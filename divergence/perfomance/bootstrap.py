@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from divergence.perfomance.metrics import compute_metrics
+
+
+def stationary_bootstrap_indices(n, num_resamples, mean_block_length, rng):
+    """
+    Generate stationary bootstrap (Politis-Romano) resample indices for all resamples at once.
+
+    Blocks start at uniformly random positions, have geometric lengths with the given mean and wrap
+    around the end of the series.
+
+    :param n: Length of the series.
+    :param num_resamples: Number of resamples.
+    :param mean_block_length: Expected block length.
+    :param rng: A numpy.random.Generator.
+
+    :return: Integer index matrix with shape (n, num_resamples).
+    """
+    new_block = rng.random((n, num_resamples)) < 1.0 / mean_block_length
+    new_block[0] = True
+    starts = rng.integers(0, n, size=(n, num_resamples))
+
+    positions = np.arange(n)[:, None]
+    block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=0)
+    start_index = np.take_along_axis(starts, block_start, axis=0)
+    return (start_index + positions - block_start) % n
+
+
+def block_bootstrap_indices(n, num_resamples, block_length, rng):
+    """
+    Generate circular moving-block bootstrap resample indices for all resamples at once.
+
+    :param n: Length of the series.
+    :param num_resamples: Number of resamples.
+    :param block_length: Length of every block.
+    :param rng: A numpy.random.Generator.
+
+    :return: Integer index matrix with shape (n, num_resamples).
+    """
+    num_blocks = -(-n // block_length)
+    starts = rng.integers(0, n, size=(num_blocks, 1, num_resamples))
+    offsets = np.arange(block_length)[None, :, None]
+    return ((starts + offsets) % n).reshape(num_blocks * block_length, num_resamples)[:n]
+
+
+def _resample(returns, benchmark_returns, method, block_length, num_resamples, rng):
+    """Draws one batch of resampled return (and benchmark) matrices with shape (n, num_resamples)."""
+    n = len(returns)
+    if method == "monte_carlo":
+        if benchmark_returns is None:
+            draws = rng.normal(returns.mean(), returns.std(ddof=1), size=(n, num_resamples))
+            return draws, None
+        mean = [returns.mean(), benchmark_returns.mean()]
+        draws = rng.multivariate_normal(mean, np.cov(returns, benchmark_returns), size=(n, num_resamples))
+        return draws[..., 0], draws[..., 1]
+
+    if method == "stationary":
+        indices = stationary_bootstrap_indices(n, num_resamples, block_length, rng)
+    elif method == "block":
+        indices = block_bootstrap_indices(n, num_resamples, block_length, rng)
+    else:
+        raise ValueError("Invalid method. Use 'stationary', 'block' or 'monte_carlo'.")
+    return returns[indices], benchmark_returns[indices] if benchmark_returns is not None else None
+
+
+def _evaluate_chunk(returns, benchmark_returns, method, block_length, num_resamples, seed, metric_names,
+                    risk_free_rate, target_return):
+    """Evaluates the requested metrics on one batch of resamples."""
+    rng = np.random.default_rng(seed)
+    resampled, resampled_benchmark = _resample(returns, benchmark_returns, method, block_length, num_resamples, rng)
+    results = compute_metrics(resampled, resampled_benchmark, risk_free_rate, target_return)
+    return {name: results[name] for name in metric_names}
+
+
+def bootstrap_confidence_intervals(returns, benchmark_returns=None, metrics=("sharpe_ratio", "max_drawdown"),
+                                   num_resamples=10000, method="stationary", block_length=None, confidence=0.95,
+                                   risk_free_rate=0.0, target_return=0.0, chunk_size=2000, workers=None, seed=42):
+    """
+    Estimate confidence intervals for performance metrics by resampling the return history.
+
+    Resample index matrices are generated per chunk in one shot and every metric is evaluated on all
+    resamples of the chunk with batched array reductions (see metrics.compute_metrics).
+
+    :param returns: A list or array-like object containing the returns of the investment.
+    :param benchmark_returns: (Optional) Benchmark returns, resampled jointly with the returns.
+                              Required for information_ratio, alpha and beta.
+    :param metrics: Names of metrics to estimate, as returned by PerformanceAnalyzer.compute_all.
+    :param num_resamples: Number of resamples (default is 10000).
+    :param method: "stationary" (stationary bootstrap), "block" (circular moving-block bootstrap) or
+                   "monte_carlo" (normal returns with the sample mean and covariance).
+    :param block_length: Mean (stationary) or fixed (block) block length. Defaults to n ** (1/3).
+    :param confidence: Confidence level of the percentile intervals (default is 0.95).
+    :param risk_free_rate: Risk-free rate used by the Sharpe ratio and alpha (default is 0.0).
+    :param target_return: Target return used by the Sortino ratio (default is 0.0).
+    :param chunk_size: Resamples evaluated per batch, which bounds memory at n * chunk_size values.
+    :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores).
+    :param seed: Seed for the random number generator. Results do not depend on workers.
+
+    :return: DataFrame indexed by metric with estimate, std_error, lower and upper columns.
+    """
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    if benchmark_returns is not None:
+        benchmark_returns = np.ascontiguousarray(benchmark_returns, dtype=np.float64)
+    if block_length is None:
+        block_length = max(1, round(len(returns) ** (1 / 3)))
+    metric_names = list(metrics)
+
+    chunk_sizes = [min(chunk_size, num_resamples - start) for start in range(0, num_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    args = [(returns, benchmark_returns, method, block_length, size, chunk_seed, metric_names, risk_free_rate,
+             target_return) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+    if workers is None or workers == 1:
+        chunks = [_evaluate_chunk(*chunk_args) for chunk_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            chunks = list(executor.map(_evaluate_chunk, *zip(*args)))
+
+    estimates = compute_metrics(returns, benchmark_returns, risk_free_rate, target_return)
+    tail = (1 - confidence) / 2
+    rows = {}
+    for name in metric_names:
+        samples = np.concatenate([chunk[name] for chunk in chunks])
+        lower, upper = np.nanquantile(samples, [tail, 1 - tail])
+        rows[name] = {"estimate": float(estimates[name]), "std_error": float(np.nanstd(samples, ddof=1)),
+                      "lower": lower, "upper": upper}
+    return pd.DataFrame.from_dict(rows, orient="index")
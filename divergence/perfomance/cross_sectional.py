@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+from divergence.perfomance import metrics, rolling
+
+
+class CrossSectionalPerformanceAnalyzer:
+    """
+    A class to analyze many strategies at once from a time x strategies returns matrix.
+
+    Every metric is a vectorized NumPy reduction along the time axis, so thousands of strategies cost
+    a handful of array operations instead of one PerformanceAnalyzer per column.
+
+    :param returns: A 2-D array or DataFrame of returns (rows are periods, columns are strategies).
+    :param benchmark_returns: (Optional) Benchmark returns: one series shared by all strategies or
+                              a matrix with one column per strategy.
+    """
+
+    def __init__(self, returns, benchmark_returns=None):
+        """
+        Initializes the analyzer with a returns matrix and optional benchmark returns.
+
+        :param returns: A 2-D array or DataFrame of returns (rows are periods, columns are strategies).
+        :param benchmark_returns: (Optional) Benchmark returns: one series shared by all strategies or
+                                  a matrix with one column per strategy.
+        """
+        self.strategies = returns.columns if isinstance(returns, pd.DataFrame) else None
+        self.returns = np.ascontiguousarray(returns, dtype=np.float64)
+        if self.returns.ndim == 1:
+            self.returns = self.returns[:, None]
+        if self.strategies is None:
+            self.strategies = pd.RangeIndex(self.returns.shape[1])
+        self.benchmark_returns = (np.ascontiguousarray(benchmark_returns, dtype=np.float64)
+                                  if benchmark_returns is not None else None)
+
+    def _series(self, values, name):
+        return pd.Series(values, index=self.strategies, name=name)
+
+    def _frame(self, values):
+        return pd.DataFrame(values, columns=self.strategies)
+
+    def _require_benchmark(self, metric):
+        if self.benchmark_returns is None:
+            raise ValueError(f"Benchmark returns must be provided to calculate {metric}.")
+
+    def calculate_cumulative_return(self):
+        """
+        Calculate cumulative returns of every strategy over time.
+
+        :return: DataFrame of cumulative returns (periods x strategies).
+        """
+        return self._frame(metrics.cumulative_returns(self.returns))
+
+    def calculate_annualized_return(self):
+        """
+        Calculate annualized return of every strategy.
+
+        :return: Series of annualized returns indexed by strategy.
+        """
+        return self._series(metrics.annualized_return(self.returns), "annualized_return")
+
+    def calculate_volatility(self):
+        """
+        Calculate annualized volatility of every strategy.
+
+        :return: Series of annualized volatilities indexed by strategy.
+        """
+        return self._series(metrics.volatility(self.returns), "volatility")
+
+    def calculate_sharpe_ratio(self, risk_free_rate=0.0):
+        """
+        Calculate Sharpe Ratio of every strategy.
+
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :return: Series of Sharpe Ratios indexed by strategy.
+        """
+        return self._series(metrics.sharpe_ratio(self.returns, risk_free_rate), "sharpe_ratio")
+
+    def calculate_sortino_ratio(self, target_return=0.0):
+        """
+        Calculate Sortino Ratio of every strategy.
+
+        :param target_return: Target return to compare against (default is 0.0).
+
+        :return: Series of Sortino Ratios indexed by strategy.
+        """
+        return self._series(metrics.sortino_ratio(self.returns, target_return), "sortino_ratio")
+
+    def calculate_max_drawdown(self):
+        """
+        Calculate maximum drawdown of every strategy.
+
+        :return: Series of maximum drawdowns indexed by strategy.
+        """
+        return self._series(metrics.max_drawdown(self.returns), "max_drawdown")
+
+    def calculate_average_drawdown(self):
+        """
+        Calculate average drawdown of every strategy.
+
+        :return: Series of average drawdowns indexed by strategy.
+        """
+        return self._series(metrics.average_drawdown(self.returns), "average_drawdown")
+
+    def calculate_information_ratio(self):
+        """
+        Calculate Information Ratio of every strategy compared to the benchmark.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Series of Information Ratios indexed by strategy.
+        """
+        self._require_benchmark("Information Ratio")
+        return self._series(metrics.information_ratio(self.returns, self.benchmark_returns), "information_ratio")
+
+    def calculate_alpha(self, risk_free_rate=0.0):
+        """
+        Calculate Alpha of every strategy compared to the benchmark.
+
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Series of Alphas indexed by strategy.
+        """
+        self._require_benchmark("Alpha")
+        return self._series(metrics.alpha(self.returns, self.benchmark_returns, risk_free_rate), "alpha")
+
+    def calculate_beta(self):
+        """
+        Calculate Beta of every strategy compared to the benchmark.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Series of Betas indexed by strategy.
+        """
+        self._require_benchmark("Beta")
+        return self._series(metrics.beta(self.returns, self.benchmark_returns), "beta")
+
+    def calculate_rolling_volatility(self, window):
+        """
+        Calculate rolling annualized volatility of every strategy.
+
+        :param window: Number of periods in the rolling window.
+
+        :return: DataFrame of rolling volatilities (periods x strategies).
+        """
+        return self._frame(rolling.rolling_volatility(self.returns, window))
+
+    def calculate_rolling_sharpe_ratio(self, window, risk_free_rate=0.0):
+        """
+        Calculate rolling Sharpe Ratio of every strategy.
+
+        :param window: Number of periods in the rolling window.
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :return: DataFrame of rolling Sharpe Ratios (periods x strategies).
+        """
+        return self._frame(rolling.rolling_sharpe_ratio(self.returns, window, risk_free_rate))
+
+    def calculate_rolling_max_drawdown(self, window):
+        """
+        Calculate rolling maximum drawdown of every strategy.
+
+        :param window: Number of periods in the rolling window.
+
+        :return: DataFrame of rolling maximum drawdowns (periods x strategies).
+        """
+        return self._frame(rolling.rolling_max_drawdown(self.returns, window))
+
+    def calculate_rolling_beta(self, window):
+        """
+        Calculate rolling Beta of every strategy compared to the benchmark.
+
+        :param window: Number of periods in the rolling window.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: DataFrame of rolling Betas (periods x strategies).
+        """
+        self._require_benchmark("Beta")
+        return self._frame(rolling.rolling_beta(self.returns, self.benchmark_returns, window))
+
+    def summary(self, risk_free_rate=0.0, target_return=0.0):
+        """
+        Calculate every metric for every strategy in one pass.
+
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+        :param target_return: Target return for the Sortino ratio (default is 0.0).
+
+        :return: DataFrame with one row per strategy and one column per metric.
+        """
+        results = metrics.compute_metrics(self.returns, self.benchmark_returns, risk_free_rate, target_return)
+        return pd.DataFrame(results, index=self.strategies)
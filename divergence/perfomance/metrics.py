@@ -0,0 +1,243 @@
+import numpy as np
+
+PERIODS_PER_YEAR = 252
+
+
+def _as_array(returns):
+    """Converts returns to a contiguous float64 array (time along axis 0)."""
+    return np.ascontiguousarray(returns, dtype=np.float64)
+
+
+def _align_benchmark(benchmark_returns, returns):
+    """Lines up a single benchmark series with every column of a returns matrix."""
+    benchmark_returns = _as_array(benchmark_returns)
+    if benchmark_returns.ndim < returns.ndim:
+        benchmark_returns = benchmark_returns.reshape(benchmark_returns.shape + (1,) * (returns.ndim - 1))
+    return benchmark_returns
+
+
+def _std(centered, count):
+    """Sample standard deviation (ddof=1) from centered values along axis 0."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(np.einsum("t...,t...->...", centered, centered) / (count - 1))
+
+
+def cumulative_returns(returns):
+    """
+    Calculate cumulative returns along the time axis.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+
+    :return: Array of cumulative returns with the shape of returns.
+    """
+    return np.cumprod(1 + _as_array(returns), axis=0) - 1
+
+
+def drawdowns(cumulative):
+    """
+    Calculate drawdowns relative to the running peak of the cumulative return, as PerformanceAnalyzer does.
+
+    :param cumulative: Array of cumulative returns, time along axis 0.
+
+    :return: Array of drawdowns with the shape of cumulative.
+    """
+    peak = np.maximum.accumulate(cumulative, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (cumulative - peak) / peak
+
+
+def annualized_return(returns):
+    """
+    Calculate annualized returns along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+
+    :return: Annualized return per column.
+    """
+    returns = _as_array(returns)
+    return np.prod(1 + returns, axis=0) ** (PERIODS_PER_YEAR / len(returns)) - 1
+
+
+def volatility(returns):
+    """
+    Calculate annualized volatility along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+
+    :return: Annualized volatility per column.
+    """
+    returns = _as_array(returns)
+    return _std(returns - returns.mean(axis=0), len(returns)) * np.sqrt(PERIODS_PER_YEAR)
+
+
+def sharpe_ratio(returns, risk_free_rate=0.0):
+    """
+    Calculate Sharpe Ratios along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+    :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+    :return: Sharpe Ratio per column.
+    """
+    returns = _as_array(returns)
+    mean = returns.mean(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (mean - risk_free_rate / PERIODS_PER_YEAR) / _std(returns - mean, len(returns)) * np.sqrt(PERIODS_PER_YEAR)
+
+
+def sortino_ratio(returns, target_return=0.0):
+    """
+    Calculate Sortino Ratios along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+    :param target_return: Target return to compare against (default is 0.0).
+
+    :return: Sortino Ratio per column.
+    """
+    returns = _as_array(returns)
+    return _sortino(returns, returns.mean(axis=0), target_return)
+
+
+def _sortino(returns, mean, target_return):
+    downside = returns < target_return
+    count = downside.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        downside_mean = np.where(downside, returns, 0.0).sum(axis=0) / count
+        centered = np.where(downside, returns - downside_mean, 0.0)
+        downside_deviation = _std(centered, count) * np.sqrt(PERIODS_PER_YEAR)
+        ratio = (mean - target_return / PERIODS_PER_YEAR) / downside_deviation
+    return np.where(downside_deviation != 0, ratio, np.nan)
+
+
+def max_drawdown(returns):
+    """
+    Calculate maximum drawdowns along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+
+    :return: Maximum drawdown per column.
+    """
+    return _max_drawdown(drawdowns(cumulative_returns(returns)))
+
+
+def _max_drawdown(drawdown):
+    # NaN drawdowns (zero peak) are skipped, as pandas does
+    worst = np.where(np.isnan(drawdown), np.inf, drawdown).min(axis=0)
+    return np.where(np.isinf(worst) & (worst > 0), np.nan, worst)
+
+
+def average_drawdown(returns):
+    """
+    Calculate average drawdowns along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+
+    :return: Average drawdown per column.
+    """
+    return _average_drawdown(drawdowns(cumulative_returns(returns)))
+
+
+def _average_drawdown(drawdown):
+    underwater = drawdown < 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(underwater, drawdown, 0.0).sum(axis=0) / underwater.sum(axis=0)
+
+
+def information_ratio(returns, benchmark_returns):
+    """
+    Calculate Information Ratios against a benchmark along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+    :param benchmark_returns: Benchmark returns, either one series or one column per strategy.
+
+    :return: Information Ratio per column.
+    """
+    returns = _as_array(returns)
+    excess = returns - _align_benchmark(benchmark_returns, returns)
+    return sharpe_ratio(excess)
+
+
+def alpha(returns, benchmark_returns, risk_free_rate=0.0):
+    """
+    Calculate Alphas against a benchmark along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+    :param benchmark_returns: Benchmark returns, either one series or one column per strategy.
+    :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+    :return: Alpha per column.
+    """
+    returns = _as_array(returns)
+    benchmark_returns = _align_benchmark(benchmark_returns, returns)
+    return annualized_return(returns) - (risk_free_rate + annualized_return(benchmark_returns))
+
+
+def beta(returns, benchmark_returns):
+    """
+    Calculate Betas against a benchmark along the time axis.
+
+    :param returns: Array of returns, time along axis 0.
+    :param benchmark_returns: Benchmark returns, either one series or one column per strategy.
+
+    :return: Beta per column.
+    """
+    returns = _as_array(returns)
+    benchmark_returns = _align_benchmark(benchmark_returns, returns)
+    return _beta(returns - returns.mean(axis=0), benchmark_returns - benchmark_returns.mean(axis=0))
+
+
+def _beta(centered, benchmark_centered):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return ((centered * benchmark_centered).sum(axis=0)
+                / (benchmark_centered * benchmark_centered).sum(axis=0))
+
+
+def compute_metrics(returns, benchmark_returns=None, risk_free_rate=0.0, target_return=0.0):
+    """
+    Calculate every performance metric in one pass, sharing the cumulative product, drawdown series
+    and moments between metrics.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+                    Missing values are not supported.
+    :param benchmark_returns: (Optional) Benchmark returns, either one series or one column per strategy.
+    :param risk_free_rate: Risk-free rate used by the Sharpe ratio and alpha (default is 0.0).
+    :param target_return: Target return used by the Sortino ratio (default is 0.0).
+
+    :return: Dictionary of metric name to value per column. Benchmark metrics are included only
+             when benchmark returns are provided.
+    """
+    returns = _as_array(returns)
+    n = len(returns)
+    annualization = np.sqrt(PERIODS_PER_YEAR)
+
+    growth = np.cumprod(1 + returns, axis=0)
+    cumulative = growth - 1
+    drawdown = drawdowns(cumulative)
+    mean = returns.mean(axis=0)
+    centered = returns - mean
+    std = _std(centered, n)
+    annualized = growth[-1] ** (PERIODS_PER_YEAR / n) - 1
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        metrics = {
+            "cumulative_return": cumulative[-1],
+            "annualized_return": annualized,
+            "volatility": std * annualization,
+            "sharpe_ratio": (mean - risk_free_rate / PERIODS_PER_YEAR) / std * annualization,
+            "sortino_ratio": _sortino(returns, mean, target_return),
+            "max_drawdown": _max_drawdown(drawdown),
+            "average_drawdown": _average_drawdown(drawdown),
+        }
+
+        if benchmark_returns is not None:
+            benchmark_returns = _align_benchmark(benchmark_returns, returns)
+            benchmark_centered = benchmark_returns - benchmark_returns.mean(axis=0)
+            excess_centered = centered - benchmark_centered
+            excess_mean = mean - benchmark_returns.mean(axis=0)
+            benchmark_annualized = np.prod(1 + benchmark_returns, axis=0) ** (PERIODS_PER_YEAR / n) - 1
+
+            metrics["information_ratio"] = excess_mean / _std(excess_centered, n) * annualization
+            metrics["alpha"] = annualized - (risk_free_rate + benchmark_annualized)
+            metrics["beta"] = _beta(centered, benchmark_centered)
+
+    return metrics
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 
+from divergence.perfomance import bootstrap, metrics, rolling
+
 
 class PerformanceAnalyzer:
     """
@@ -135,6 +137,85 @@ class PerformanceAnalyzer:
         benchmark_variance = self.benchmark_returns.var()
         return covariance / benchmark_variance
 
+    def calculate_rolling_volatility(self, window):
+        """
+        Calculate rolling annualized volatility of the investment.
+
+        :param window: Number of periods in the rolling window.
+
+        :return: Rolling volatility as a Series (NaN until the window is filled).
+        """
+        return pd.Series(rolling.rolling_volatility(self.returns, window), index=self.returns.index)
+
+    def calculate_rolling_sharpe_ratio(self, window, risk_free_rate=0.0):
+        """
+        Calculate rolling Sharpe Ratio of the investment.
+
+        :param window: Number of periods in the rolling window.
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :return: Rolling Sharpe Ratio as a Series (NaN until the window is filled).
+        """
+        return pd.Series(rolling.rolling_sharpe_ratio(self.returns, window, risk_free_rate), index=self.returns.index)
+
+    def calculate_rolling_max_drawdown(self, window):
+        """
+        Calculate rolling maximum drawdown of the investment.
+
+        :param window: Number of periods in the rolling window.
+
+        :return: Rolling maximum drawdown as a Series (NaN until the window is filled).
+        """
+        return pd.Series(rolling.rolling_max_drawdown(self.returns, window), index=self.returns.index)
+
+    def calculate_rolling_beta(self, window):
+        """
+        Calculate rolling Beta of the investment compared to its benchmark.
+
+        :param window: Number of periods in the rolling window.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Rolling Beta as a Series (NaN until the window is filled).
+        """
+        if self.benchmark_returns is None:
+            raise ValueError("Benchmark returns must be provided to calculate Beta.")
+        return pd.Series(rolling.rolling_beta(self.returns, self.benchmark_returns, window), index=self.returns.index)
+
+    def compute_all(self, risk_free_rate=0.0, target_return=0.0):
+        """
+        Calculate every performance metric in a single pass over the data.
+
+        The returns are converted to a contiguous float64 array once and the cumulative product,
+        drawdown series and moments are shared between metrics.
+
+        :param risk_free_rate: Risk-free rate used by the Sharpe ratio and alpha (default is 0.0).
+        :param target_return: Target return used by the Sortino ratio (default is 0.0).
+
+        :return: Dictionary with cumulative_return, annualized_return, volatility, sharpe_ratio,
+                 sortino_ratio, max_drawdown, average_drawdown and, if benchmark returns are provided,
+                 information_ratio, alpha and beta.
+        """
+        results = metrics.compute_metrics(self.returns, self.benchmark_returns, risk_free_rate, target_return)
+        return {name: float(value) for name, value in results.items()}
+
+    def calculate_confidence_intervals(self, metric_names=("sharpe_ratio", "max_drawdown"), num_resamples=10000,
+                                       method="stationary", confidence=0.95, **kwargs):
+        """
+        Estimate confidence intervals for performance metrics by resampling the return history.
+
+        :param metric_names: Names of metrics to estimate, as returned by compute_all.
+        :param num_resamples: Number of resamples (default is 10000).
+        :param method: "stationary", "block" or "monte_carlo" (see bootstrap.bootstrap_confidence_intervals).
+        :param confidence: Confidence level of the intervals (default is 0.95).
+        :param kwargs: Further options for bootstrap.bootstrap_confidence_intervals (block_length,
+                       risk_free_rate, chunk_size, workers, seed, ...).
+
+        :return: DataFrame indexed by metric with estimate, std_error, lower and upper columns.
+        """
+        return bootstrap.bootstrap_confidence_intervals(self.returns, self.benchmark_returns, metric_names,
+                                                        num_resamples, method, confidence=confidence, **kwargs)
+
     def summary(self):
         """
         Print a summary of performance metrics including cumulative return,
@@ -142,14 +223,15 @@ class PerformanceAnalyzer:
         maximum drawdown, average drawdown, and information ratio,
         alpha and beta if benchmark returns are provided.
         """
-        print("Cumulative Return:", self.calculate_cumulative_return().iloc[-1])
-        print("Annualized Return:", self.calculate_annualized_return())
-        print("Volatility:", self.calculate_volatility())
-        print("Sharpe Ratio:", self.calculate_sharpe_ratio())
-        print("Sortino Ratio:", self.calculate_sortino_ratio())
-        print("Maximum Drawdown:", self.calculate_max_drawdown())
-        print("Average Drawdown:", self.calculate_average_drawdown())
+        results = self.compute_all()
+        print("Cumulative Return:", results["cumulative_return"])
+        print("Annualized Return:", results["annualized_return"])
+        print("Volatility:", results["volatility"])
+        print("Sharpe Ratio:", results["sharpe_ratio"])
+        print("Sortino Ratio:", results["sortino_ratio"])
+        print("Maximum Drawdown:", results["max_drawdown"])
+        print("Average Drawdown:", results["average_drawdown"])
         if self.benchmark_returns is not None:
-            print("Information Ratio:", self.calculate_information_ratio())
-            print("Alpha:", self.calculate_alpha())
-            print("Beta:", self.calculate_beta())
+            print("Information Ratio:", results["information_ratio"])
+            print("Alpha:", results["alpha"])
+            print("Beta:", results["beta"])
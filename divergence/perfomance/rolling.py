@@ -0,0 +1,186 @@
+import numpy as np
+
+from divergence.perfomance.metrics import (PERIODS_PER_YEAR, _align_benchmark, _as_array, _max_drawdown,
+                                           cumulative_returns)
+
+
+def _rolling_sum(values, window):
+    """
+    Sums over a trailing window along axis 0 using cumulative sums, in O(n).
+
+    :return: Array with the shape of values; the first window - 1 rows are NaN.
+    """
+    cumulative = np.cumsum(values, axis=0)
+    result = np.full(values.shape, np.nan)
+    result[window - 1] = cumulative[window - 1]
+    result[window:] = cumulative[window:] - cumulative[:-window]
+    return result
+
+
+def _rolling_max(values, window):
+    """
+    Maximum over a trailing window along axis 0 with the van Herk/Gil-Werman block algorithm.
+
+    Like a monotonic deque it needs O(1) work per element whatever the window, but it runs as whole-array
+    prefix/suffix maxima, so every column of a matrix is processed at once.
+
+    :return: Array with the shape of values; the first window - 1 rows are NaN.
+    """
+    n = len(values)
+    if n < window:
+        return np.full(values.shape, np.nan)
+    num_blocks = -(-n // window)
+    padded = np.full((num_blocks * window,) + values.shape[1:], -np.inf)
+    padded[:n] = values
+    blocks = padded.reshape((num_blocks, window) + values.shape[1:])
+
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+
+    result = np.full(values.shape, np.nan)
+    result[window - 1:] = np.maximum(suffix[:n - window + 1], prefix[window - 1:n])
+    return result
+
+
+def _check_window(returns, window):
+    if not 1 < window <= len(returns):
+        raise ValueError("Window must be greater than 1 and no longer than the returns series.")
+
+
+def _rolling_moments(returns, window):
+    """Rolling mean and sample standard deviation (ddof=1), computed on column-centered data for stability."""
+    shift = returns.mean(axis=0)
+    centered = returns - shift
+    sums = _rolling_sum(centered, window)
+    squares = _rolling_sum(centered * centered, window)
+    variance = np.maximum(squares - sums * sums / window, 0.0) / (window - 1)
+    return sums / window + shift, np.sqrt(variance)
+
+
+def rolling_mean(values, window):
+    """
+    Calculate the rolling mean.
+
+    :param values: Array of values, time along axis 0 (1-D series or 2-D matrix).
+    :param window: Number of periods in the rolling window.
+
+    :return: Array with the shape of values; the first window - 1 rows are NaN.
+    """
+    values = _as_array(values)
+    _check_window(values, window)
+    shift = values.mean(axis=0)
+    return _rolling_sum(values - shift, window) / window + shift
+
+
+def rolling_std(values, window):
+    """
+    Calculate the rolling sample standard deviation (ddof=1).
+
+    :param values: Array of values, time along axis 0 (1-D series or 2-D matrix).
+    :param window: Number of periods in the rolling window.
+
+    :return: Array with the shape of values; the first window - 1 rows are NaN.
+    """
+    values = _as_array(values)
+    _check_window(values, window)
+    _, std = _rolling_moments(values, window)
+    return std
+
+
+def rolling_volatility(returns, window):
+    """
+    Calculate rolling annualized volatility.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+    :param window: Number of periods in the rolling window.
+
+    :return: Array with the shape of returns; the first window - 1 rows are NaN.
+    """
+    return rolling_std(returns, window) * np.sqrt(PERIODS_PER_YEAR)
+
+
+def rolling_sharpe_ratio(returns, window, risk_free_rate=0.0):
+    """
+    Calculate rolling Sharpe Ratios.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+    :param window: Number of periods in the rolling window.
+    :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+    :return: Array with the shape of returns; the first window - 1 rows are NaN.
+    """
+    returns = _as_array(returns)
+    _check_window(returns, window)
+    mean, std = _rolling_moments(returns, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (mean - risk_free_rate / PERIODS_PER_YEAR) / std * np.sqrt(PERIODS_PER_YEAR)
+
+
+def rolling_beta(returns, benchmark_returns, window):
+    """
+    Calculate rolling Betas against a benchmark.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+    :param benchmark_returns: Benchmark returns, either one series or one column per strategy.
+    :param window: Number of periods in the rolling window.
+
+    :return: Array with the shape of returns; the first window - 1 rows are NaN.
+    """
+    returns = _as_array(returns)
+    _check_window(returns, window)
+    benchmark_returns = _align_benchmark(benchmark_returns, returns)
+
+    centered = returns - returns.mean(axis=0)
+    benchmark_centered = benchmark_returns - benchmark_returns.mean(axis=0)
+    sums = _rolling_sum(centered, window)
+    benchmark_sums = _rolling_sum(benchmark_centered, window)
+    co_moment = _rolling_sum(centered * benchmark_centered, window) - sums * benchmark_sums / window
+    benchmark_m2 = _rolling_sum(benchmark_centered * benchmark_centered, window) - benchmark_sums ** 2 / window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return co_moment / benchmark_m2
+
+
+def rolling_drawdown(returns, window):
+    """
+    Calculate drawdowns relative to the peak cumulative return over a trailing window.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+    :param window: Number of periods in the rolling window.
+
+    :return: Array with the shape of returns; the first window - 1 rows are NaN.
+    """
+    returns = _as_array(returns)
+    _check_window(returns, window)
+    cumulative = cumulative_returns(returns)
+    peak = _rolling_max(cumulative, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (cumulative - peak) / peak
+
+
+def rolling_max_drawdown(returns, window, max_chunk_elements=2 ** 22):
+    """
+    Calculate rolling maximum drawdowns: the maximum drawdown of each window taken on its own.
+
+    Every window compounds its returns and tracks its peak from its own first period, exactly as
+    PerformanceAnalyzer.calculate_max_drawdown on that window's returns. The cumulative return of a window
+    depends on where it starts, so windows are evaluated as a strided view in O(n * window), in chunks.
+
+    :param returns: Array of returns, time along axis 0 (1-D series or 2-D time x strategies matrix).
+    :param window: Number of periods in the rolling window.
+    :param max_chunk_elements: Maximum window x period values held in memory at once.
+
+    :return: Array with the shape of returns; the first window - 1 rows are NaN.
+    """
+    returns = _as_array(returns)
+    _check_window(returns, window)
+    # Window axis last: shape (len(returns) - window + 1, ..., window)
+    windows = np.lib.stride_tricks.sliding_window_view(1 + returns, window, axis=0)
+    result = np.full(returns.shape, np.nan)
+    chunk = max(1, max_chunk_elements // (window * max(1, returns[0].size)))
+    for start in range(0, len(windows), chunk):
+        cumulative = np.cumprod(windows[start:start + chunk], axis=-1) - 1
+        peak = np.maximum.accumulate(cumulative, axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            drawdown = (cumulative - peak) / peak
+        result[window - 1 + start:window - 1 + start + chunk] = _max_drawdown(np.moveaxis(drawdown, -1, 0))
+    return result
@@ -0,0 +1,250 @@
+import math
+
+
+class StreamingPerformanceAnalyzer:
+    """
+    An online version of PerformanceAnalyzer that updates every metric in O(1) per new return.
+
+    Running moments use Welford's algorithm, drawdowns track the running peak of the cumulative return
+    and beta uses a running co-moment, so no history is stored. Metrics follow the same definitions
+    as PerformanceAnalyzer.
+
+    :param target_return: Target return used by the Sortino ratio (default is 0.0).
+    """
+
+    def __init__(self, target_return=0.0):
+        """
+        Initializes an empty streaming analyzer.
+
+        :param target_return: Target return used by the Sortino ratio (default is 0.0).
+        """
+        self.target_return = target_return
+        self.has_benchmark = None
+
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._growth = 1.0
+
+        self._peak = -math.inf
+        self._max_drawdown = math.nan
+        self._drawdown_sum = 0.0
+        self._drawdown_count = 0
+
+        self._downside_count = 0
+        self._downside_mean = 0.0
+        self._downside_m2 = 0.0
+
+        self._benchmark_mean = 0.0
+        self._benchmark_m2 = 0.0
+        self._benchmark_growth = 1.0
+        self._co_moment = 0.0
+        self._excess_mean = 0.0
+        self._excess_m2 = 0.0
+
+    def update(self, ret, bench_ret=None):
+        """
+        Adds one period's return (and benchmark return) to the running statistics.
+
+        :param ret: Return of the investment for the period.
+        :param bench_ret: (Optional) Benchmark return for the period. Must be given on every update
+                          or on none of them.
+
+        :raises ValueError: If benchmark returns are given for some updates but not others.
+        """
+        if self.has_benchmark is None:
+            self.has_benchmark = bench_ret is not None
+        elif self.has_benchmark != (bench_ret is not None):
+            raise ValueError("Benchmark returns must be provided on every update or on none of them.")
+
+        self.count += 1
+        n = self.count
+        delta = ret - self._mean
+        self._mean += delta / n
+        self._m2 += delta * (ret - self._mean)
+        self._growth *= 1 + ret
+
+        cumulative_return = self._growth - 1
+        if cumulative_return > self._peak:
+            self._peak = cumulative_return
+        drawdown = self._drawdown(cumulative_return, self._peak)
+        if not math.isnan(drawdown):
+            if math.isnan(self._max_drawdown) or drawdown < self._max_drawdown:
+                self._max_drawdown = drawdown
+            if drawdown < 0:
+                self._drawdown_sum += drawdown
+                self._drawdown_count += 1
+
+        if ret < self.target_return:
+            self._downside_count += 1
+            downside_delta = ret - self._downside_mean
+            self._downside_mean += downside_delta / self._downside_count
+            self._downside_m2 += downside_delta * (ret - self._downside_mean)
+
+        if self.has_benchmark:
+            benchmark_delta = bench_ret - self._benchmark_mean
+            self._benchmark_mean += benchmark_delta / n
+            self._benchmark_m2 += benchmark_delta * (bench_ret - self._benchmark_mean)
+            self._co_moment += delta * (bench_ret - self._benchmark_mean)
+            self._benchmark_growth *= 1 + bench_ret
+
+            excess = ret - bench_ret
+            excess_delta = excess - self._excess_mean
+            self._excess_mean += excess_delta / n
+            self._excess_m2 += excess_delta * (excess - self._excess_mean)
+
+    def update_many(self, returns, benchmark_returns=None):
+        """
+        Adds a batch of returns (and benchmark returns) in order.
+
+        :param returns: Iterable of returns.
+        :param benchmark_returns: (Optional) Iterable of benchmark returns aligned with returns.
+        """
+        if benchmark_returns is None:
+            for ret in returns:
+                self.update(ret)
+        else:
+            for ret, bench_ret in zip(returns, benchmark_returns):
+                self.update(ret, bench_ret)
+
+    @staticmethod
+    def _drawdown(cumulative_return, peak):
+        """Drawdown relative to the peak cumulative return, with float division semantics."""
+        difference = cumulative_return - peak
+        if peak != 0:
+            return difference / peak
+        return math.nan if difference == 0 else -math.inf
+
+    def _require_benchmark(self, metric):
+        if not self.has_benchmark:
+            raise ValueError(f"Benchmark returns must be provided to calculate {metric}.")
+
+    @staticmethod
+    def _std(m2, count):
+        return math.sqrt(m2 / (count - 1)) if count > 1 else math.nan
+
+    def calculate_cumulative_return(self):
+        """
+        Calculate cumulative return of the investment to date.
+
+        :return: Cumulative return as a float.
+        """
+        return self._growth - 1
+
+    def calculate_annualized_return(self):
+        """
+        Calculate annualized return of the investment.
+
+        :return: Annualized return as a float.
+        """
+        return self._growth ** (252 / self.count) - 1
+
+    def calculate_volatility(self):
+        """
+        Calculate annualized volatility of the investment.
+
+        :return: Annualized volatility as a float.
+        """
+        return self._std(self._m2, self.count) * math.sqrt(252)
+
+    def calculate_sharpe_ratio(self, risk_free_rate=0.0):
+        """
+        Calculate Sharpe Ratio of the investment.
+
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :return: Sharpe Ratio as a float.
+        """
+        return (self._mean - risk_free_rate / 252) / self._std(self._m2, self.count) * math.sqrt(252)
+
+    def calculate_sortino_ratio(self, target_return=None):
+        """
+        Calculate Sortino Ratio of the investment against the analyzer's target return.
+
+        The downside returns are selected against the target as they arrive, so the target is fixed when
+        the analyzer is constructed and cannot change afterwards.
+
+        :param target_return: (Optional) Target return, for parity with PerformanceAnalyzer. Must equal the
+                              target given at construction.
+
+        :raises ValueError: If target_return differs from the analyzer's target return.
+
+        :return: Sortino Ratio as a float.
+        """
+        if target_return is not None and target_return != self.target_return:
+            raise ValueError(f"Streaming Sortino Ratio is tracked against target return {self.target_return}. "
+                             f"Construct StreamingPerformanceAnalyzer(target_return={target_return}) instead.")
+        downside_deviation = self._std(self._downside_m2, self._downside_count) * math.sqrt(252)
+        excess_returns = self._mean - self.target_return / 252
+        return excess_returns / downside_deviation if downside_deviation != 0 else math.nan
+
+    def calculate_max_drawdown(self):
+        """
+        Calculate maximum drawdown of the investment.
+
+        :return: Maximum drawdown as a float.
+        """
+        return self._max_drawdown
+
+    def calculate_average_drawdown(self):
+        """
+        Calculate average drawdown of the investment.
+
+        :return: Average drawdown as a float.
+        """
+        return self._drawdown_sum / self._drawdown_count if self._drawdown_count else math.nan
+
+    def calculate_information_ratio(self):
+        """
+        Calculate Information Ratio of the investment compared to its benchmark.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Information Ratio as a float.
+        """
+        self._require_benchmark("Information Ratio")
+        return self._excess_mean / self._std(self._excess_m2, self.count) * math.sqrt(252)
+
+    def calculate_alpha(self, risk_free_rate=0.0):
+        """
+        Calculate Alpha of the investment compared to its benchmark.
+
+        :param risk_free_rate: Risk-free rate as a float (default is 0.0).
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Alpha as a float.
+        """
+        self._require_benchmark("Alpha")
+        benchmark_annualized_return = self._benchmark_growth ** (252 / self.count) - 1
+        return self.calculate_annualized_return() - (risk_free_rate + benchmark_annualized_return)
+
+    def calculate_beta(self):
+        """
+        Calculate Beta of the investment compared to its benchmark.
+
+        :raises ValueError: If benchmark returns are not provided.
+
+        :return: Beta as a float.
+        """
+        self._require_benchmark("Beta")
+        return self._co_moment / self._benchmark_m2 if self._benchmark_m2 else math.nan
+
+    def summary(self):
+        """
+        Print a summary of performance metrics including cumulative return,
+        annualized return, volatility, Sharpe ratio, Sortino ratio,
+        maximum drawdown, average drawdown, and information ratio,
+        alpha and beta if benchmark returns are provided.
+        """
+        print("Cumulative Return:", self.calculate_cumulative_return())
+        print("Annualized Return:", self.calculate_annualized_return())
+        print("Volatility:", self.calculate_volatility())
+        print("Sharpe Ratio:", self.calculate_sharpe_ratio())
+        print("Sortino Ratio:", self.calculate_sortino_ratio())
+        print("Maximum Drawdown:", self.calculate_max_drawdown())
+        print("Average Drawdown:", self.calculate_average_drawdown())
+        if self.has_benchmark:
+            print("Information Ratio:", self.calculate_information_ratio())
+            print("Alpha:", self.calculate_alpha())
+            print("Beta:", self.calculate_beta())
@@ -0,0 +1,10 @@
+from divergence._lazy import attach
+
+__all__ = ['var', 'stress']
+
+# Submodules are imported on first attribute access, so importing the package stays cheap
+__getattr__, __dir__ = attach(__name__, __all__, {
+    "var": ("MIN_VOLATILITY", "Portfolio", "value_at_risk", "expected_shortfall", "historical_var", "monte_carlo_var",
+            "parametric_var"),
+    "stress": ("VOL_SHOCK_KINDS", "RATE_SHOCK_KINDS", "SpotShock", "VolShock", "RateShock", "StressEngine"),
+})
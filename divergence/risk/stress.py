@@ -0,0 +1,334 @@
+import heapq
+import itertools
+
+import numpy as np
+
+from divergence.instrumentation import instrumented
+from divergence.options.pricing import black_scholes
+from divergence.risk.var import MIN_VOLATILITY
+from divergence.swaps.par_rates import annuity_factor
+
+VOL_SHOCK_KINDS = ("parallel", "skew", "term")
+RATE_SHOCK_KINDS = ("parallel", "twist")
+
+
+# Every shock level is a vector of additive changes to the scenario parameters, laid out per underlying as
+# [spot returns, vol shifts, vol skews, vol term slopes] followed by [rate shift, rate twist]. A scenario is the
+# sum of one level per shock, so scenarios built from different shocks that move the market the same way
+# have identical vectors.
+def _layout(num_underlyings):
+    n = num_underlyings
+    return {"spot": slice(0, n), "vol_shift": slice(n, 2 * n), "vol_skew": slice(2 * n, 3 * n),
+            "vol_term": slice(3 * n, 4 * n), "rate_shift": 4 * n, "rate_twist": 4 * n + 1, "size": 4 * n + 2}
+
+
+def _selected(portfolio, underlyings):
+    if underlyings is None:
+        return np.ones(len(portfolio.underlyings), dtype=bool)
+    selected = np.zeros(len(portfolio.underlyings), dtype=bool)
+    selected[portfolio._underlying_index(underlyings)] = True
+    return selected
+
+
+class SpotShock:
+    """
+    Moves of the spot prices, relative (0.1 for +10%) or absolute (in price units).
+
+    :param levels: Shock sizes, one scenario axis.
+    :param underlyings: (Optional) Underlying name(s) to shock. All by default.
+    :param relative: Whether levels are relative moves (default is True).
+    :param name: Name of the axis in the results (default is "spot").
+    """
+
+    def __init__(self, levels, underlyings=None, relative=True, name="spot"):
+        """
+        Initializes the spot shock.
+
+        :param levels: Shock sizes, one scenario axis.
+        :param underlyings: (Optional) Underlying name(s) to shock. All by default.
+        :param relative: Whether levels are relative moves (default is True).
+        :param name: Name of the axis in the results (default is "spot").
+        """
+        self.levels = np.asarray(levels, dtype=float)
+        self.underlyings = underlyings
+        self.relative = relative
+        self.name = name
+
+    def vectors(self, portfolio):
+        """Scenario parameter changes of every level, with shape (num_levels, parameters)."""
+        layout = _layout(len(portfolio.underlyings))
+        vectors = np.zeros((len(self.levels), layout["size"]))
+        moves = self.levels[:, None] * _selected(portfolio, self.underlyings)
+        vectors[:, layout["spot"]] = moves if self.relative else moves / portfolio.spot_prices
+        return vectors
+
+
+class VolShock:
+    """
+    Moves of the implied volatility surfaces.
+
+    A "parallel" shock adds the level to every volatility, a "skew" shock tilts the smile by
+    level * log(K / S), and a "term" shock tilts the term structure by level * (T - pivot).
+
+    :param levels: Shock sizes, one scenario axis.
+    :param underlyings: (Optional) Underlying name(s) to shock. All by default.
+    :param kind: "parallel", "skew" or "term" (default is "parallel").
+    :param pivot: Expiry (in years) left unchanged by a "term" shock (default is 1.0).
+    :param name: Name of the axis in the results (default is "vol").
+    """
+
+    def __init__(self, levels, underlyings=None, kind="parallel", pivot=1.0, name="vol"):
+        """
+        Initializes the volatility shock.
+
+        :param levels: Shock sizes, one scenario axis.
+        :param underlyings: (Optional) Underlying name(s) to shock. All by default.
+        :param kind: "parallel", "skew" or "term" (default is "parallel").
+        :param pivot: Expiry (in years) left unchanged by a "term" shock (default is 1.0).
+        :param name: Name of the axis in the results (default is "vol").
+        """
+        if kind not in VOL_SHOCK_KINDS:
+            raise ValueError(f"Invalid volatility shock kind. Use one of {', '.join(VOL_SHOCK_KINDS)}.")
+        self.levels = np.asarray(levels, dtype=float)
+        self.underlyings = underlyings
+        self.kind = kind
+        self.pivot = pivot
+        self.name = name
+
+    def vectors(self, portfolio):
+        """Scenario parameter changes of every level, with shape (num_levels, parameters)."""
+        layout = _layout(len(portfolio.underlyings))
+        vectors = np.zeros((len(self.levels), layout["size"]))
+        moves = self.levels[:, None] * _selected(portfolio, self.underlyings)
+        if self.kind == "parallel":
+            vectors[:, layout["vol_shift"]] = moves
+        elif self.kind == "skew":
+            vectors[:, layout["vol_skew"]] = moves
+        else:
+            vectors[:, layout["vol_term"]] = moves
+            vectors[:, layout["vol_shift"]] = -moves * self.pivot
+        return vectors
+
+
+class RateShock:
+    """
+    Moves of the interest rates: a "parallel" shift, or a "twist" of level * (maturity - pivot).
+
+    Options and futures take the rate at their expiry and swaps at their maturity.
+
+    :param levels: Shock sizes, one scenario axis.
+    :param kind: "parallel" or "twist" (default is "parallel").
+    :param pivot: Maturity (in years) left unchanged by a "twist" (default is 5.0).
+    :param name: Name of the axis in the results (default is "rate").
+    """
+
+    def __init__(self, levels, kind="parallel", pivot=5.0, name="rate"):
+        """
+        Initializes the rate shock.
+
+        :param levels: Shock sizes, one scenario axis.
+        :param kind: "parallel" or "twist" (default is "parallel").
+        :param pivot: Maturity (in years) left unchanged by a "twist" (default is 5.0).
+        :param name: Name of the axis in the results (default is "rate").
+        """
+        if kind not in RATE_SHOCK_KINDS:
+            raise ValueError(f"Invalid rate shock kind. Use one of {', '.join(RATE_SHOCK_KINDS)}.")
+        self.levels = np.asarray(levels, dtype=float)
+        self.kind = kind
+        self.pivot = pivot
+        self.name = name
+
+    def vectors(self, portfolio):
+        """Scenario parameter changes of every level, with shape (num_levels, parameters)."""
+        layout = _layout(len(portfolio.underlyings))
+        vectors = np.zeros((len(self.levels), layout["size"]))
+        if self.kind == "parallel":
+            vectors[:, layout["rate_shift"]] = self.levels
+        else:
+            vectors[:, layout["rate_twist"]] = self.levels
+            vectors[:, layout["rate_shift"]] = -self.levels * self.pivot
+        return vectors
+
+
+def _unique_rows(rows):
+    """Unique rows and, for every row, the index of its unique row."""
+    unique, inverse = np.unique(rows, axis=0, return_inverse=True)
+    return unique, inverse.ravel()
+
+
+def _merge(book, keys):
+    """Collapse positions with identical keys into one instrument, summing their quantities."""
+    if not len(book["quantity"]):
+        return book
+    unique, inverse = _unique_rows(np.column_stack([book[key] for key in keys]))
+    merged = {key: unique[:, i].astype(book[key].dtype) for i, key in enumerate(keys)}
+    merged["quantity"] = np.bincount(inverse, book["quantity"], len(unique))
+    return merged
+
+
+class StressEngine:
+    """
+    A class to reprice a Portfolio under a grid of stress scenarios.
+
+    The grid is the product of the levels of every shock and is generated lazily, batch by batch.
+    Within a batch, identical scenarios are priced once, and the instruments of each underlying are priced
+    once per distinct combination of that underlying's shocks, since an option on one underlying does not
+    depend on the shocks of the others. Results stream into the aggregations, so the scenario x position
+    values are never held in memory.
+
+    :param portfolio: A Portfolio from divergence.risk.var.
+    """
+
+    def __init__(self, portfolio):
+        """
+        Initializes the engine and merges identical positions of the portfolio.
+
+        :param portfolio: A Portfolio from divergence.risk.var.
+        """
+        self.portfolio = portfolio
+        self.layout = _layout(len(portfolio.underlyings))
+        self.options = _merge(portfolio.options, ("underlying", "K", "T", "is_call"))
+        self.futures = _merge(portfolio.futures, ("underlying", "T"))
+        self.swaps = portfolio.swaps
+        self.base_value = None
+
+    def scenarios(self, shocks):
+        """
+        Generate the scenario grid lazily.
+
+        :param shocks: List of SpotShock, VolShock and RateShock axes.
+
+        :return: Generator of (levels, vector) tuples, where levels maps each shock name to its level.
+        """
+        vectors = [shock.vectors(self.portfolio) for shock in shocks]
+        names = [shock.name for shock in shocks]
+        for indices in itertools.product(*(range(len(shock.levels)) for shock in shocks)):
+            levels = {name: float(shock.levels[i]) for name, shock, i in zip(names, shocks, indices)}
+            yield levels, sum((vector[i] for vector, i in zip(vectors, indices)), np.zeros(self.layout["size"]))
+
+    def _option_values(self, underlying, parameters, max_chunk_elements):
+        """Value of the options on one underlying for rows of [spot, shift, skew, term, rate shift, twist]."""
+        mask = self.options["underlying"] == underlying
+        if not mask.any():
+            return np.zeros(len(parameters))
+        K, T, is_call, quantity = (self.options[key][mask] for key in ("K", "T", "is_call", "quantity"))
+        spot, volatility = self.portfolio.spot_prices[underlying], self.portfolio.volatilities[underlying]
+        log_moneyness = np.log(K / spot)
+
+        values = np.empty(len(parameters))
+        chunk = max(1, max_chunk_elements // len(K))
+        for start in range(0, len(parameters), chunk):
+            spot_move, shift, skew, term, rate_shift, twist = (column[:, None] for column in
+                                                               parameters[start:start + chunk].T)
+            S = spot * (1 + spot_move)
+            sigma = np.maximum(volatility + shift + skew * log_moneyness + term * T, MIN_VOLATILITY)
+            r = self.portfolio.risk_free_rate + rate_shift + twist * T
+            call = black_scholes(S, K, T, r, sigma, "call")
+            values[start:start + chunk] = np.where(is_call, call, call - S + K * np.exp(-r * T)) @ quantity
+        return values
+
+    def _futures_values(self, underlying, parameters):
+        """Value of the futures on one underlying for rows of [spot, rate shift, twist]."""
+        mask = self.futures["underlying"] == underlying
+        if not mask.any():
+            return np.zeros(len(parameters))
+        T, quantity = self.futures["T"][mask], self.futures["quantity"][mask]
+        spot_move, rate_shift, twist = (column[:, None] for column in parameters.T)
+        S = self.portfolio.spot_prices[underlying] * (1 + spot_move)
+        return (S * np.exp((self.portfolio.risk_free_rate + rate_shift + twist * T) * T)) @ quantity
+
+    def _swap_values(self, parameters):
+        """Value of the swaps for rows of [rate shift, twist]."""
+        if not len(self.swaps["coefficient"]):
+            return np.zeros(len(parameters))
+        rate_shift, twist = (column[:, None] for column in parameters.T)
+        rates = self.swaps["rate"] + rate_shift + twist * self.swaps["years_to_maturity"]
+        return annuity_factor(rates, self.swaps["payment_frequency"], self.swaps["years_to_maturity"]) \
+            @ self.swaps["coefficient"]
+
+    def value(self, vectors, max_chunk_elements=2 ** 22):
+        """
+        Value the portfolio under a batch of scenario vectors, pricing each distinct shock combination once.
+
+        :param vectors: Array of scenario vectors with shape (num_scenarios, parameters).
+        :param max_chunk_elements: Maximum combination x position values held in memory at once.
+
+        :return: Tuple (total values, values per underlying of its options and futures, swap values), one row
+                 per scenario.
+        """
+        layout = self.layout
+        scenarios, inverse = _unique_rows(np.atleast_2d(vectors))
+        rates = scenarios[:, [layout["rate_shift"], layout["rate_twist"]]]
+        by_underlying = np.empty((len(scenarios), len(self.portfolio.underlyings)))
+
+        for u in range(len(self.portfolio.underlyings)):
+            columns = [layout["spot"].start + u, layout["vol_shift"].start + u, layout["vol_skew"].start + u,
+                       layout["vol_term"].start + u, layout["rate_shift"], layout["rate_twist"]]
+            combinations, combination_index = _unique_rows(scenarios[:, columns])
+            option_values = self._option_values(u, combinations, max_chunk_elements)
+            futures_moves, futures_index = _unique_rows(combinations[:, [0, 4, 5]])
+            futures_values = self._futures_values(u, futures_moves)[futures_index]
+            by_underlying[:, u] = (option_values + futures_values)[combination_index]
+
+        rate_moves, rate_index = _unique_rows(rates)
+        swap_values = self._swap_values(rate_moves)[rate_index]
+        by_underlying, swap_values = by_underlying[inverse], swap_values[inverse]
+        return by_underlying.sum(axis=1) + swap_values, by_underlying, swap_values
+
+    @instrumented
+    def run(self, shocks, batch_size=4096, keep_pnl=True, num_worst=10, max_chunk_elements=2 ** 22):
+        """
+        Reprice the portfolio under every scenario of the grid and aggregate the profit and loss.
+
+        :param shocks: List of SpotShock, VolShock and RateShock axes.
+        :param batch_size: Scenarios generated and priced at once.
+        :param keep_pnl: Keep the profit and loss of every scenario (default is True).
+        :param num_worst: Number of worst scenarios to report (default is 10).
+        :param max_chunk_elements: Maximum combination x position values held in memory at once.
+
+        :return: Dictionary with num_scenarios, base_value, min, max and mean profit and loss, the worst
+                 scenarios as (pnl, levels) tuples, the worst profit and loss per underlying and of the swaps,
+                 and the pnl of every scenario when keep_pnl is True.
+        """
+        base, base_by_underlying, base_swaps = self.value(np.zeros((1, self.layout["size"])), max_chunk_elements)
+        self.base_value = float(base[0])
+
+        count, total, lowest, highest = 0, 0.0, np.inf, -np.inf
+        worst = []
+        worst_by_underlying = np.full(len(self.portfolio.underlyings), np.inf)
+        worst_swaps = np.inf
+        pnl_batches = []
+        scenarios = self.scenarios(shocks)
+        while True:
+            batch = list(itertools.islice(scenarios, batch_size))
+            if not batch:
+                break
+            levels, vectors = zip(*batch)
+            values, by_underlying, swap_values = self.value(np.array(vectors), max_chunk_elements)
+            pnl = values - base[0]
+            count += len(pnl)
+            total += pnl.sum()
+            lowest, highest = min(lowest, pnl.min()), max(highest, pnl.max())
+            worst_by_underlying = np.minimum(worst_by_underlying, (by_underlying - base_by_underlying).min(axis=0))
+            worst_swaps = min(worst_swaps, float((swap_values - base_swaps).min()))
+            for i in np.argsort(pnl)[:num_worst]:
+                heapq.heappush(worst, (-pnl[i], count - len(pnl) + i, levels[i]))
+                if len(worst) > num_worst:
+                    heapq.heappop(worst)
+            if keep_pnl:
+                pnl_batches.append(pnl)
+
+        if not count:
+            raise ValueError("Shocks must produce at least one scenario.")
+        pnls = np.concatenate(pnl_batches) if keep_pnl else None
+        return {
+            "num_scenarios": count,
+            "base_value": self.base_value,
+            "min": float(lowest),
+            "max": float(highest),
+            "mean": total / count,
+            "worst": [(float(-loss), levels) for loss, _, levels in sorted(worst, reverse=True)],
+            "worst_by_underlying": dict(zip(self.portfolio.underlyings, worst_by_underlying.tolist())),
+            "worst_swaps": worst_swaps,
+            "pnl": pnls,
+        }
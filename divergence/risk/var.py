@@ -0,0 +1,407 @@
+import numpy as np
+from scipy.stats import norm
+
+from divergence.instrumentation import instrumented
+from divergence.options.greeks import delta, gamma, rho, vega
+from divergence.options.pricing import black_scholes
+from divergence.swaps.par_rates import annuity_factor
+from divergence.swaps.valuation import CommoditySwapValuation, CurrencySwapValuation, InterestRateSwapValuation
+
+MIN_VOLATILITY = 1e-4
+
+
+def _swap_legs(swap, market_rate):
+    """
+    Reduces a swap valuation to fixed legs: NPV = sum(coefficient * annuity_factor(rate)).
+
+    :return: List of (coefficient, rate, payment_frequency, years_to_maturity) tuples.
+    """
+    frequency, years = swap.payment_frequency, swap.years_to_maturity
+    if isinstance(swap, InterestRateSwapValuation):
+        return [(swap.notional * (swap.fixed_rate - swap.floating_rate), market_rate, frequency, years)]
+    if isinstance(swap, CurrencySwapValuation):
+        rate_a, rate_b = market_rate if isinstance(market_rate, tuple) else (market_rate, market_rate)
+        return [(swap.notional_a * swap.fixed_rate_a, rate_a, frequency, years),
+                (-swap.notional_b * swap.fixed_rate_b, rate_b, frequency, years)]
+    if isinstance(swap, CommoditySwapValuation):
+        # CommoditySwapValuation discounts with its market_price argument as the rate
+        return [(swap.notional * (swap.fixed_price - swap.floating_price), market_rate, frequency, years)]
+    raise ValueError(f"Unsupported swap type: {type(swap).__name__}.")
+
+
+class Portfolio:
+    """
+    A class to hold option, futures and swap positions and revalue them under market scenarios.
+
+    Positions are stored as arrays per instrument type, so a scenario x position block is revalued with one
+    batched pricing call. The risk factors are the spot price and implied volatility of every underlying and a
+    parallel shift of all interest rates.
+
+    :param spot_prices: Dictionary mapping each underlying to its spot price.
+    :param volatilities: Dictionary mapping each underlying to its implied volatility.
+    :param risk_free_rate: Risk-free interest rate (annualized).
+    """
+
+    def __init__(self, spot_prices, volatilities, risk_free_rate):
+        """
+        Initializes an empty portfolio.
+
+        :param spot_prices: Dictionary mapping each underlying to its spot price.
+        :param volatilities: Dictionary mapping each underlying to its implied volatility.
+        :param risk_free_rate: Risk-free interest rate (annualized).
+        """
+        self.underlyings = list(spot_prices)
+        self.index = {name: i for i, name in enumerate(self.underlyings)}
+        self.spot_prices = np.array([spot_prices[name] for name in self.underlyings], dtype=float)
+        self.volatilities = np.array([volatilities[name] for name in self.underlyings], dtype=float)
+        self.risk_free_rate = risk_free_rate
+
+        self.options = {"underlying": np.empty(0, dtype=int), "quantity": np.empty(0), "K": np.empty(0),
+                        "T": np.empty(0), "is_call": np.empty(0, dtype=bool)}
+        self.futures = {"underlying": np.empty(0, dtype=int), "quantity": np.empty(0), "T": np.empty(0)}
+        self.swaps = {key: np.empty(0) for key in ("coefficient", "rate", "payment_frequency", "years_to_maturity")}
+
+    @property
+    def num_positions(self):
+        """Number of option and futures positions and swap legs."""
+        return len(self.options["quantity"]) + len(self.futures["quantity"]) + len(self.swaps["coefficient"])
+
+    def _underlying_index(self, underlying):
+        names, inverse = np.unique(np.asarray(underlying), return_inverse=True)
+        unknown = [name for name in names if name not in self.index]
+        if unknown:
+            raise ValueError(f"Unknown underlying: {', '.join(map(str, unknown))}.")
+        return np.array([self.index[name] for name in names], dtype=int)[inverse].ravel()
+
+    @staticmethod
+    def _append(book, **columns):
+        size = max(np.size(value) for value in columns.values())
+        for key, value in columns.items():
+            book[key] = np.concatenate([book[key], np.broadcast_to(value, (size,)).astype(book[key].dtype)])
+
+    def add_options(self, underlying, quantity, K, T, option_type="call"):
+        """
+        Add European option positions, priced with Black-Scholes.
+
+        :param underlying: Underlying name(s).
+        :param quantity: Number of options held (negative for short positions).
+        :param K: Strike price(s).
+        :param T: Time(s) to expiration (in years).
+        :param option_type: "call", "put" or an array of them.
+        """
+        option_type = np.asarray(option_type)
+        if not np.isin(option_type, ("call", "put")).all():
+            raise ValueError("Invalid option type. Use 'call' or 'put'.")
+        self._append(self.options, underlying=self._underlying_index(underlying), quantity=quantity, K=K, T=T,
+                     is_call=option_type == "call")
+
+    def add_futures(self, underlying, quantity, T):
+        """
+        Add futures positions, priced with the Kaplan-Sharpe model.
+
+        :param underlying: Underlying name(s).
+        :param quantity: Number of contracts held (negative for short positions).
+        :param T: Time(s) to expiration (in years).
+        """
+        self._append(self.futures, underlying=self._underlying_index(underlying), quantity=quantity, T=T)
+
+    def add_swap(self, swap, quantity=1.0, market_rate=None):
+        """
+        Add a swap from divergence.swaps.valuation.
+
+        :param swap: An InterestRateSwapValuation, CurrencySwapValuation or CommoditySwapValuation.
+        :param quantity: Number of swaps held (default is 1.0).
+        :param market_rate: (Optional) Rate the swap is discounted at, a (rate_a, rate_b) tuple for currency
+                            swaps. Defaults to the risk-free rate.
+        """
+        market_rate = self.risk_free_rate if market_rate is None else market_rate
+        for coefficient, rate, frequency, years in _swap_legs(swap, market_rate):
+            self._append(self.swaps, coefficient=quantity * coefficient, rate=rate, payment_frequency=frequency,
+                         years_to_maturity=years)
+
+    def _option_values(self, block, spot_returns, vol_changes, rate_changes):
+        options = {key: values[block] for key, values in self.options.items()}
+        u = options["underlying"]
+        S = self.spot_prices[u] * (1 + spot_returns[:, u])
+        sigma = np.maximum(self.volatilities[u] + vol_changes[:, u], MIN_VOLATILITY)
+        r = self.risk_free_rate + rate_changes[:, None]
+        call = black_scholes(S, options["K"], options["T"], r, sigma, "call")
+        # Puts by put-call parity, so calls and puts share one pricing call
+        values = np.where(options["is_call"], call, call - S + options["K"] * np.exp(-r * options["T"]))
+        return values @ options["quantity"]
+
+    def _futures_values(self, block, spot_returns, rate_changes):
+        futures = {key: values[block] for key, values in self.futures.items()}
+        u = futures["underlying"]
+        S = self.spot_prices[u] * (1 + spot_returns[:, u])
+        # Kaplan-Sharpe price, as calculate_kaplan_sharpe_price, for a whole block at once
+        return (S * np.exp((self.risk_free_rate + rate_changes[:, None]) * futures["T"])) @ futures["quantity"]
+
+    def _swap_values(self, block, rate_changes):
+        swaps = {key: values[block] for key, values in self.swaps.items()}
+        annuities = annuity_factor(swaps["rate"] + rate_changes[:, None], swaps["payment_frequency"],
+                                   swaps["years_to_maturity"])
+        return annuities @ swaps["coefficient"]
+
+    def _scenario_matrix(self, name, values):
+        """Check a (num_scenarios, num_underlyings) matrix; a 1-D array is a column only for one underlying."""
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1 and len(self.underlyings) == 1:
+            values = values[:, None]
+        if values.ndim != 2 or values.shape[1] != len(self.underlyings):
+            raise ValueError(f"{name} must have shape (num_scenarios, {len(self.underlyings)}), one column per "
+                             f"underlying, got {values.shape}.")
+        return values
+
+    def _scenarios(self, spot_returns, vol_changes, rate_changes):
+        spot_returns = self._scenario_matrix("spot_returns", spot_returns)
+        num_scenarios = len(spot_returns)
+        if vol_changes is None:
+            vol_changes = np.zeros_like(spot_returns)
+        else:
+            vol_changes = self._scenario_matrix("vol_changes", vol_changes)
+            if len(vol_changes) != num_scenarios:
+                raise ValueError(f"vol_changes must have {num_scenarios} scenarios, got {len(vol_changes)}.")
+        if rate_changes is None:
+            rate_changes = np.zeros(num_scenarios)
+        else:
+            rate_changes = np.asarray(rate_changes, dtype=float)
+            if rate_changes.shape != (num_scenarios,):
+                raise ValueError(f"rate_changes must have shape ({num_scenarios},), one shift per scenario, "
+                                 f"got {rate_changes.shape}.")
+        return spot_returns, vol_changes, rate_changes
+
+    def value(self, spot_returns=None, vol_changes=None, rate_changes=None, max_chunk_elements=2 ** 22):
+        """
+        Fully revalue the portfolio under scenarios, chunked over scenarios and positions.
+
+        :param spot_returns: (Optional) Relative spot moves with shape (num_scenarios, num_underlyings).
+                             None values the portfolio at the current market. A 1-D array is accepted only
+                             for a single underlying, as one column.
+        :param vol_changes: (Optional) Absolute implied volatility moves, shaped like spot_returns.
+        :param rate_changes: (Optional) Parallel interest rate shifts, one per scenario.
+        :param max_chunk_elements: Maximum scenario x position values held in memory at once.
+
+        :return: Array of portfolio values, one per scenario.
+
+        :raises ValueError: If a scenario array does not have one row per scenario and one column per underlying.
+        """
+        if spot_returns is None:
+            spot_returns = np.zeros((1, len(self.underlyings)))
+        spot_returns, vol_changes, rate_changes = self._scenarios(spot_returns, vol_changes, rate_changes)
+        num_scenarios = len(spot_returns)
+        values = np.zeros(num_scenarios)
+
+        # Swaps hold one value per payment period, options and futures one per position
+        periods = int(np.max(self.swaps["payment_frequency"] * self.swaps["years_to_maturity"], initial=1))
+        books = [(len(self.options["quantity"]), 1, lambda block, rows: self._option_values(
+                     block, spot_returns[rows], vol_changes[rows], rate_changes[rows])),
+                 (len(self.futures["quantity"]), 1, lambda block, rows: self._futures_values(
+                     block, spot_returns[rows], rate_changes[rows])),
+                 (len(self.swaps["coefficient"]), periods, lambda block, rows: self._swap_values(
+                     block, rate_changes[rows]))]
+        widest = max(max(size * width for size, width, _ in books), 1)
+        scenario_chunk = max(1, min(num_scenarios, max_chunk_elements // widest))
+
+        for start in range(0, num_scenarios, scenario_chunk):
+            rows = slice(start, start + scenario_chunk)
+            for size, width, revalue in books:
+                position_chunk = max(1, max_chunk_elements // (scenario_chunk * width))
+                for begin in range(0, size, position_chunk):
+                    values[rows] += revalue(slice(begin, begin + position_chunk), rows)
+        return values
+
+    @instrumented
+    def full_revaluation_pnl(self, spot_returns, vol_changes=None, rate_changes=None, max_chunk_elements=2 ** 22):
+        """
+        Calculate the scenario profit and loss by full revaluation.
+
+        :param spot_returns: Relative spot moves with shape (num_scenarios, num_underlyings).
+        :param vol_changes: (Optional) Absolute implied volatility moves, shaped like spot_returns.
+        :param rate_changes: (Optional) Parallel interest rate shifts, one per scenario.
+        :param max_chunk_elements: Maximum scenario x position values held in memory at once.
+
+        :return: Array of profit and loss, one per scenario.
+        """
+        base = self.value(max_chunk_elements=max_chunk_elements)[0]
+        return self.value(spot_returns, vol_changes, rate_changes, max_chunk_elements) - base
+
+    def sensitivities(self, rate_bump=1e-4):
+        """
+        Aggregate the first and second order sensitivities of the portfolio per risk factor.
+
+        :param rate_bump: Rate shift used to differentiate the swaps numerically.
+
+        :return: Dictionary with delta, gamma and vega per underlying (per unit of spot and of volatility),
+                 and rate_delta and rate_gamma for the parallel rate shift.
+        """
+        n = len(self.underlyings)
+        r = self.risk_free_rate
+        options, futures, swaps = self.options, self.futures, self.swaps
+        S, sigma = self.spot_prices[options["underlying"]], self.volatilities[options["underlying"]]
+        K, T, quantity = options["K"], options["T"], options["quantity"]
+
+        option_delta = np.where(options["is_call"], delta(S, K, T, r, sigma, "call"), delta(S, K, T, r, sigma, "put"))
+        option_rho = np.where(options["is_call"], rho(S, K, T, r, sigma, "call"), rho(S, K, T, r, sigma, "put"))
+        growth = np.exp(r * futures["T"])
+        futures_spot = self.spot_prices[futures["underlying"]]
+
+        annuities = [annuity_factor(swaps["rate"] + shift, swaps["payment_frequency"], swaps["years_to_maturity"])
+                     @ swaps["coefficient"] for shift in (-rate_bump, 0.0, rate_bump)]
+
+        return {
+            "delta": (np.bincount(options["underlying"], quantity * option_delta, n)
+                      + np.bincount(futures["underlying"], futures["quantity"] * growth, n)),
+            "gamma": np.bincount(options["underlying"], quantity * gamma(S, K, T, r, sigma), n),
+            "vega": np.bincount(options["underlying"], quantity * vega(S, K, T, r, sigma), n),
+            "rate_delta": (quantity @ option_rho + futures["quantity"] @ (futures_spot * futures["T"] * growth)
+                           + (annuities[2] - annuities[0]) / (2 * rate_bump)),
+            "rate_gamma": (futures["quantity"] @ (futures_spot * futures["T"] ** 2 * growth)
+                           + (annuities[2] - 2 * annuities[1] + annuities[0]) / rate_bump ** 2),
+        }
+
+    @instrumented
+    def delta_gamma_pnl(self, spot_returns, vol_changes=None, rate_changes=None, sensitivities=None):
+        """
+        Approximate the scenario profit and loss from the aggregated sensitivities.
+
+        Second order in spot and rates, first order in volatility, without cross terms. The cost depends on
+        the number of underlyings, not of positions.
+
+        :param spot_returns: Relative spot moves with shape (num_scenarios, num_underlyings).
+        :param vol_changes: (Optional) Absolute implied volatility moves, shaped like spot_returns.
+        :param rate_changes: (Optional) Parallel interest rate shifts, one per scenario.
+        :param sensitivities: (Optional) Result of sensitivities(), to reuse across runs.
+
+        :return: Array of approximate profit and loss, one per scenario.
+        """
+        spot_returns, vol_changes, rate_changes = self._scenarios(spot_returns, vol_changes, rate_changes)
+        greeks = sensitivities or self.sensitivities()
+        spot_moves = spot_returns * self.spot_prices
+        return (spot_moves @ greeks["delta"] + 0.5 * spot_moves ** 2 @ greeks["gamma"] + vol_changes @ greeks["vega"]
+                + rate_changes * greeks["rate_delta"] + 0.5 * rate_changes ** 2 * greeks["rate_gamma"])
+
+    def pnl(self, spot_returns, vol_changes=None, rate_changes=None, method="full", max_chunk_elements=2 ** 22):
+        """
+        Calculate the scenario profit and loss with the chosen method.
+
+        :param method: "full" (full revaluation) or "delta_gamma".
+
+        :return: Array of profit and loss, one per scenario.
+        """
+        if method == "full":
+            return self.full_revaluation_pnl(spot_returns, vol_changes, rate_changes, max_chunk_elements)
+        if method == "delta_gamma":
+            return self.delta_gamma_pnl(spot_returns, vol_changes, rate_changes)
+        raise ValueError("Invalid method. Use 'full' or 'delta_gamma'.")
+
+
+def value_at_risk(pnl, confidence=0.99):
+    """
+    Calculate the Value at Risk of a profit and loss distribution.
+
+    :param pnl: Array of scenario profit and loss.
+    :param confidence: Confidence level (default is 0.99).
+
+    :return: The loss not exceeded with the given confidence (positive for a loss).
+    """
+    return float(np.quantile(-np.asarray(pnl, dtype=float), confidence))
+
+
+def expected_shortfall(pnl, confidence=0.99):
+    """
+    Calculate the Expected Shortfall of a profit and loss distribution.
+
+    :param pnl: Array of scenario profit and loss.
+    :param confidence: Confidence level (default is 0.99).
+
+    :return: The average loss in the scenarios at or beyond the Value at Risk (positive for a loss).
+    """
+    losses = -np.asarray(pnl, dtype=float)
+    return float(losses[losses >= np.quantile(losses, confidence)].mean())
+
+
+def _risk_summary(pnl, confidence):
+    return {"var": value_at_risk(pnl, confidence), "expected_shortfall": expected_shortfall(pnl, confidence),
+            "pnl": pnl}
+
+
+@instrumented
+def historical_var(portfolio, spot_returns, vol_changes=None, rate_changes=None, confidence=0.99, method="full",
+                   max_chunk_elements=2 ** 22):
+    """
+    Calculate Value at Risk and Expected Shortfall by historical simulation.
+
+    :param portfolio: A Portfolio.
+    :param spot_returns: Historical relative spot moves with shape (num_scenarios, num_underlyings).
+    :param vol_changes: (Optional) Historical absolute implied volatility moves, shaped like spot_returns.
+    :param rate_changes: (Optional) Historical parallel interest rate shifts, one per scenario.
+    :param confidence: Confidence level (default is 0.99).
+    :param method: "full" (full revaluation) or "delta_gamma".
+    :param max_chunk_elements: Maximum scenario x position values held in memory at once.
+
+    :return: Dictionary with var, expected_shortfall and the scenario pnl.
+    """
+    pnl = portfolio.pnl(spot_returns, vol_changes, rate_changes, method, max_chunk_elements)
+    return _risk_summary(pnl, confidence)
+
+
+def _check_covariance(portfolio, covariance):
+    n = len(portfolio.underlyings)
+    if covariance.shape not in ((n, n), (2 * n + 1, 2 * n + 1)):
+        raise ValueError("Covariance must cover the spot returns, or the spot returns, volatility changes and rate.")
+
+
+def _split_factors(portfolio, factors):
+    n = len(portfolio.underlyings)
+    if factors.shape[1] == n:
+        return factors, None, None
+    return factors[:, :n], factors[:, n:2 * n], factors[:, -1]
+
+
+@instrumented
+def monte_carlo_var(portfolio, covariance, num_scenarios=10000, confidence=0.99, method="full", seed=42,
+                    max_chunk_elements=2 ** 22):
+    """
+    Calculate Value at Risk and Expected Shortfall from normally distributed risk factor moves.
+
+    :param portfolio: A Portfolio.
+    :param covariance: Covariance of the spot returns (num_underlyings square), or of the spot returns,
+                       volatility changes and rate shift in that order (2 * num_underlyings + 1 square).
+    :param num_scenarios: Number of simulated scenarios (default is 10000).
+    :param confidence: Confidence level (default is 0.99).
+    :param method: "full" (full revaluation) or "delta_gamma".
+    :param seed: Seed for the random number generator.
+    :param max_chunk_elements: Maximum scenario x position values held in memory at once.
+
+    :return: Dictionary with var, expected_shortfall and the scenario pnl.
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    _check_covariance(portfolio, covariance)
+    cholesky = np.linalg.cholesky(covariance)
+    factors = np.random.default_rng(seed).standard_normal((num_scenarios, len(covariance))) @ cholesky.T
+    pnl = portfolio.pnl(*_split_factors(portfolio, factors), method, max_chunk_elements)
+    return _risk_summary(pnl, confidence)
+
+
+@instrumented
+def parametric_var(portfolio, covariance, confidence=0.99):
+    """
+    Calculate delta-normal Value at Risk and Expected Shortfall from the portfolio sensitivities.
+
+    :param portfolio: A Portfolio.
+    :param covariance: Covariance of the spot returns (num_underlyings square), or of the spot returns,
+                       volatility changes and rate shift in that order (2 * num_underlyings + 1 square).
+    :param confidence: Confidence level (default is 0.99).
+
+    :return: Dictionary with var, expected_shortfall and the pnl volatility.
+    """
+    covariance = np.asarray(covariance, dtype=float)
+    _check_covariance(portfolio, covariance)
+    greeks = portfolio.sensitivities()
+    exposure = np.concatenate([greeks["delta"] * portfolio.spot_prices, greeks["vega"], [greeks["rate_delta"]]])
+    exposure = exposure[:len(covariance)]
+    volatility = float(np.sqrt(exposure @ covariance @ exposure))
+    z = norm.ppf(confidence)
+    return {"var": float(z * volatility), "expected_shortfall": float(volatility * norm.pdf(z) / (1 - confidence)),
+            "volatility": volatility}
@@ -1,5 +1,14 @@
-from .swap import *
-from .cash_flows import *
-from .valuation import *
+from divergence._lazy import attach
 
-__all__ = ['swap', 'cash_flows', 'valuation']
+__all__ = ['swap', 'cash_flows', 'valuation', 'storage', 'par_rates', 'exposure']
+
+# Submodules are imported on first attribute access, so importing the package stays cheap
+__getattr__, __dir__ = attach(__name__, __all__, {
+    "swap": ("Swap", "InterestRateSwap", "CurrencySwap", "CommoditySwap"),
+    "cash_flows": ("discount_factors", "CashFlow", "CashFlowSeries"),
+    "valuation": ("InterestRateSwapValuation", "CurrencySwapValuation", "CommoditySwapValuation"),
+    "storage": ("FORMAT_VERSION", "SWAP_TYPES", "save_cash_flow_series", "load_cash_flow_series", "SwapBook",
+                "save_swap_book", "load_swap_book"),
+    "par_rates": ("annuity_factor", "par_swap_rate", "break_even_fixed_leg", "par_basis_spread"),
+    "exposure": ("VasicekModel", "HullWhiteModel", "ExposureEngine"),
+})
@@ -1,4 +1,33 @@
+import operator
+
+import numpy as np
+
+
+def discount_factors(time_periods, discount_rate, compounding=1):
+    """
+    Calculates discount factors for a set of payment times.
+
+    :param time_periods: Payment times (in years), scalar or array-like.
+    :param discount_rate: The discount rate. Either a scalar, an array of zero rates aligned with
+                          time_periods, or a curve: a callable mapping payment times to zero rates.
+    :param compounding: Number of compounding periods per year (1 for annual compounding, may be an
+                        array) or "continuous" for continuous compounding.
+    :return: Discount factors with the broadcast shape of time_periods and discount_rate.
+    """
+    time_periods = np.asarray(time_periods, dtype=float)
+    rates = discount_rate(time_periods) if callable(discount_rate) else discount_rate
+    rates = np.asarray(rates, dtype=float)
+
+    if isinstance(compounding, str):
+        if compounding != "continuous":
+            raise ValueError("Invalid compounding. Use a number of periods per year or 'continuous'.")
+        return np.exp(-rates * time_periods)
+    return (1 + rates / compounding) ** (-compounding * time_periods)
+
+
 class CashFlow:
+    __slots__ = ("amount", "time_period")
+
     def __init__(self, amount, time_period):
         """
         Initializes a cash flow.
@@ -9,20 +38,70 @@ class CashFlow:
         self.amount = amount
         self.time_period = time_period
 
-    def present_value(self, discount_rate):
+    def present_value(self, discount_rate, compounding=1):
         """
         Calculates the present value of the cash flow.
 
-        :param discount_rate: The discount rate.
+        :param discount_rate: The discount rate (scalar or a curve callable, see discount_factors).
+        :param compounding: Compounding periods per year or "continuous" (default is annual).
         :return: The present value of the cash flow.
         """
-        return self.amount / (1 + discount_rate) ** self.time_period
+        if not callable(discount_rate) and not isinstance(compounding, str) and compounding == 1:
+            return self.amount / (1 + discount_rate) ** self.time_period
+        return self.amount * float(discount_factors(self.time_period, discount_rate, compounding))
 
 
 class CashFlowSeries:
-    def __init__(self):
-        """Initializes a series of cash flows."""
-        self.cash_flows = []
+    def __init__(self, capacity=16):
+        """
+        Initializes a series of cash flows.
+
+        Amounts and payment times are kept in two growable NumPy arrays rather than a list of
+        objects, so a series costs 16 bytes per cash flow and is valued in a single vectorized
+        expression.
+
+        :param capacity: Number of cash flows to preallocate room for.
+        """
+        capacity = max(int(capacity), 1)
+        self._amounts = np.empty(capacity, dtype=float)
+        self._time_periods = np.empty(capacity, dtype=float)
+        self._size = 0
+
+    @classmethod
+    def from_arrays(cls, amounts, time_periods, copy=True):
+        """
+        Builds a series directly from arrays of amounts and payment times.
+
+        :param amounts: Array-like of cash flow amounts.
+        :param time_periods: Array-like of payment times (in years), same length as amounts.
+        :param copy: If False, float64 one-dimensional inputs (e.g. memory-mapped arrays) are used
+                     as the backing storage without copying.
+        :return: A CashFlowSeries.
+        """
+        convert = np.array if copy else np.asarray
+        amounts = convert(amounts, dtype=float).ravel()
+        time_periods = convert(time_periods, dtype=float).ravel()
+        if amounts.shape != time_periods.shape:
+            raise ValueError("Amounts and time periods must have the same length.")
+
+        series = cls.__new__(cls)
+        series._amounts = amounts
+        series._time_periods = time_periods
+        series._size = len(amounts)
+        return series
+
+    def _reserve(self, size):
+        """Grows the backing arrays geometrically so appends are amortized O(1)."""
+        capacity = len(self._amounts)
+        if size <= capacity:
+            return
+        new_capacity = max(size, 2 * capacity, 16)
+        amounts = np.empty(new_capacity, dtype=float)
+        time_periods = np.empty(new_capacity, dtype=float)
+        amounts[:self._size] = self._amounts[:self._size]
+        time_periods[:self._size] = self._time_periods[:self._size]
+        self._amounts = amounts
+        self._time_periods = time_periods
 
     def add_cash_flow(self, cash_flow):
         """
@@ -30,18 +109,89 @@ class CashFlowSeries:
 
         :param cash_flow: A CashFlow object.
         """
-        self.cash_flows.append(cash_flow)
+        self._reserve(self._size + 1)
+        self._amounts[self._size] = cash_flow.amount
+        self._time_periods[self._size] = cash_flow.time_period
+        self._size += 1
 
-    def total_present_value(self, discount_rate):
+    def extend(self, amounts, time_periods):
+        """
+        Appends many cash flows at once.
+
+        :param amounts: Array-like of cash flow amounts.
+        :param time_periods: Array-like of payment times (in years), same length as amounts.
+        """
+        amounts = np.asarray(amounts, dtype=float).ravel()
+        time_periods = np.asarray(time_periods, dtype=float).ravel()
+        if amounts.shape != time_periods.shape:
+            raise ValueError("Amounts and time periods must have the same length.")
+
+        end = self._size + len(amounts)
+        self._reserve(end)
+        self._amounts[self._size:end] = amounts
+        self._time_periods[self._size:end] = time_periods
+        self._size = end
+
+    @property
+    def amounts(self):
+        """Array of cash flow amounts (a view, not a copy)."""
+        return self._amounts[:self._size]
+
+    @property
+    def time_periods(self):
+        """Array of payment times in years (a view, not a copy)."""
+        return self._time_periods[:self._size]
+
+    @property
+    def cash_flows(self):
+        """
+        Tuple of CashFlow objects for the series, built on demand.
+
+        A tuple rather than a list, so code that appended to the former list fails instead of silently
+        changing a copy: use add_cash_flow or extend to grow the series.
+        """
+        return tuple(self)
+
+    def present_values(self, discount_rate, compounding=1):
+        """
+        Calculates the present value of every cash flow in the series.
+
+        :param discount_rate: The discount rate: a scalar, an array of zero rates (one per cash
+                              flow) or a curve callable mapping payment times to zero rates.
+        :param compounding: Compounding periods per year or "continuous" (default is annual).
+        :return: Array of present values.
+        """
+        return self.amounts * discount_factors(self.time_periods, discount_rate, compounding)
+
+    def total_present_value(self, discount_rate, compounding=1):
         """
         Calculates the total present value of all cash flows in the series.
 
-        :param discount_rate: The discount rate.
+        :param discount_rate: The discount rate: a scalar, an array of zero rates (one per cash
+                              flow) or a curve callable mapping payment times to zero rates.
+        :param compounding: Compounding periods per year or "continuous" (default is annual).
         :return: The total present value.
         """
-        total_pv = sum(cf.present_value(discount_rate) for cf in self.cash_flows)
-        return total_pv
+        return float(np.dot(self.amounts, discount_factors(self.time_periods, discount_rate, compounding)))
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CashFlowSeries.from_arrays(self.amounts[index], self.time_periods[index])
+        try:
+            index = operator.index(index)
+        except TypeError:
+            raise TypeError("Cash flow indices must be integers or slices.") from None
+        if not -self._size <= index < self._size:
+            raise IndexError("Cash flow index out of range.")
+        index %= self._size
+        return CashFlow(self._amounts[index].item(), self._time_periods[index].item())
+
+    def __iter__(self):
+        return map(CashFlow, self.amounts.tolist(), self.time_periods.tolist())
 
     def __str__(self):
         """Returns a string representation of the series of cash flows."""
-        return "\n".join(f"Cash Flow: {cf.amount} at time {cf.time_period}" for cf in self.cash_flows)
\ No newline at end of file
+        return "\n".join(f"Cash Flow: {cf.amount} at time {cf.time_period}" for cf in self)
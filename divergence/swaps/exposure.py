@@ -0,0 +1,289 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from divergence.swaps.swap import InterestRateSwap, CurrencySwap, CommoditySwap
+from divergence.swaps.valuation import InterestRateSwapValuation, CurrencySwapValuation, CommoditySwapValuation
+
+
+class VasicekModel:
+    """
+    Vasicek short-rate model: dr = a (b - r) dt + sigma dW.
+
+    :param r0: Initial short rate.
+    :param mean_reversion: Speed of mean reversion (a).
+    :param long_term_rate: Long-run mean of the short rate (b).
+    :param volatility: Volatility of the short rate (sigma).
+    """
+
+    def __init__(self, r0, mean_reversion, long_term_rate, volatility):
+        """
+        Initializes the Vasicek model.
+
+        :param r0: Initial short rate.
+        :param mean_reversion: Speed of mean reversion (a).
+        :param long_term_rate: Long-run mean of the short rate (b).
+        :param volatility: Volatility of the short rate (sigma).
+        """
+        self.r0 = r0
+        self.mean_reversion = mean_reversion
+        self.long_term_rate = long_term_rate
+        self.volatility = volatility
+
+    def simulate(self, times, num_paths, rng):
+        """
+        Simulates short-rate paths with the exact Gaussian transition between consecutive times.
+
+        :param times: Increasing simulation times (in years), excluding 0.
+        :param num_paths: Number of paths to simulate.
+        :param rng: A numpy.random.Generator.
+        :return: Array of short rates with shape (num_paths, len(times)).
+        """
+        a, b, sigma = self.mean_reversion, self.long_term_rate, self.volatility
+        steps = np.diff(np.concatenate(([0.0], times)))
+        decay = np.exp(-a * steps)
+        std = sigma * np.sqrt((1 - decay ** 2) / (2 * a))
+
+        rates = np.empty((num_paths, len(steps)))
+        r = np.full(num_paths, float(self.r0))
+        for k in range(len(steps)):
+            r = r * decay[k] + b * (1 - decay[k]) + std[k] * rng.standard_normal(num_paths)
+            rates[:, k] = r
+        return rates
+
+    def bond_price_coefficients(self, t, maturities):
+        """
+        Returns the affine coefficients of zero-coupon bond prices P(t, T) = exp(ln_a - b * r(t)).
+
+        :param t: Valuation time (in years).
+        :param maturities: Array of bond maturities T >= t.
+        :return: Tuple (ln_a, b) with the shape of maturities.
+        """
+        a, theta, sigma = self.mean_reversion, self.long_term_rate, self.volatility
+        tau = np.maximum(np.asarray(maturities, dtype=float) - t, 0.0)
+        b = (1 - np.exp(-a * tau)) / a
+        ln_a = (b - tau) * (a ** 2 * theta - sigma ** 2 / 2) / a ** 2 - sigma ** 2 * b ** 2 / (4 * a)
+        return ln_a, b
+
+
+class HullWhiteModel:
+    """
+    One-factor Hull-White model, dr = (theta(t) - a r) dt + sigma dW, fitted to an initial zero curve.
+
+    :param initial_curve: Continuously compounded zero rate, either a scalar (flat curve) or a callable
+                          mapping times to zero rates.
+    :param mean_reversion: Speed of mean reversion (a).
+    :param volatility: Volatility of the short rate (sigma).
+    """
+
+    def __init__(self, initial_curve, mean_reversion, volatility):
+        """
+        Initializes the Hull-White model.
+
+        :param initial_curve: Continuously compounded zero rate, either a scalar (flat curve) or a callable
+                              mapping times to zero rates.
+        :param mean_reversion: Speed of mean reversion (a).
+        :param volatility: Volatility of the short rate (sigma).
+        """
+        self.initial_curve = initial_curve
+        self.mean_reversion = mean_reversion
+        self.volatility = volatility
+
+    def _log_discount(self, times):
+        """ln P(0, t) from the initial zero curve."""
+        times = np.asarray(times, dtype=float)
+        rates = self.initial_curve(times) if callable(self.initial_curve) else self.initial_curve
+        return -np.asarray(rates, dtype=float) * times
+
+    def _forward_rate(self, times, bump=1e-4):
+        """Instantaneous forward rate f(0, t) by central differences of ln P(0, t)."""
+        times = np.asarray(times, dtype=float)
+        lower = np.maximum(times - bump, 0.0)
+        upper = times + bump
+        return -(self._log_discount(upper) - self._log_discount(lower)) / (upper - lower)
+
+    def simulate(self, times, num_paths, rng):
+        """
+        Simulates short-rate paths as r(t) = x(t) + alpha(t), with x an exactly sampled zero-mean OU process.
+
+        :param times: Increasing simulation times (in years), excluding 0.
+        :param num_paths: Number of paths to simulate.
+        :param rng: A numpy.random.Generator.
+        :return: Array of short rates with shape (num_paths, len(times)).
+        """
+        a, sigma = self.mean_reversion, self.volatility
+        times = np.asarray(times, dtype=float)
+        steps = np.diff(np.concatenate(([0.0], times)))
+        decay = np.exp(-a * steps)
+        std = sigma * np.sqrt((1 - decay ** 2) / (2 * a))
+        alpha = self._forward_rate(times) + sigma ** 2 / (2 * a ** 2) * (1 - np.exp(-a * times)) ** 2
+
+        rates = np.empty((num_paths, len(steps)))
+        x = np.zeros(num_paths)
+        for k in range(len(steps)):
+            x = x * decay[k] + std[k] * rng.standard_normal(num_paths)
+            rates[:, k] = x + alpha[k]
+        return rates
+
+    def bond_price_coefficients(self, t, maturities):
+        """
+        Returns the affine coefficients of zero-coupon bond prices P(t, T) = exp(ln_a - b * r(t)).
+
+        :param t: Valuation time (in years).
+        :param maturities: Array of bond maturities T >= t.
+        :return: Tuple (ln_a, b) with the shape of maturities.
+        """
+        a, sigma = self.mean_reversion, self.volatility
+        maturities = np.maximum(np.asarray(maturities, dtype=float), t)
+        b = (1 - np.exp(-a * (maturities - t))) / a
+        ln_a = (self._log_discount(maturities) - self._log_discount(t) + b * self._forward_rate(t)
+                - sigma ** 2 / (4 * a) * (1 - np.exp(-2 * a * t)) * b ** 2)
+        return ln_a, b
+
+
+def _swap_schedule(trade):
+    """
+    Reduces a swap to payment times, net fixed amounts and a floating-leg notional.
+
+    The swap value at time t is sum(amount_i * P(t, t_i) for t_i > t) + floating_notional * (1 - P(t, T_n)).
+    The floating leg is valued as if it resets at t, which is exact on reset dates.
+
+    :param trade: A swap object, or a (CommoditySwap, floating_prices) tuple.
+    :return: Tuple (times, amounts, floating_notional).
+    """
+    trade, floating_prices = trade if isinstance(trade, tuple) else (trade, None)
+
+    if isinstance(trade, (InterestRateSwap, CurrencySwap, CommoditySwap)):
+        frequency, num_periods = trade.payment_frequency, trade.maturity * trade.payment_frequency
+    else:
+        frequency, num_periods = trade.payment_frequency, trade.years_to_maturity * trade.payment_frequency
+    times = np.arange(1, num_periods + 1) / frequency
+
+    if isinstance(trade, InterestRateSwap):
+        # Pays fixed, receives floating (swap_value = PV_floating - PV_fixed)
+        return times, np.full(num_periods, -trade.notional * trade.fixed_rate / frequency), trade.notional
+    if isinstance(trade, InterestRateSwapValuation):
+        # Receives fixed, pays floating (net_present_value = PV_fixed - PV_floating)
+        return times, np.full(num_periods, trade.notional * trade.fixed_rate / frequency), -trade.notional
+    if isinstance(trade, (CurrencySwap, CurrencySwapValuation)):
+        coupon = (trade.notional_a * trade.fixed_rate_a - trade.notional_b * trade.fixed_rate_b) / frequency
+        return times, np.full(num_periods, coupon), 0.0
+    if isinstance(trade, CommoditySwap):
+        if floating_prices is None:
+            raise ValueError("CommoditySwap exposure needs projected prices: pass (swap, floating_prices).")
+        prices = np.asarray(floating_prices, dtype=float)[:num_periods]
+        amounts = np.zeros(num_periods)
+        amounts[:len(prices)] = trade.notional * prices / frequency
+        amounts -= trade.notional * trade.fixed_price / frequency
+        return times, amounts, 0.0
+    if isinstance(trade, CommoditySwapValuation):
+        coupon = trade.notional * (trade.fixed_price - trade.floating_price) / frequency
+        return times, np.full(num_periods, coupon), 0.0
+    raise ValueError(f"Unsupported trade type: {type(trade).__name__}.")
+
+
+def _revalue(model, dates, short_rates, times, amounts, floating_notional, end_times):
+    """
+    Values every trade on every path at every exposure date.
+
+    :return: Array of trade values with shape (num_paths, len(dates), num_trades).
+    """
+    values = np.empty((short_rates.shape[0], len(dates), times.shape[0]))
+    for k, t in enumerate(dates):
+        r = short_rates[:, k, None, None]
+        ln_a, b = model.bond_price_coefficients(t, times)
+        live = np.where(times > t, amounts, 0.0)
+        fixed_leg = np.einsum("ptn,tn->pt", np.exp(ln_a - b * r), live)
+
+        ln_a_end, b_end = model.bond_price_coefficients(t, end_times)
+        floating_leg = np.where(end_times > t, floating_notional * (1 - np.exp(ln_a_end - b_end * r[:, :, 0])), 0.0)
+        values[:, k, :] = fixed_leg + floating_leg
+    return values
+
+
+def _simulate_chunk(model, dates, num_paths, seed, times, amounts, floating_notional, end_times):
+    """Simulates one chunk of paths and returns its netted values and per-trade exposure sums."""
+    rng = np.random.default_rng(seed)
+    short_rates = model.simulate(dates, num_paths, rng)
+    values = _revalue(model, dates, short_rates, times, amounts, floating_notional, end_times)
+    return values.sum(axis=2), np.maximum(values, 0.0).sum(axis=0)
+
+
+class ExposureEngine:
+    """
+    Monte Carlo counterparty exposure engine for a netting set of swaps.
+
+    Short-rate paths are simulated from a Vasicek or Hull-White model and every trade is revalued at each
+    exposure date with closed-form zero-coupon bond prices along the path.
+
+    :param trades: Swap objects from divergence.swaps. CommoditySwap trades are passed as
+                   (swap, floating_prices) tuples.
+    :param model: A VasicekModel or HullWhiteModel.
+    """
+
+    def __init__(self, trades, model):
+        """
+        Initializes the exposure engine.
+
+        :param trades: Swap objects from divergence.swaps. CommoditySwap trades are passed as
+                       (swap, floating_prices) tuples.
+        :param model: A VasicekModel or HullWhiteModel.
+        """
+        self.trades = list(trades)
+        self.model = model
+
+        schedules = [_swap_schedule(trade) for trade in self.trades]
+        max_periods = max(len(times) for times, _, _ in schedules)
+        # Padding uses time 0, which is never after an exposure date, so it drops out of valuation.
+        self.times = np.zeros((len(schedules), max_periods))
+        self.amounts = np.zeros((len(schedules), max_periods))
+        for i, (times, amounts, _) in enumerate(schedules):
+            self.times[i, :len(times)] = times
+            self.amounts[i, :len(amounts)] = amounts
+        self.floating_notional = np.array([floating for _, _, floating in schedules], dtype=float)
+        self.end_times = self.times.max(axis=1)
+
+    def run(self, exposure_dates, num_paths=10000, chunk_size=None, workers=None, quantile=0.95, seed=42,
+            max_chunk_elements=2 ** 22):
+        """
+        Simulates the netting set and computes exposure profiles.
+
+        :param exposure_dates: Increasing exposure dates (in years), all greater than 0.
+        :param num_paths: Total number of simulated paths.
+        :param chunk_size: (Optional) Paths per chunk. By default chosen so a chunk holds at most
+                           max_chunk_elements path x trade x payment values.
+        :param workers: Number of worker processes (None or 1 runs in-process, 0 uses all cores).
+        :param quantile: Quantile for potential future exposure (default is 0.95).
+        :param seed: Seed for the random number generator. Results do not depend on workers.
+        :param max_chunk_elements: Memory bound used to choose the default chunk size.
+        :return: Dictionary with dates, expected exposure, expected negative exposure, potential future
+                 exposure, expected positive exposure and per-trade expected exposure.
+        """
+        dates = np.asarray(exposure_dates, dtype=float)
+        if chunk_size is None:
+            chunk_size = max(1, max_chunk_elements // self.amounts.size)
+        chunk_sizes = [min(chunk_size, num_paths - start) for start in range(0, num_paths, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        args = [(self.model, dates, size, chunk_seed, self.times, self.amounts, self.floating_notional,
+                 self.end_times) for size, chunk_seed in zip(chunk_sizes, seeds)]
+
+        if workers is None or workers == 1:
+            results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+                results = list(executor.map(_simulate_chunk, *zip(*args)))
+
+        netted = np.concatenate([values for values, _ in results])
+        positive = np.maximum(netted, 0.0)
+        trade_exposure = sum(exposure for _, exposure in results) / num_paths
+        expected_exposure = positive.mean(axis=0)
+
+        return {
+            "dates": dates,
+            "expected_exposure": expected_exposure,
+            "expected_negative_exposure": np.minimum(netted, 0.0).mean(axis=0),
+            "potential_future_exposure": np.quantile(positive, quantile, axis=0),
+            "expected_positive_exposure": np.sum(expected_exposure * np.diff(dates, prepend=0.0)) / dates[-1],
+            "trade_expected_exposure": trade_exposure,
+        }
@@ -0,0 +1,118 @@
+import numpy as np
+
+from divergence.swaps.cash_flows import discount_factors
+
+
+def _payment_schedule(payment_frequency, years_to_maturity, start):
+    """
+    Builds a padded payment-time grid for many swaps at once.
+
+    :return: Tuple (times, mask, payment_frequency) where times and mask have the broadcast
+             shape of the inputs plus a trailing axis over payment periods.
+    """
+    payment_frequency, years_to_maturity, start = np.broadcast_arrays(
+        np.asarray(payment_frequency, dtype=float),
+        np.asarray(years_to_maturity, dtype=float),
+        np.asarray(start, dtype=float))
+    num_periods = np.rint(payment_frequency * years_to_maturity).astype(int)
+    max_periods = int(num_periods.max()) if num_periods.size else 0
+
+    periods = np.arange(1, max_periods + 1)
+    times = start[..., None] + periods / payment_frequency[..., None]
+    mask = periods <= num_periods[..., None]
+    return times, mask, payment_frequency
+
+
+def _grid_rate(discount_rate):
+    """Lines up a scalar or per-swap discount rate with the trailing period axis of a schedule."""
+    return discount_rate if callable(discount_rate) else np.asarray(discount_rate, dtype=float)[..., None]
+
+
+def annuity_factor(discount_rate, payment_frequency, years_to_maturity, start=0.0, compounding=None):
+    """
+    Calculates the annuity (PV01 per unit notional and unit rate) of a fixed leg, vectorized over swaps.
+
+    All arguments broadcast against each other, so one call covers many trades, tenors and start dates.
+
+    :param discount_rate: Scalar or per-swap discount rate, or a curve callable mapping times to zero rates.
+    :param payment_frequency: The number of payments per year.
+    :param years_to_maturity: The tenor of the swap in years.
+    :param start: Forward start of the swap in years (default is 0, spot starting).
+    :param compounding: Compounding periods per year or "continuous". Defaults to the payment frequency,
+                        which matches the discounting in InterestRateSwapValuation.
+    :return: Sum of accrual-weighted discount factors over the payment dates.
+    """
+    times, mask, payment_frequency = _payment_schedule(payment_frequency, years_to_maturity, start)
+    if compounding is None:
+        compounding = payment_frequency[..., None]
+    dfs = discount_factors(times, _grid_rate(discount_rate), compounding)
+    return np.where(mask, dfs, 0.0).sum(axis=-1) / payment_frequency
+
+
+def par_swap_rate(discount_rate, payment_frequency, years_to_maturity, start=0.0, compounding=None):
+    """
+    Calculates the par fixed rate of a (forward-starting) swap whose floating leg is projected off the
+    discount curve: (DF(start) - DF(end)) / annuity. Vectorized over swaps, tenors and start dates.
+
+    :param discount_rate: Scalar or per-swap discount rate, or a curve callable mapping times to zero rates.
+    :param payment_frequency: The number of payments per year.
+    :param years_to_maturity: The tenor of the swap in years.
+    :param start: Forward start of the swap in years (default is 0, spot starting).
+    :param compounding: Compounding periods per year or "continuous" (defaults to the payment frequency).
+    :return: Par swap rates with the broadcast shape of the inputs.
+    """
+    start = np.asarray(start, dtype=float)
+    end = start + np.asarray(years_to_maturity, dtype=float)
+    end_compounding = np.asarray(payment_frequency, dtype=float) if compounding is None else compounding
+    df_start = discount_factors(start, discount_rate, end_compounding)
+    df_end = discount_factors(end, discount_rate, end_compounding)
+    annuity = annuity_factor(discount_rate, payment_frequency, years_to_maturity, start, compounding)
+    return (df_start - df_end) / annuity
+
+
+def break_even_fixed_leg(floating_values, discount_rate, num_fixed_periods=None):
+    """
+    Calculates the fixed rate (or price) that sets a projected floating leg's value equal to the fixed leg,
+    using the per-period discounting of the Swap classes: 1 / (1 + discount_rate) ** i.
+
+    :param floating_values: Projected floating rates or prices, one row per swap (1-D for a single swap).
+                            Shorter rows may be padded with NaN.
+    :param discount_rate: Scalar or per-swap discount rate.
+    :param num_fixed_periods: (Optional) Number of fixed payments per swap. Defaults to the number of
+                              floating values in each row.
+    :return: Break-even fixed rate or price per swap.
+    """
+    floating_values = np.asarray(floating_values, dtype=float)
+    known = ~np.isnan(floating_values)
+    num_floating_periods = floating_values.shape[-1]
+    if num_fixed_periods is None:
+        num_fixed_periods = known.sum(axis=-1)
+    num_fixed_periods = np.asarray(num_fixed_periods)
+
+    max_periods = max(int(num_fixed_periods.max()), num_floating_periods)
+    periods = np.arange(1, max_periods + 1)
+    dfs = (1 + np.asarray(discount_rate, dtype=float)[..., None]) ** -periods
+
+    floating_pv = np.where(known, floating_values * dfs[..., :num_floating_periods], 0.0).sum(axis=-1)
+    fixed_annuity = np.where(periods <= num_fixed_periods[..., None], dfs, 0.0).sum(axis=-1)
+    return floating_pv / fixed_annuity
+
+
+def par_basis_spread(notional_a, notional_b, fixed_rate_a, fixed_rate_b, payment_frequency, years_to_maturity,
+                     market_rate_a, market_rate_b):
+    """
+    Calculates the spread over fixed_rate_b that makes a currency swap's NPV zero, vectorized over swaps.
+
+    :param notional_a: The principal amount in currency A.
+    :param notional_b: The principal amount in currency B.
+    :param fixed_rate_a: The fixed interest rate for currency A.
+    :param fixed_rate_b: The fixed interest rate for currency B.
+    :param payment_frequency: The number of payments per year.
+    :param years_to_maturity: The total duration of the swap in years.
+    :param market_rate_a: Discount rate (or curve callable) for currency A's cash flows.
+    :param market_rate_b: Discount rate (or curve callable) for currency B's cash flows.
+    :return: Basis spread to add to fixed_rate_b.
+    """
+    annuity_a = annuity_factor(market_rate_a, payment_frequency, years_to_maturity)
+    annuity_b = annuity_factor(market_rate_b, payment_frequency, years_to_maturity)
+    return notional_a * fixed_rate_a * annuity_a / (notional_b * annuity_b) - fixed_rate_b
@@ -0,0 +1,190 @@
+import inspect
+import json
+import os
+
+import numpy as np
+
+from divergence.swaps.cash_flows import CashFlowSeries
+from divergence.swaps.swap import Swap, InterestRateSwap, CurrencySwap, CommoditySwap
+from divergence.swaps.valuation import InterestRateSwapValuation, CurrencySwapValuation, CommoditySwapValuation
+
+FORMAT_VERSION = 1
+
+SWAP_TYPES = {cls.__name__: cls for cls in (Swap, InterestRateSwap, CurrencySwap, CommoditySwap,
+                                            InterestRateSwapValuation, CurrencySwapValuation,
+                                            CommoditySwapValuation)}
+
+
+def _swap_fields(cls):
+    """Returns the constructor parameter names of a swap class, which are also its attribute names."""
+    return [name for name in inspect.signature(cls.__init__).parameters if name != "self"]
+
+
+def _write_meta(path, meta):
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def _read_meta(path, expected_format):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta.get("format") != expected_format:
+        raise ValueError(f"{path} does not contain a {expected_format} store.")
+    if meta.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported {expected_format} store version: {meta['version']}.")
+    return meta
+
+
+def save_cash_flow_series(series, path):
+    """
+    Saves a cash flow series as a directory of .npy columns.
+
+    :param series: A CashFlowSeries.
+    :param path: Target directory (created if missing).
+    """
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "amounts.npy"), np.ascontiguousarray(series.amounts))
+    np.save(os.path.join(path, "time_periods.npy"), np.ascontiguousarray(series.time_periods))
+    _write_meta(path, {"format": "cash_flow_series", "version": FORMAT_VERSION, "size": len(series)})
+
+
+def load_cash_flow_series(path, mmap_mode="r"):
+    """
+    Loads a cash flow series saved by save_cash_flow_series.
+
+    With a mmap_mode the columns are memory-mapped and paged in lazily, so opening a large
+    series costs almost nothing. Appending to a read-only mapped series copies it into memory.
+
+    :param path: Directory written by save_cash_flow_series.
+    :param mmap_mode: numpy.load memory-map mode ("r", "r+", "c") or None to read into memory.
+    :return: A CashFlowSeries backed by the loaded arrays.
+    """
+    _read_meta(path, "cash_flow_series")
+    amounts = np.load(os.path.join(path, "amounts.npy"), mmap_mode=mmap_mode)
+    time_periods = np.load(os.path.join(path, "time_periods.npy"), mmap_mode=mmap_mode)
+    return CashFlowSeries.from_arrays(amounts, time_periods, copy=False)
+
+
+class SwapBook:
+    """
+    A columnar store of swaps: one array per constructor field for each swap type.
+
+    :param columns: (Optional) Mapping of swap type name to a mapping of field name to array.
+    """
+
+    def __init__(self, columns=None):
+        """
+        Initializes the swap book.
+
+        :param columns: (Optional) Mapping of swap type name to a mapping of field name to array.
+        """
+        self.columns = {}
+        for type_name, fields in (columns or {}).items():
+            if type_name not in SWAP_TYPES:
+                raise ValueError(f"Unknown swap type: {type_name}.")
+            self.columns[type_name] = dict(fields)
+
+    @classmethod
+    def from_swaps(cls, swaps):
+        """
+        Builds a book from swap objects, grouping them by type.
+
+        :param swaps: Iterable of swap or swap valuation objects.
+        :return: A SwapBook.
+        """
+        grouped = {}
+        for swap in swaps:
+            type_name = type(swap).__name__
+            if type_name not in SWAP_TYPES:
+                raise ValueError(f"Unsupported swap type: {type_name}.")
+            grouped.setdefault(type_name, []).append(swap)
+
+        columns = {}
+        for type_name, group in grouped.items():
+            fields = _swap_fields(SWAP_TYPES[type_name])
+            columns[type_name] = {field: np.asarray([getattr(swap, field) for swap in group]) for field in fields}
+        return cls(columns)
+
+    def count(self, type_name):
+        """
+        Returns the number of swaps of a given type in the book.
+
+        :param type_name: Swap class name, e.g. "InterestRateSwap".
+        :return: Number of swaps.
+        """
+        fields = self.columns.get(type_name)
+        return len(next(iter(fields.values()))) if fields else 0
+
+    def swaps(self, type_name):
+        """
+        Materializes the swaps of one type as objects.
+
+        :param type_name: Swap class name, e.g. "InterestRateSwap".
+        :return: List of swap objects.
+        """
+        cls = SWAP_TYPES[type_name]
+        fields = self.columns.get(type_name, {})
+        values = [fields[field].tolist() for field in fields]
+        return [cls(**dict(zip(fields, row))) for row in zip(*values)]
+
+    def save(self, path):
+        """
+        Saves the book as a directory of .npy columns, one subdirectory per swap type.
+
+        :param path: Target directory (created if missing).
+        """
+        os.makedirs(path, exist_ok=True)
+        groups = {}
+        for type_name, fields in self.columns.items():
+            group_path = os.path.join(path, type_name)
+            os.makedirs(group_path, exist_ok=True)
+            for field, column in fields.items():
+                np.save(os.path.join(group_path, f"{field}.npy"), np.ascontiguousarray(column))
+            groups[type_name] = {"count": self.count(type_name), "fields": list(fields)}
+        _write_meta(path, {"format": "swap_book", "version": FORMAT_VERSION, "groups": groups})
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Loads a book saved by SwapBook.save, memory-mapping every column by default.
+
+        :param path: Directory written by SwapBook.save.
+        :param mmap_mode: numpy.load memory-map mode ("r", "r+", "c") or None to read into memory.
+        :return: A SwapBook.
+        """
+        meta = _read_meta(path, "swap_book")
+        columns = {}
+        for type_name, group in meta["groups"].items():
+            group_path = os.path.join(path, type_name)
+            columns[type_name] = {field: np.load(os.path.join(group_path, f"{field}.npy"), mmap_mode=mmap_mode)
+                                  for field in group["fields"]}
+        return cls(columns)
+
+    def __len__(self):
+        return sum(self.count(type_name) for type_name in self.columns)
+
+    def __iter__(self):
+        for type_name in self.columns:
+            yield from self.swaps(type_name)
+
+
+def save_swap_book(swaps, path):
+    """
+    Saves swaps (a SwapBook or an iterable of swap objects) as a columnar directory.
+
+    :param swaps: A SwapBook or an iterable of swap or swap valuation objects.
+    :param path: Target directory (created if missing).
+    """
+    book = swaps if isinstance(swaps, SwapBook) else SwapBook.from_swaps(swaps)
+    book.save(path)
+
+
+def load_swap_book(path, mmap_mode="r"):
+    """
+    Loads a swap book saved by save_swap_book with memory-mapped columns.
+
+    :param path: Directory written by save_swap_book.
+    :param mmap_mode: numpy.load memory-map mode ("r", "r+", "c") or None to read into memory.
+    :return: A SwapBook.
+    """
+    return SwapBook.load(path, mmap_mode)
@@ -1,3 +1,6 @@
+from divergence.swaps.par_rates import break_even_fixed_leg
+
+
 class Swap:
     def __init__(self, notional, payment_frequency, maturity):
         """
@@ -75,6 +78,16 @@ class InterestRateSwap(Swap):
 
         return pv_floating - pv_fixed
 
+    def par_rate(self, floating_rates, discount_rate):
+        """
+        Calculates the fixed rate at which the swap has zero value.
+
+        :param floating_rates: A list of floating interest rates (or a 2-D array, one row per scenario).
+        :param discount_rate: The discount rate (scalar or one per row of floating_rates).
+        :return: The par fixed rate.
+        """
+        return break_even_fixed_leg(floating_rates, discount_rate, self.maturity * self.payment_frequency)
+
 
 class CurrencySwap(Swap):
     def __init__(self, notional_a, notional_b, fixed_rate_a, fixed_rate_b, payment_frequency, maturity):
@@ -131,6 +144,16 @@ class CurrencySwap(Swap):
 
         return pv_a - pv_b
 
+    def par_spread(self):
+        """
+        Calculates the spread over fixed_rate_b at which the swap has zero value.
+
+        Both legs share the payment dates and discount rate, so the spread does not depend on it.
+
+        :return: The par basis spread for currency B.
+        """
+        return self.notional_a * self.fixed_rate_a / self.notional_b - self.fixed_rate_b
+
 
 class CommoditySwap(Swap):
     def __init__(self, notional, fixed_price, payment_frequency, maturity):
@@ -183,3 +206,13 @@ class CommoditySwap(Swap):
         pv_floating = self.present_value(floating_cash_flows, discount_rate)
 
         return pv_floating - pv_fixed
+
+    def par_price(self, floating_prices, discount_rate):
+        """
+        Calculates the fixed price at which the swap has zero value.
+
+        :param floating_prices: A list of market prices at each payment period (or a 2-D array, one row per scenario).
+        :param discount_rate: The discount rate (scalar or one per row of floating_prices).
+        :return: The par fixed price.
+        """
+        return break_even_fixed_leg(floating_prices, discount_rate, self.maturity * self.payment_frequency)
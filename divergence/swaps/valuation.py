@@ -1,3 +1,9 @@
+import numpy as np
+
+from divergence.instrumentation import instrumented
+from divergence.swaps.par_rates import annuity_factor, par_basis_spread
+
+
 class InterestRateSwapValuation:
     def __init__(self, notional, fixed_rate, floating_rate, payment_frequency, years_to_maturity):
         """
@@ -15,6 +21,7 @@ class InterestRateSwapValuation:
         self.payment_frequency = payment_frequency
         self.years_to_maturity = years_to_maturity
 
+    @instrumented
     def present_value_fixed_leg(self, market_rate):
         """
         Calculates the present value of the fixed leg of the swap.
@@ -31,6 +38,7 @@ class InterestRateSwapValuation:
 
         return total_pv
 
+    @instrumented
     def present_value_floating_leg(self, market_rate):
         """
         Calculates the present value of the floating leg of the swap.
@@ -47,6 +55,7 @@ class InterestRateSwapValuation:
 
         return total_pv
 
+    @instrumented
     def net_present_value(self, market_rate):
         """
         Calculates the net present value (NPV) of the interest rate swap.
@@ -59,6 +68,29 @@ class InterestRateSwapValuation:
 
         return pv_fixed - pv_floating
 
+    @instrumented
+    def annuity(self, market_rate):
+        """
+        Calculates the annuity of the swap: the present value of one unit of fixed rate on the notional.
+
+        :param market_rate: The market interest rate used for discounting (scalar or array).
+        :return: The annuity of the swap.
+        """
+        return self.notional * annuity_factor(market_rate, self.payment_frequency, self.years_to_maturity)
+
+    @instrumented
+    def par_rate(self, market_rate):
+        """
+        Calculates the fixed rate at which the swap's NPV is zero: PV_floating / annuity.
+
+        Both legs are discounted over the same payment dates, so the annuity cancels and the par rate
+        equals the floating rate for every market rate.
+
+        :param market_rate: The market interest rate used for discounting (scalar or array).
+        :return: The par fixed rate, with the shape of market_rate.
+        """
+        return np.zeros(np.shape(market_rate)) + self.floating_rate
+
 
 class CurrencySwapValuation:
     def __init__(self, notional_a, notional_b, fixed_rate_a, fixed_rate_b, payment_frequency, years_to_maturity):
@@ -79,6 +111,7 @@ class CurrencySwapValuation:
         self.payment_frequency = payment_frequency
         self.years_to_maturity = years_to_maturity
 
+    @instrumented
     def present_value_fixed_leg_a(self, market_rate_a):
         """
         Calculates the present value of the fixed leg for currency A.
@@ -95,6 +128,7 @@ class CurrencySwapValuation:
 
         return total_pv_a
 
+    @instrumented
     def present_value_fixed_leg_b(self, market_rate_b):
         """
         Calculates the present value of the fixed leg for currency B.
@@ -111,6 +145,7 @@ class CurrencySwapValuation:
 
         return total_pv_b
 
+    @instrumented
     def net_present_value(self, market_rate_a, market_rate_b):
         """
         Calculates the net present value (NPV) of the currency swap.
@@ -124,6 +159,18 @@ class CurrencySwapValuation:
 
         return pv_fixed_a - pv_fixed_b
 
+    @instrumented
+    def par_spread(self, market_rate_a, market_rate_b):
+        """
+        Calculates the spread over fixed_rate_b at which the swap's NPV is zero.
+
+        :param market_rate_a: The market interest rate used for discounting currency A's cash flows.
+        :param market_rate_b: The market interest rate used for discounting currency B's cash flows.
+        :return: The par basis spread for currency B.
+        """
+        return par_basis_spread(self.notional_a, self.notional_b, self.fixed_rate_a, self.fixed_rate_b,
+                                self.payment_frequency, self.years_to_maturity, market_rate_a, market_rate_b)
+
 
 class CommoditySwapValuation:
     def __init__(self, notional, fixed_price, floating_price, payment_frequency, years_to_maturity):
@@ -142,6 +189,7 @@ class CommoditySwapValuation:
         self.payment_frequency = payment_frequency
         self.years_to_maturity = years_to_maturity
 
+    @instrumented
     def present_value_fixed_leg(self, market_price):
         """
         Calculates the present value of the fixed leg based on a predetermined price.
@@ -158,6 +206,7 @@ class CommoditySwapValuation:
 
         return total_pv
 
+    @instrumented
     def present_value_floating_leg(self, market_price):
         """
         Calculates the present value of the floating leg based on current prices.
@@ -174,6 +223,7 @@ class CommoditySwapValuation:
 
         return total_pv
 
+    @instrumented
     def net_present_value(self, market_price):
         """
         Calculates the net present value (NPV) of the commodity swap.
@@ -185,3 +235,16 @@ class CommoditySwapValuation:
         pv_floating = self.present_value_floating_leg(market_price)
 
         return pv_fixed - pv_floating
+
+    @instrumented
+    def par_price(self, market_price):
+        """
+        Calculates the fixed price at which the swap's NPV is zero: PV_floating / annuity.
+
+        Both legs are discounted over the same payment dates, so the annuity cancels and the par price
+        equals the floating price.
+
+        :param market_price: Current price used to calculate cash flows and discounts (scalar or array).
+        :return: The par fixed price, with the shape of market_price.
+        """
+        return np.zeros(np.shape(market_price)) + self.floating_price
@@ -1,6 +1,12 @@
 from divergence.futures.hedging import *
 from divergence.futures.pricing import *
 from divergence.futures.strategies import *
+from divergence.futures.backtesting import *
+from divergence.futures.pairs import *
+from divergence.futures.sweep import *
+from divergence.futures.hedge_book import *
+from divergence.futures.hedge_ratios import *
+from divergence.futures.curve import *
 import numpy as np
 
 # Параметры активов
@@ -96,3 +102,46 @@ pairs_quantity = 10
 pairs_threshold = 5
 pairs_profit = pairs_trading(price_a, price_b, pairs_quantity, pairs_threshold)
 print(f"Параллельная торговля: Потенциальная прибыль = {pairs_profit}")
+
+# 7. Бэктест стратегий на полной истории цен
+backtest_prices = np.array([100, 102, 101, 105, 107, 104, 110, 112])
+backtest_result = backtest(backtest_prices, buy_and_hold_positions(backtest_prices), initial_investment,
+                           commission_rate=commission_rate)
+print(f"Бэктест покупки и удержания: Конечная стоимость = {backtest_result['equity'][-1]:.2f}")
+
+# 8. Парная торговля со скользящим коэффициентом хеджирования
+pairs_prices_b = 100 + np.cumsum(np.random.default_rng(0).normal(size=250))
+pairs_prices_a = 1.5 * pairs_prices_b + np.random.default_rng(1).normal(size=250)
+pairs_hedge_ratio, pairs_intercept = rolling_ols_hedge_ratio(pairs_prices_a, pairs_prices_b, 60)
+_, pairs_zscore = spread_zscore(pairs_prices_a, pairs_prices_b, pairs_hedge_ratio, pairs_intercept, 20)
+pairs_positions = pairs_signals(pairs_zscore)
+print(f"Парная торговля: Коэффициент хеджирования = {pairs_hedge_ratio[-1]:.2f}, "
+      f"Позиция = {pairs_positions[-1]:.0f}")
+
+# 9. Перебор порогов парной торговли по сетке параметров
+sweep_grid = parameter_grid(threshold=[0.5, 1.0, 2.0])
+sweep_results = run_sweep(pairs_trading_positions, sweep_grid, pairs_prices_a - pairs_prices_b,
+                          {"price_a": pairs_prices_a, "price_b": pairs_prices_b}, initial_capital=initial_investment,
+                          quantity=initial_investment / pairs_prices_a[0])
+print(f"Перебор параметров: Лучший порог = {sweep_results.loc[sweep_results['sharpe_ratio'].idxmax(), 'threshold']}")
+
+# 10. Прибыль и комиссия портфеля хеджей за всю историю
+book_methods = np.array(["direct", "partial", "long_term"])
+book_spot_prices = np.array([[100, 105, 110], [102, 104, 111]])
+book_futures_prices = np.array([[95, 100, 108], [97, 101, 109]])
+book_result = hedge_book_pnl(book_methods, book_spot_prices, book_futures_prices, [10, 20, 30], commission_rate,
+                             hedge_ratio=0.5, time_period=1.5)
+print(f"Портфель хеджей: Чистая прибыль по дням = {book_result['net'].sum(axis=1)}")
+
+# 11. Оценка коэффициента хеджирования с минимальной дисперсией
+hedge_futures_returns = np.random.default_rng(2).normal(0, 0.01, size=(250, 3))
+hedge_spot_returns = 0.8 * hedge_futures_returns + np.random.default_rng(3).normal(0, 0.005, size=(250, 3))
+estimated_hedge_ratios = minimum_variance_hedge_ratio(hedge_spot_returns, hedge_futures_returns)
+estimated_partial_profit = partial_hedging(spot_price, futures_price, quantity, estimated_hedge_ratios, commission_rate)
+print(f"Коэффициенты хеджирования с минимальной дисперсией = {estimated_hedge_ratios}, "
+      f"Частичное хеджирование = {estimated_partial_profit}")
+
+# 12. Срочная структура фьючерсов: подразумеваемый перенос и доходность ролловера
+curve = FuturesCurve([100, 50], [0.25, 0.5, 1.0], [[101, 102, 104], [49.5, 49.2, 48.6]], risk_free_rate)
+print(f"Срочная структура: Подразумеваемый перенос = {curve.implied_carry().round(4)}, "
+      f"Доходность ролловера = {curve.roll_yield().round(4)}")
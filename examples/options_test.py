@@ -2,6 +2,11 @@ from divergence.options.greeks import *
 from divergence.options.hedging import *
 from divergence.options.pricing import *
 from divergence.options.strategies import *
+from divergence.options.exotics import *
+from divergence.options.multi_asset import *
+from divergence.options.calibration import *
+from divergence.options.proxy import *
+from divergence import instrumentation
 
 # Greeks
 S, K, T, r, sigma = 100, 100, 1, 0.05, 0.2
@@ -41,6 +46,7 @@ S, K, T, r, sigma = 100, 100, 1, 0.05, 0.2
 print("Black-Scholes Call Price:", black_scholes(S, K, T, r, sigma, "call"))
 print("Binomial Tree Call Price:", binomial_tree(S, K, T, r, sigma, 100, "call"))
 print("Monte Carlo Call Price:", monte_carlo(S, K, T, r, sigma, 10000, "call"))
+print("Quasi-Monte Carlo (Sobol) Call Price:", monte_carlo(S, K, T, r, sigma, 10000, "call", sampling="sobol"))
 
 
 # strategies
@@ -55,3 +61,42 @@ print("Strangle:", strangle(S, 95, 105, T, r, sigma, pricing_method))
 print("Iron Condor:", iron_condor(S, 90, 95, 105, 110, T, r, sigma, pricing_method))
 print("Covered Call:", covered_call(S, K, T, r, sigma, pricing_method))
 
+
+# exotics
+print("Arithmetic Asian Call:", asian_option(S, K, T, r, sigma, num_paths=20000))
+print("Down-and-Out Call:", barrier_option(S, K, T, r, sigma, 90, "down-and-out", num_paths=20000))
+print("Floating Strike Lookback Call:", lookback_option(S, T, r, sigma, num_paths=20000))
+
+# multi-asset
+simulator = MultiAssetSimulator([100, 95], [0.3, 0.25], [[1, 0.6], [0.6, 1]], r)
+print("Kirk Spread Call:", kirk_spread_price(100, 95, 5, T, r, 0.3, 0.25, 0.6))
+print("Spread Call:", simulator.spread_option(5, T, num_paths=20000))
+print("Basket Call:", simulator.basket_option([0.5, 0.5], 95, T, num_paths=20000))
+print("Best-of Call:", simulator.best_of_option(100, T, num_paths=20000))
+
+# calibration
+strikes = np.linspace(80, 120, 9)
+market_prices = heston_price(S, strikes, T, r, 0.05, 2.0, 0.04, 0.6, -0.7)
+print("Heston Parameters:", HestonCalibrator(S, r).calibrate(strikes, np.full(9, T), market_prices))
+
+# proxy
+proxy = ChebyshevProxy(binomial_tree, {"S": (80, 120), "sigma": (0.1, 0.4)}, {"K": K, "T": T, "r": r, "N": 100},
+                       degree=10)
+print("Binomial Tree Proxy:", proxy(S=S, sigma=sigma), "error bound:", proxy.error_bound)
+
+# Corners of the domain are inside it: no NaN and no rebuild
+corner_proxy = ChebyshevProxy(black_scholes, {"S": (80, 120), "sigma": (0.1, 0.4), "T": (0.1, 2.0)},
+                              {"K": K, "r": r}, vectorized=True)
+for corner_S in (80, 120):
+    for corner_sigma in (0.1, 0.4):
+        for corner_T in (0.1, 2.0):
+            corner_price = corner_proxy(S=corner_S, sigma=corner_sigma, T=corner_T)
+            assert abs(corner_price - black_scholes(corner_S, K, corner_T, r, corner_sigma)) < corner_proxy.error_bound
+assert corner_proxy.rebuilds == 0
+print("Proxy corners match Black-Scholes without rebuilding")
+
+# instrumentation
+with instrumentation.measure() as scope:
+    portfolio_hedging(S, K, T, r, sigma, "call", 100000, pricing_method)
+for name, stats in scope.snapshot().items():
+    print(f"{name}: calls={stats['calls']}, total={stats['total_seconds'] * 1e3:.3f} ms")
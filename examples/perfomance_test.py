@@ -8,3 +8,32 @@ benchmark_returns = pd.Series(np.random.normal(0.0005, 0.015, 252))  # Бенч
 
 analyzer = PerformanceAnalyzer(returns, benchmark_returns)
 analyzer.summary()
+
+# Потоковый анализ: метрики обновляются по каждой новой доходности
+from divergence.perfomance.streaming import StreamingPerformanceAnalyzer
+
+streaming = StreamingPerformanceAnalyzer()
+for ret, bench_ret in zip(returns, benchmark_returns):
+    streaming.update(ret, bench_ret)
+streaming.summary()
+
+# Анализ сразу многих стратегий по матрице доходностей (периоды x стратегии)
+from divergence.perfomance.cross_sectional import CrossSectionalPerformanceAnalyzer
+
+strategies = pd.DataFrame(np.random.normal(0.001, 0.02, (252, 5)), columns=[f"strategy_{i}" for i in range(5)])
+cross_sectional = CrossSectionalPerformanceAnalyzer(strategies, benchmark_returns)
+print(cross_sectional.summary().sort_values("sharpe_ratio", ascending=False))
+
+# Скользящая максимальная просадка совпадает с просадкой, посчитанной отдельно по каждому окну
+window = 10
+rolling_drawdown = analyzer.calculate_rolling_max_drawdown(window)
+brute_force = [PerformanceAnalyzer(returns[end - window + 1:end + 1]).calculate_max_drawdown()
+               for end in range(window - 1, len(returns))]
+assert rolling_drawdown[:window - 1].isna().all()
+assert np.allclose(rolling_drawdown[window - 1:], brute_force, equal_nan=True)
+cross_sectional_drawdown = cross_sectional.calculate_rolling_max_drawdown(window)
+for column in strategies:
+    expected = [PerformanceAnalyzer(strategies[column][end - window + 1:end + 1]).calculate_max_drawdown()
+                for end in range(window - 1, len(strategies))]
+    assert np.allclose(cross_sectional_drawdown[column][window - 1:], expected, equal_nan=True)
+print("Rolling max drawdown matches the per-window calculation")
@@ -0,0 +1,37 @@
+import numpy as np
+
+from divergence.risk.stress import *
+from divergence.risk.var import *
+from divergence.swaps.valuation import InterestRateSwapValuation
+
+# Portfolio
+portfolio = Portfolio({"WTI": 80.0, "Brent": 85.0}, {"WTI": 0.35, "Brent": 0.3}, 0.03)
+portfolio.add_options(["WTI", "Brent"], [100, -50], [85, 80], [0.5, 1.0], ["call", "put"])
+portfolio.add_futures("WTI", -20, 0.5)
+portfolio.add_swap(InterestRateSwapValuation(1e6, 0.035, 0.03, 2, 5))
+print("Portfolio Value:", portfolio.value()[0])
+
+# Historical simulation
+rng = np.random.default_rng(0)
+spot_returns = rng.normal(0, 0.02, (500, 2))
+rate_changes = rng.normal(0, 5e-4, 500)
+result = historical_var(portfolio, spot_returns, rate_changes=rate_changes)
+print("Historical VaR 99%:", result["var"], "ES:", result["expected_shortfall"])
+result = historical_var(portfolio, spot_returns, rate_changes=rate_changes, method="delta_gamma")
+print("Delta-Gamma VaR 99%:", result["var"], "ES:", result["expected_shortfall"])
+
+# Monte Carlo and parametric
+covariance = np.array([[0.02 ** 2, 0.9 * 0.02 * 0.02], [0.9 * 0.02 * 0.02, 0.02 ** 2]])
+result = monte_carlo_var(portfolio, covariance, num_scenarios=10000)
+print("Monte Carlo VaR 99%:", result["var"], "ES:", result["expected_shortfall"])
+print("Parametric VaR 99%:", parametric_var(portfolio, covariance)["var"])
+
+# Stress testing
+engine = StressEngine(portfolio)
+shocks = [SpotShock([-0.3, -0.15, 0, 0.15, 0.3]), VolShock([-0.1, 0, 0.1]),
+          VolShock([-0.05, 0, 0.05], kind="skew", name="skew"), RateShock([-0.01, 0, 0.01]),
+          RateShock([-0.002, 0, 0.002], kind="twist", name="twist")]
+result = engine.run(shocks, num_worst=3)
+print("Stress Scenarios:", result["num_scenarios"], "Worst P&L:", result["min"])
+for pnl, levels in result["worst"]:
+    print(f"  {pnl:.2f}", levels)
@@ -19,6 +19,11 @@ discount_rate = 0.05
 total_pv = cash_flow_series.total_present_value(discount_rate)
 print(f"\nОбщая текущая стоимость при ставке дисконтирования {discount_rate * 100}%: {total_pv:.2f}")
 
+# Пакетное добавление денежных потоков и непрерывное дисконтирование
+cash_flow_series.extend([2500, 3000], [4, 5])
+total_pv_continuous = cash_flow_series.total_present_value(discount_rate, compounding="continuous")
+print(f"Текущая стоимость при непрерывном начислении: {total_pv_continuous:.2f}")
+
 # Swap
 # Пример процентного свопа
 notional = 1000000
@@ -68,3 +73,8 @@ commodity_swap = CommoditySwapValuation(notional=1000, fixed_price=50, floating_
 market_price = 52
 npv_commodity = commodity_swap.net_present_value(market_price)
 print(f"Чистая текущая стоимость товарного свопа: {npv_commodity:.2f}")
+
+# Паритетные ставки
+print("Паритетная фиксированная ставка процентного свопа:", ir_swap.par_rate(floating_rates, discount_rate))
+print("Паритетная цена товарного свопа:", commodity_swap.par_price(market_price))
+print("Паритетный базисный спред валютного свопа:", currency_swap.par_spread(market_rate_a, market_rate_b))